@@ -5,13 +5,9 @@ Implementa el patrón MVC y proporciona endpoints REST y WebSocket
 para operaciones de trading en tiempo real.
 """
 
-import os
-
-from dotenv import load_dotenv
-
-load_dotenv()
+from config import config
 
-_socketio_async_mode = os.getenv('SOCKETIO_ASYNC_MODE', 'threading').lower()
+_socketio_async_mode = config.SOCKETIO_ASYNC_MODE
 if _socketio_async_mode == 'eventlet':
     import eventlet
 
@@ -22,21 +18,13 @@ elif _socketio_async_mode.startswith('gevent'):
     monkey.patch_all()
 
 import logging
+import sys
 
 from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_socketio import SocketIO
 
-from config import config
-from routes.auth_routes import register_auth_routes
-from routes.user_routes import register_user_routes
-from routes.preferences_router import register_preferences_routes
-from routes.favorites_router import register_favorites_routes
-from routes.screener_routes import register_screener_routes
-from routes.trading_routes import register_trading_routes
-from routes.order_routes import order_bp, init_order_socket
-from routes.news_routes import register_news_routes
-from sockets.ws_events import register_socket_handlers
+from utils.json_utils import OrjsonProvider, SocketIOJSON
 
 
 # Configurar logging
@@ -46,80 +34,138 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Inicializar Flask
-app = Flask(__name__)
-app.config['SECRET_KEY'] = config.SECRET_KEY
-CORS(app, resources={r"/api/*": {"origins": "*"}})
-
-# Inicializar SocketIO
+# El monkey-patching solo se aplica en el modo asíncrono correspondiente. Si
+# eventlet aparece importado en otro modo, alguna dependencia lo arrastró y
+# puede interferir con los sockets nativos (p. ej. el pool de pymongo).
+if _socketio_async_mode != 'eventlet' and 'eventlet' in sys.modules:
+    logger.warning(
+        "eventlet está importado pero SOCKETIO_ASYNC_MODE=%s; "
+        "no se aplicó monkey-patching",
+        _socketio_async_mode,
+    )
+elif _socketio_async_mode == 'eventlet':
+    logger.warning(
+        "SOCKETIO_ASYNC_MODE=eventlet: pymongo no soporta oficialmente eventlet; "
+        "se recomienda gevent si aparecen bloqueos en el pool de MongoDB"
+    )
+
+# Instancia de SocketIO sin aplicación asociada; se enlaza en create_app()
 socketio = SocketIO(
-    app,
     cors_allowed_origins="*",
+    json=SocketIOJSON,
     async_mode=config.SOCKETIO_ASYNC_MODE,
     ping_timeout=config.SOCKETIO_PING_TIMEOUT,
-    ping_interval=config.SOCKETIO_PING_INTERVAL
+    ping_interval=config.SOCKETIO_PING_INTERVAL,
+    # 'msgpack' envía los eventos en binario (más pequeños); el cliente debe
+    # usar socket.io-msgpack-parser. 'default' mantiene JSON (orjson).
+    serializer=config.SOCKETIO_SERIALIZER,
 )
 
-# Registrar rutas
-register_auth_routes(app)
-register_user_routes(app)
-register_preferences_routes(app)
-register_favorites_routes(app)
-register_screener_routes(app)
-register_trading_routes(app, socketio)
-app.register_blueprint(order_bp, url_prefix='/api')
-init_order_socket(socketio)
-register_news_routes(app)
-register_socket_handlers(socketio)
-
-
-@app.route('/')
-def index():
+
+def create_app() -> Flask:
+    """
+    Crea y configura la aplicación Flask.
+
+    Las rutas, servicios y conexiones a MongoDB/Alpaca se importan aquí,
+    de modo que importar este módulo no tiene efectos secundarios.
+
+    Returns:
+        Flask: Aplicación configurada y enlazada a ``socketio``
+    """
+    from models.market_symbol import ensure_indexes as ensure_market_symbol_indexes
+    from models.user import ensure_indexes as ensure_user_indexes
+    from routes.auth_routes import register_auth_routes
+    from routes.user_routes import user_bp
+    from routes.preferences_router import register_preferences_routes
+    from routes.favorites_router import register_favorites_routes
+    from routes.screener_routes import register_screener_routes
+    from routes.trading_routes import register_trading_routes
+    from routes.order_routes import order_bp, init_order_socket
+    from routes.news_routes import register_news_routes
+    from sockets.ws_events import register_socket_handlers
+
+    # Inicializar Flask
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = config.SECRET_KEY
+    app.json = OrjsonProvider(app)
+    CORS(app, resources={r"/api/*": {"origins": "*"}})
+
+    # Inicializar SocketIO
+    socketio.init_app(app)
+
+    # Registrar rutas
+    register_auth_routes(app)
+    app.register_blueprint(user_bp, url_prefix='/api')
+    register_preferences_routes(app)
+    register_favorites_routes(app)
+    register_screener_routes(app)
+    register_trading_routes(app, socketio)
+    app.register_blueprint(order_bp, url_prefix='/api')
+    init_order_socket(socketio)
+    register_news_routes(app)
+    register_socket_handlers(socketio)
+    _register_core_handlers(app)
+
+    # Índices de MongoDB: se crean una única vez al arrancar
     try:
-        is_valid, errors = config.validate()
-        if not is_valid:
-            logger.error(f"Configuración inválida: {errors}")
+        ensure_user_indexes()
+        ensure_market_symbol_indexes()
+    except Exception as e:
+        logger.error("Error al crear índices de MongoDB: %s", e)
+
+    return app
+
+
+def _register_core_handlers(app: Flask) -> None:
+    """Registra el healthcheck y los manejadores de error."""
+
+    @app.route('/')
+    def index():
+        try:
+            # Resultado precalculado al cargar la configuración
+            is_valid, errors = config._validation
+            if not is_valid:
+                logger.warning("Configuración inválida: %s", errors)
+                return jsonify({
+                    'success': False,
+                    'error': 'Configuración inválida',
+                    'details': errors,
+                }), 500
+
+            return jsonify({
+                'success': True,
+                'data': {
+                    'status': 'ok',
+                },
+            })
+        except Exception as e:
+            logger.error("Error al procesar healthcheck: %s", e)
             return jsonify({
                 'success': False,
-                'error': 'Configuración inválida',
-                'details': errors,
+                'error': 'Error interno del servidor',
             }), 500
 
+    # ========================================================================
+    # ERROR HANDLERS
+    # ========================================================================
+
+    @app.errorhandler(404)
+    def not_found(error):
+        """Maneja errores 404."""
         return jsonify({
-            'success': True,
-            'data': {
-                'status': 'ok',
-            },
-        })
-    except Exception as e:
-        logger.error(f"Error al procesar healthcheck: {str(e)}")
+            'success': False,
+            'error': 'Recurso no encontrado'
+        }), 404
+
+    @app.errorhandler(500)
+    def internal_error(error):
+        """Maneja errores 500."""
+        logger.error("Error interno: %s", error)
         return jsonify({
             'success': False,
-            'error': 'Error interno del servidor',
+            'error': 'Error interno del servidor'
         }), 500
 
-# ============================================================================
-# ERROR HANDLERS
-# ============================================================================
-
-@app.errorhandler(404)
-def not_found(error):
-    """Maneja errores 404."""
-    return jsonify({
-        'success': False,
-        'error': 'Recurso no encontrado'
-    }), 404
-
-
-@app.errorhandler(500)
-def internal_error(error):
-    """Maneja errores 500."""
-    logger.error(f"Error interno: {str(error)}")
-    return jsonify({
-        'success': False,
-        'error': 'Error interno del servidor'
-    }), 500
-
 
 # ============================================================================
 # PUNTO DE ENTRADA
@@ -127,20 +173,30 @@ def internal_error(error):
 
 if __name__ == '__main__':
     logger.info("Iniciando aplicación de Trading Swing...")
-    logger.info(f"Modo: {'Desarrollo' if config.DEBUG else 'Producción'}")
-    logger.info(f"Alpaca URL: {config.ALPACA_BASE_URL}")
+    logger.info("Modo: %s", 'Desarrollo' if config.DEBUG else 'Producción')
+    logger.info("Alpaca URL: %s", config.ALPACA_BASE_URL)
     
     # Validar configuración
     is_valid, errors = config.validate()
     if not is_valid:
         logger.error("Error en la configuración:")
         for error in errors:
-            logger.error(f"  - {error}")
+            logger.error("  - %s", error)
         exit(1)
     
+    # En modo threading, socketio.run() levanta el servidor de desarrollo de
+    # Werkzeug: no se permite fuera de desarrollo.
+    if not config.DEBUG and _socketio_async_mode == 'threading':
+        logger.error(
+            "El servidor de desarrollo no debe usarse en producción. "
+            "Use gunicorn con wsgi:app (ver wsgi.py) o configure "
+            "SOCKETIO_ASYNC_MODE=eventlet/gevent."
+        )
+        exit(1)
+
     # Iniciar servidor
     socketio.run(
-        app,
+        create_app(),
         debug=config.DEBUG,
         host=config.API_HOST,
         port=config.API_PORT
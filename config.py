@@ -1,98 +1,166 @@
 """
 Módulo de configuración de la aplicación.
 
-Implementa el patrón Singleton para garantizar una única instancia
-de configuración durante el ciclo de vida de la aplicación.
+Expone una única instancia inmutable de configuración, construida al
+importar el módulo, durante todo el ciclo de vida de la aplicación.
 """
 
 import os
-from typing import Tuple, List
+from dataclasses import dataclass, field
+from typing import List, Mapping, Optional, Tuple
 from dotenv import load_dotenv
 
 # Cargar variables de entorno
 load_dotenv()
 
+# Las variables de entorno no cambian en tiempo de ejecución: se toma una
+# única instantánea al importar el módulo y se lee desde ella.
+_ENV = dict(os.environ)
 
+
+@dataclass(frozen=True, slots=True)
 class Config:
     """
-    Clase de configuración con patrón Singleton.
+    Configuración inmutable de la aplicación.
     
     Centraliza todas las configuraciones de la aplicación,
     incluyendo credenciales de Alpaca, configuración de Flask
-    y parámetros de trading.
+    y parámetros de trading. Se construye una única vez al importar
+    el módulo mediante ``Config.from_env()``.
     """
-    
-    _instance = None
-    
-    def __new__(cls):
-        """Implementación del patrón Singleton."""
-        if cls._instance is None:
-            cls._instance = super(Config, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
-    def __init__(self):
-        """Inicializa la configuración desde variables de entorno."""
-        if self._initialized:
-            return
-        
-        # Credenciales de Alpaca
-        self.ALPACA_API_KEY = os.getenv('ALPACA_API_KEY', '')
-        self.ALPACA_SECRET_KEY = os.getenv('ALPACA_SECRET_KEY', '')
-        self.ALPACA_BASE_URL = os.getenv(
-            'ALPACA_BASE_URL', 
-            'https://paper-api.alpaca.markets'
-        )
+
+    # Credenciales de Alpaca
+    ALPACA_API_KEY: str
+    ALPACA_SECRET_KEY: str
+    ALPACA_BASE_URL: str
+
+    # Configuración de Flask
+    SECRET_KEY: str
+    API_MODE: str
+    API_HOST: str
+    API_PORT: int
+    DEBUG: bool
+
+    # Configuración de SocketIO
+    SOCKETIO_ASYNC_MODE: str
+    SOCKETIO_PING_TIMEOUT: int
+    SOCKETIO_PING_INTERVAL: int
+    SOCKETIO_SERIALIZER: str
+    ACCOUNT_BROADCAST_INTERVAL: float
+
+    # Límites de trading
+    MIN_ORDER_SIZE: float
+    MAX_ORDER_SIZE: float
+
+    # Configuración de datos de mercado
+    DEFAULT_TIMEFRAME: str
+    DEFAULT_BARS_LIMIT: int
+    MAX_BARS_MIN: int
+    MAX_BARS_HOUR: int
+    MAX_BARS_DAY: int
+
+    # Auto-trading swing
+    SWING_AUTOTRADE_ENABLED: bool
+
+    # Configuración de base de datos
+    MONGO_URI: str
+    MONGO_DB: str
+    MONGO_MAX_POOL_SIZE: int
+    MONGO_MIN_POOL_SIZE: int
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int
+
+    # Configuración de seguridad
+    FERNET_KEY: str
+    JWT_EXPIRES_MIN: int
+    JWT_ALGORITHM: str = 'HS256'
+
+    # Resultado de validación, calculado una sola vez tras la carga
+    _validation: Tuple[bool, Tuple[str, ...]] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, '_validation', self._compute_validation())
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> 'Config':
+        """
+        Construye la configuración desde variables de entorno.
         
-        # Configuración de Flask
-        self.SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
-        self.API_MODE = os.getenv('API_MODE', 'development').lower()
-        self.API_HOST = os.getenv('API_HOST', '0.0.0.0')
-        self.API_PORT = int(os.getenv('API_PORT', '5080'))
-
-        _debug_env = os.getenv('DEBUG')
-        if _debug_env is None:
-            self.DEBUG = self.API_MODE == 'development'
+        Args:
+            env: Mapeo de variables (por defecto, la instantánea del entorno)
+            
+        Returns:
+            Config: Configuración cargada
+        """
+        env = _ENV if env is None else env
+
+        api_mode = env.get('API_MODE', 'development').lower()
+
+        debug_env = env.get('DEBUG')
+        if debug_env is None:
+            debug = api_mode == 'development'
         else:
-            self.DEBUG = _debug_env.lower() == 'true'
-        
-        # Configuración de SocketIO
-        self.SOCKETIO_ASYNC_MODE = os.getenv('SOCKETIO_ASYNC_MODE', 'threading')
-        self.SOCKETIO_PING_TIMEOUT = int(os.getenv('SOCKETIO_PING_TIMEOUT', '60'))
-        self.SOCKETIO_PING_INTERVAL = int(os.getenv('SOCKETIO_PING_INTERVAL', '25'))
-        
-        # Límites de trading
-        self.MIN_ORDER_SIZE = float(os.getenv('MIN_ORDER_SIZE', '1.0'))
-        self.MAX_ORDER_SIZE = float(os.getenv('MAX_ORDER_SIZE', '100000.0'))
-        
-        # Configuración de datos de mercado
-        self.DEFAULT_TIMEFRAME = os.getenv('DEFAULT_TIMEFRAME', '1D')
-        self.DEFAULT_BARS_LIMIT = int(os.getenv('DEFAULT_BARS_LIMIT', '100'))
-        self.MAX_BARS_MIN = int(os.getenv('MAX_BARS_MIN', '390'))
-        self.MAX_BARS_HOUR = int(os.getenv('MAX_BARS_HOUR', '400'))
-        self.MAX_BARS_DAY = int(os.getenv('MAX_BARS_DAY', '252'))
-
-        # Auto-trading swing (desactivado por defecto)
-        self.SWING_AUTOTRADE_ENABLED = os.getenv('SWING_AUTOTRADE_ENABLED', 'false').lower() == 'true'
-
-        # Configuración de base de datos
-        self.MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017')
-        self.MONGO_DB = os.getenv('MONGO_DB', 'trading_swing')
-
-        # Configuración de seguridad
-        self.FERNET_KEY = os.getenv('FERNET_KEY', '')
-        self.JWT_EXPIRES_MIN = int(os.getenv('JWT_EXPIRES_MIN', '720'))
-        self.JWT_ALGORITHM = 'HS256'
-
-        self._initialized = True
+            debug = debug_env.lower() == 'true'
+
+        # En producción se usa un servidor cooperativo (eventlet) por defecto:
+        # el modo 'threading' levanta el servidor de desarrollo de Werkzeug,
+        # un hilo de SO por petición y sin soporte real de WebSocket.
+        default_async_mode = 'threading' if api_mode == 'development' else 'eventlet'
+
+        return cls(
+            ALPACA_API_KEY=env.get('ALPACA_API_KEY', ''),
+            ALPACA_SECRET_KEY=env.get('ALPACA_SECRET_KEY', ''),
+            ALPACA_BASE_URL=env.get(
+                'ALPACA_BASE_URL',
+                'https://paper-api.alpaca.markets'
+            ),
+            SECRET_KEY=env.get('SECRET_KEY', 'dev-secret-key-change-in-production'),
+            API_MODE=api_mode,
+            API_HOST=env.get('API_HOST', '0.0.0.0'),
+            API_PORT=int(env.get('API_PORT', '5080')),
+            DEBUG=debug,
+            SOCKETIO_ASYNC_MODE=env.get(
+                'SOCKETIO_ASYNC_MODE',
+                default_async_mode
+            ).lower(),
+            SOCKETIO_PING_TIMEOUT=int(env.get('SOCKETIO_PING_TIMEOUT', '60')),
+            SOCKETIO_PING_INTERVAL=int(env.get('SOCKETIO_PING_INTERVAL', '25')),
+            SOCKETIO_SERIALIZER=env.get('SOCKETIO_SERIALIZER', 'default').lower(),
+            ACCOUNT_BROADCAST_INTERVAL=float(env.get('ACCOUNT_BROADCAST_INTERVAL', '2')),
+            MIN_ORDER_SIZE=float(env.get('MIN_ORDER_SIZE', '1.0')),
+            MAX_ORDER_SIZE=float(env.get('MAX_ORDER_SIZE', '100000.0')),
+            DEFAULT_TIMEFRAME=env.get('DEFAULT_TIMEFRAME', '1D'),
+            DEFAULT_BARS_LIMIT=int(env.get('DEFAULT_BARS_LIMIT', '100')),
+            MAX_BARS_MIN=int(env.get('MAX_BARS_MIN', '390')),
+            MAX_BARS_HOUR=int(env.get('MAX_BARS_HOUR', '400')),
+            MAX_BARS_DAY=int(env.get('MAX_BARS_DAY', '252')),
+            SWING_AUTOTRADE_ENABLED=env.get('SWING_AUTOTRADE_ENABLED', 'false').lower() == 'true',
+            MONGO_URI=env.get('MONGO_URI', 'mongodb://localhost:27017'),
+            MONGO_DB=env.get('MONGO_DB', 'trading_swing'),
+            MONGO_MAX_POOL_SIZE=int(env.get('MONGO_MAX_POOL_SIZE', '100')),
+            MONGO_MIN_POOL_SIZE=int(env.get('MONGO_MIN_POOL_SIZE', '10')),
+            MONGO_SERVER_SELECTION_TIMEOUT_MS=int(
+                env.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '3000')
+            ),
+            FERNET_KEY=env.get('FERNET_KEY', ''),
+            JWT_EXPIRES_MIN=int(env.get('JWT_EXPIRES_MIN', '720')),
+        )
     
     def validate(self) -> Tuple[bool, List[str]]:
         """
         Valida que la configuración esté completa.
+
+        El resultado se calcula una única vez al cargar la configuración.
         
         Returns:
             Tuple[bool, List[str]]: (es_válida, lista_de_errores)
         """
+        is_valid, errors = self._validation
+        return is_valid, list(errors)
+
+    def _compute_validation(self) -> Tuple[bool, Tuple[str, ...]]:
+        """Evalúa las reglas de validación sobre los valores cargados."""
         errors = []
         
         if not self.ALPACA_API_KEY:
@@ -105,6 +173,9 @@ class Config:
             if not self.DEBUG:
                 errors.append("SECRET_KEY debe configurarse en producción")
 
+        if self.SOCKETIO_SERIALIZER not in ('default', 'msgpack'):
+            errors.append("SOCKETIO_SERIALIZER debe ser default o msgpack")
+
         if not self.MONGO_URI:
             errors.append("MONGO_URI no está configurada")
 
@@ -114,7 +185,7 @@ class Config:
         if not self.FERNET_KEY:
             errors.append("FERNET_KEY no está configurada")
         
-        return len(errors) == 0, errors
+        return len(errors) == 0, tuple(errors)
     
     def to_dict(self) -> dict:
         """
@@ -130,6 +201,8 @@ class Config:
             'API_PORT': self.API_PORT,
             'DEBUG': self.DEBUG,
             'SOCKETIO_ASYNC_MODE': self.SOCKETIO_ASYNC_MODE,
+            'SOCKETIO_SERIALIZER': self.SOCKETIO_SERIALIZER,
+            'ACCOUNT_BROADCAST_INTERVAL': self.ACCOUNT_BROADCAST_INTERVAL,
             'MIN_ORDER_SIZE': self.MIN_ORDER_SIZE,
             'MAX_ORDER_SIZE': self.MAX_ORDER_SIZE,
             'DEFAULT_TIMEFRAME': self.DEFAULT_TIMEFRAME,
@@ -141,6 +214,9 @@ class Config:
             'ALPACA_SECRET_KEY_SET': bool(self.ALPACA_SECRET_KEY),
             'MONGO_URI_SET': bool(self.MONGO_URI),
             'MONGO_DB': self.MONGO_DB,
+            'MONGO_MAX_POOL_SIZE': self.MONGO_MAX_POOL_SIZE,
+            'MONGO_MIN_POOL_SIZE': self.MONGO_MIN_POOL_SIZE,
+            'MONGO_SERVER_SELECTION_TIMEOUT_MS': self.MONGO_SERVER_SELECTION_TIMEOUT_MS,
             'FERNET_KEY_SET': bool(self.FERNET_KEY),
             'JWT_EXPIRES_MIN': self.JWT_EXPIRES_MIN,
             'SWING_AUTOTRADE_ENABLED': self.SWING_AUTOTRADE_ENABLED,
@@ -148,4 +224,4 @@ class Config:
 
 
 # Instancia global de configuración
-config = Config()
+config = Config.from_env()
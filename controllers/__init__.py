@@ -2,12 +2,33 @@
 Módulo de controladores.
 
 Exporta los blueprints y funciones de registro de controladores.
+
+Las importaciones se resuelven de forma diferida (PEP 562): los
+controladores arrastran servicios, clientes de Alpaca y MongoDB, por lo
+que solo se cargan cuando se accede al nombre por primera vez.
 """
 
-from controllers.trading_controller import trading_bp
-from controllers.websocket_controller import register_websocket_handlers
+from importlib import import_module
+
+_EXPORTS = {
+    'trading_bp': 'controllers.trading_controller',
+    'register_websocket_handlers': 'controllers.websocket_controller',
+}
 
 __all__ = [
     'trading_bp',
     'register_websocket_handlers'
 ]
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -11,6 +11,7 @@ import logging
 from services.trading_service import trading_service, TradingServiceException
 from services.alpaca_service import alpaca_service, AlpacaServiceException
 from models.order import OrderSide
+from utils.symbols import normalize_symbol
 
 # Configurar logger
 logger = logging.getLogger(__name__)
@@ -18,6 +19,54 @@ logger = logging.getLogger(__name__)
 # Crear Blueprint
 trading_bp = Blueprint('trading', __name__, url_prefix='/api')
 
+# Validadores precalculados
+_ORDER_REQUIRED = frozenset({'symbol', 'qty', 'side', 'order_type'})
+_SWING_REQUIRED = frozenset({
+    'symbol', 'qty', 'entry_price', 'take_profit_price', 'stop_loss_price'
+})
+_SIDE_MAP = {'buy': OrderSide.BUY, 'sell': OrderSide.SELL}
+
+
+def _create_market(data, symbol, qty, side):
+    return trading_service.create_market_order(symbol=symbol, qty=qty, side=side)
+
+
+def _create_limit(data, symbol, qty, side):
+    return trading_service.create_limit_order(
+        symbol=symbol,
+        qty=qty,
+        side=side,
+        limit_price=float(data['limit_price'])
+    )
+
+
+# Despacho por tipo de orden
+_TYPE = {
+    'market': _create_market,
+    'limit': _create_limit,
+}
+
+# Campo adicional requerido por tipo de orden y su mensaje de error
+_TYPE_REQUIRED = {
+    'limit': ('limit_price', 'limit_price requerido para orden límite'),
+}
+
+
+def _missing_fields_response(missing):
+    """Respuesta 400 para campos requeridos faltantes."""
+    return jsonify({
+        'success': False,
+        'error': f'Campo requerido faltante: {", ".join(sorted(missing))}'
+    }), 400
+
+
+def _invalid_body_response():
+    """Respuesta 400 para cuerpos que no son un objeto JSON."""
+    return jsonify({
+        'success': False,
+        'error': 'El cuerpo de la petición debe ser un objeto JSON'
+    }), 400
+
 
 @trading_bp.route('/account', methods=['GET'])
 def get_account():
@@ -29,7 +78,7 @@ def get_account():
             'data': account.to_dict()
         })
     except TradingServiceException as e:
-        logger.error(f"Error al obtener cuenta: {str(e)}")
+        logger.error("Error al obtener cuenta: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -43,10 +92,10 @@ def get_positions():
         positions = trading_service.get_positions()
         return jsonify({
             'success': True,
-            'data': [pos.to_dict() for pos in positions]
+            'data': positions
         })
     except TradingServiceException as e:
-        logger.error(f"Error al obtener posiciones: {str(e)}")
+        logger.error("Error al obtener posiciones: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -60,10 +109,10 @@ def get_orders():
         orders = trading_service.get_open_orders()
         return jsonify({
             'success': True,
-            'data': [order.to_dict() for order in orders]
+            'data': orders
         })
     except TradingServiceException as e:
-        logger.error(f"Error al obtener órdenes: {str(e)}")
+        logger.error("Error al obtener órdenes: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -85,45 +134,40 @@ def create_order():
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
+        if not isinstance(data, dict):
+            return _invalid_body_response()
         
         # Validar datos requeridos
-        required_fields = ['symbol', 'qty', 'side', 'order_type']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    'success': False,
-                    'error': f'Campo requerido faltante: {field}'
-                }), 400
+        missing = _ORDER_REQUIRED - data.keys()
+        if missing:
+            return _missing_fields_response(missing)
         
         # Convertir side a enum
-        side = OrderSide.BUY if data['side'].lower() == 'buy' else OrderSide.SELL
+        side = _SIDE_MAP.get(str(data['side']).lower())
+        if side is None:
+            return jsonify({
+                'success': False,
+                'error': f'Lado de orden no soportado: {data["side"]}'
+            }), 400
         
         # Crear orden según tipo
-        if data['order_type'].lower() == 'market':
-            order = trading_service.create_market_order(
-                symbol=data['symbol'].upper(),
-                qty=float(data['qty']),
-                side=side
-            )
-        elif data['order_type'].lower() == 'limit':
-            if 'limit_price' not in data:
-                return jsonify({
-                    'success': False,
-                    'error': 'limit_price requerido para orden límite'
-                }), 400
-            
-            order = trading_service.create_limit_order(
-                symbol=data['symbol'].upper(),
-                qty=float(data['qty']),
-                side=side,
-                limit_price=float(data['limit_price'])
-            )
-        else:
+        order_type = str(data['order_type']).lower()
+        handler = _TYPE.get(order_type)
+        if handler is None:
             return jsonify({
                 'success': False,
                 'error': f'Tipo de orden no soportado: {data["order_type"]}'
             }), 400
+
+        required = _TYPE_REQUIRED.get(order_type)
+        if required is not None and required[0] not in data:
+            return jsonify({
+                'success': False,
+                'error': required[1]
+            }), 400
+
+        order = handler(data, normalize_symbol(str(data['symbol'])), float(data['qty']), side)
         
         return jsonify({
             'success': True,
@@ -131,13 +175,13 @@ def create_order():
         }), 201
         
     except TradingServiceException as e:
-        logger.error(f"Error al crear orden: {str(e)}")
+        logger.error("Error al crear orden: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 400
     except Exception as e:
-        logger.error(f"Error inesperado al crear orden: {str(e)}")
+        logger.error("Error inesperado al crear orden: %s", e)
         return jsonify({
             'success': False,
             'error': 'Error interno del servidor'
@@ -159,20 +203,18 @@ def create_swing_trade():
         }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
+        if not isinstance(data, dict):
+            return _invalid_body_response()
         
         # Validar datos requeridos
-        required_fields = ['symbol', 'qty', 'entry_price', 'take_profit_price', 'stop_loss_price']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    'success': False,
-                    'error': f'Campo requerido faltante: {field}'
-                }), 400
+        missing = _SWING_REQUIRED - data.keys()
+        if missing:
+            return _missing_fields_response(missing)
         
         # Crear swing trade
         result = trading_service.create_swing_trade(
-            symbol=data['symbol'].upper(),
+            symbol=normalize_symbol(str(data['symbol'])),
             qty=float(data['qty']),
             entry_price=float(data['entry_price']),
             take_profit_price=float(data['take_profit_price']),
@@ -192,13 +234,13 @@ def create_swing_trade():
         }), 201
         
     except TradingServiceException as e:
-        logger.error(f"Error al crear swing trade: {str(e)}")
+        logger.error("Error al crear swing trade: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 400
     except Exception as e:
-        logger.error(f"Error inesperado al crear swing trade: {str(e)}")
+        logger.error("Error inesperado al crear swing trade: %s", e)
         return jsonify({
             'success': False,
             'error': 'Error interno del servidor'
@@ -215,7 +257,7 @@ def cancel_order(order_id):
             'message': f'Orden {order_id} cancelada exitosamente'
         })
     except TradingServiceException as e:
-        logger.error(f"Error al cancelar orden: {str(e)}")
+        logger.error("Error al cancelar orden: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -226,13 +268,13 @@ def cancel_order(order_id):
 def get_quote(symbol):
     """Obtiene la cotización actual de un símbolo."""
     try:
-        quote = alpaca_service.get_last_quote(symbol.upper())
+        quote = alpaca_service.get_last_quote(normalize_symbol(symbol))
         return jsonify({
             'success': True,
             'data': quote
         })
     except AlpacaServiceException as e:
-        logger.error(f"Error al obtener cotización: {str(e)}")
+        logger.error("Error al obtener cotización: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -248,23 +290,25 @@ def get_bars(symbol):
         timeframe: Marco temporal (default: '1D')
         limit: Número de barras (default: 100)
     """
+    timeframe = request.args.get('timeframe', '1D', type=str)
+    limit = request.args.get('limit', type=int)
+    if limit is None:
+        if 'limit' in request.args:
+            return jsonify({
+                'success': False,
+                'error': 'Parámetro limit debe ser un número'
+            }), 400
+        limit = 100
+
     try:
-        timeframe = request.args.get('timeframe', '1D')
-        limit = int(request.args.get('limit', 100))
-        
-        bars = alpaca_service.get_bars(symbol.upper(), timeframe, limit)
+        bars = alpaca_service.get_bars(normalize_symbol(symbol), timeframe, limit)
         return jsonify({
             'success': True,
             'data': bars
         })
     except AlpacaServiceException as e:
-        logger.error(f"Error al obtener barras: {str(e)}")
+        logger.error("Error al obtener barras: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 400
-    except ValueError as e:
-        return jsonify({
-            'success': False,
-            'error': 'Parámetro limit debe ser un número'
-        }), 400
@@ -11,6 +11,7 @@ import logging
 
 from services.trading_service import trading_service
 from services.alpaca_service import alpaca_service
+from utils.symbols import normalize_symbol
 
 # Configurar logger
 logger = logging.getLogger(__name__)
@@ -27,13 +28,13 @@ def register_websocket_handlers(socketio):
     @socketio.on('connect')
     def handle_connect():
         """Maneja la conexión de un cliente WebSocket."""
-        logger.info(f'Cliente conectado: {request.sid}')
+        logger.info('Cliente conectado: %s', request.sid)
         emit('connected', {'message': 'Conectado al servidor de trading'})
 
     @socketio.on('disconnect')
     def handle_disconnect():
         """Maneja la desconexión de un cliente WebSocket."""
-        logger.info(f'Cliente desconectado: {request.sid}')
+        logger.info('Cliente desconectado: %s', request.sid)
 
     @socketio.on('subscribe_symbol')
     def handle_subscribe_symbol(data):
@@ -44,12 +45,12 @@ def register_websocket_handlers(socketio):
             data: {'symbol': 'AAPL'}
         """
         try:
-            symbol = data.get('symbol', '').upper()
+            symbol = normalize_symbol(str(data.get('symbol', '')))
             if not symbol:
                 emit('error', {'message': 'Símbolo requerido'})
                 return
             
-            logger.info(f'Cliente {request.sid} suscrito a {symbol}')
+            logger.info('Cliente %s suscrito a %s', request.sid, symbol)
             emit('subscribed', {'symbol': symbol, 'message': f'Suscrito a {symbol}'})
             
             # Enviar cotización inicial
@@ -57,7 +58,7 @@ def register_websocket_handlers(socketio):
             emit('quote_update', quote)
             
         except Exception as e:
-            logger.error(f"Error en suscripción: {str(e)}")
+            logger.error("Error en suscripción: %s", e)
             emit('error', {'message': str(e)})
 
     @socketio.on('request_account_update')
@@ -67,7 +68,7 @@ def register_websocket_handlers(socketio):
             account = trading_service.get_account_info()
             emit('account_update', account.to_dict())
         except Exception as e:
-            logger.error(f"Error al actualizar cuenta: {str(e)}")
+            logger.error("Error al actualizar cuenta: %s", e)
             emit('error', {'message': str(e)})
 
     @socketio.on('request_positions_update')
@@ -77,7 +78,7 @@ def register_websocket_handlers(socketio):
             positions = trading_service.get_positions()
             emit('positions_update', [pos.to_dict() for pos in positions])
         except Exception as e:
-            logger.error(f"Error al actualizar posiciones: {str(e)}")
+            logger.error("Error al actualizar posiciones: %s", e)
             emit('error', {'message': str(e)})
 
     @socketio.on('request_orders_update')
@@ -87,5 +88,5 @@ def register_websocket_handlers(socketio):
             orders = trading_service.get_open_orders()
             emit('orders_update', [order.to_dict() for order in orders])
         except Exception as e:
-            logger.error(f"Error al actualizar órdenes: {str(e)}")
+            logger.error("Error al actualizar órdenes: %s", e)
             emit('error', {'message': str(e)})
@@ -1,19 +1,29 @@
 from typing import Optional
 
 from pymongo import MongoClient
+from pymongo.database import Database
 
 from config import config
 
 _client: Optional[MongoClient] = None
+_db: Optional[Database] = None
 
 
 def get_client() -> MongoClient:
     global _client
     if _client is None:
-        _client = MongoClient(config.MONGO_URI)
+        _client = MongoClient(
+            config.MONGO_URI,
+            maxPoolSize=config.MONGO_MAX_POOL_SIZE,
+            minPoolSize=config.MONGO_MIN_POOL_SIZE,
+            serverSelectionTimeoutMS=config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            uuidRepresentation="standard",
+        )
     return _client
 
 
-def get_db():
-    client = get_client()
-    return client[config.MONGO_DB]
+def get_db() -> Database:
+    global _db
+    if _db is None:
+        _db = get_client()[config.MONGO_DB]
+    return _db
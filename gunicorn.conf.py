@@ -0,0 +1,38 @@
+"""
+Configuración de Gunicorn (se carga automáticamente desde el directorio de trabajo).
+
+La clase de worker se deriva de ``SOCKETIO_ASYNC_MODE`` para que el
+monkey-patching de ``app.py`` y el worker coincidan siempre. Todas las rutas
+son de E/S (MongoDB + Alpaca): un worker cooperativo mantiene cientos de
+peticiones en vuelo en lugar de una por hilo.
+
+Uso:
+    gunicorn wsgi:app
+"""
+
+import os
+
+from config import config
+
+# Socket.IO (salas, sesiones) y las cachés en proceso viven en memoria del
+# worker: sin message queue solo puede haber uno.
+workers = 1
+
+_WORKER_CLASSES = {
+    'eventlet': 'eventlet',
+    'gevent': 'gevent',
+    'gevent_uwsgi': 'gevent',
+    'threading': 'gthread',
+}
+worker_class = _WORKER_CLASSES.get(config.SOCKETIO_ASYNC_MODE, 'eventlet')
+if worker_class == 'gevent':
+    # Soporte de WebSocket con gevent
+    worker_class = 'geventwebsocket.gunicorn.workers.GeventWebSocketWorker'
+
+# Conexiones concurrentes por worker cooperativo (ignorado por gthread)
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '2000'))
+# Solo con gthread (SOCKETIO_ASYNC_MODE=threading)
+threads = int(os.environ.get('GUNICORN_THREADS', '32'))
+
+bind = f"{config.API_HOST}:{config.API_PORT}"
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
@@ -1,11 +1,40 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, Optional, List
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, Optional, List, Tuple
 
 from bson import ObjectId
 from pymongo.collection import Collection
 
 from db.mongo import get_db
+from utils.symbols import normalize_symbol
+
+_COLLECTION: Optional[Collection] = None
+
+# Campos de datos que se copian tal cual entre dataclass, Mongo y API
+_DATA_FIELDS = (
+    "name",
+    "market",
+    "price",
+    "close",
+    "change",
+    "percent_change",
+    "direction",
+    "volume",
+    "trade_count",
+    "last_screener_timestamp",
+)
+_get_data_fields = attrgetter(*_DATA_FIELDS)
+
+_LIST_PROJECTION = dict.fromkeys(("symbol", *_DATA_FIELDS, "created_at", "updated_at"), 1)
+_LIST_BATCH_SIZE = 500
+
+# Orden de columnas del formato columnar de list_symbols_columnar
+_COLUMNS = ("id", "symbol", *_DATA_FIELDS, "created_at", "updated_at")
+
+# Campos que se pueden pedir a iter_symbols_as_dicts(fields=...)
+LIST_FIELDS = frozenset(_COLUMNS)
+_DATE_FIELDS = frozenset(("created_at", "updated_at"))
 
 
 @dataclass
@@ -26,79 +55,174 @@ class MarketSymbol:
     updated_at: datetime = field(default_factory=datetime.utcnow)
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "symbol": self.symbol,
-            "name": self.name,
-            "market": self.market,
-            "price": self.price,
-            "close": self.close,
-            "change": self.change,
-            "percent_change": self.percent_change,
-            "direction": self.direction,
-            "volume": self.volume,
-            "trade_count": self.trade_count,
-            "last_screener_timestamp": self.last_screener_timestamp,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+        data: Dict[str, Any] = {"id": self.id, "symbol": self.symbol}
+        data.update(zip(_DATA_FIELDS, _get_data_fields(self)))
+        data["created_at"] = self.created_at.isoformat() if self.created_at else None
+        data["updated_at"] = self.updated_at.isoformat() if self.updated_at else None
+        return data
 
     def to_mongo(self) -> Dict[str, Any]:
-        doc: Dict[str, Any] = {
-            "symbol": self.symbol.upper().strip(),
-            "name": self.name,
-            "market": self.market,
-            "price": self.price,
-            "close": self.close,
-            "change": self.change,
-            "percent_change": self.percent_change,
-            "direction": self.direction,
-            "volume": self.volume,
-            "trade_count": self.trade_count,
-            "last_screener_timestamp": self.last_screener_timestamp,
-            "created_at": self.created_at,
-            "updated_at": self.updated_at,
-        }
+        doc: Dict[str, Any] = {"symbol": normalize_symbol(self.symbol)}
+        doc.update(zip(_DATA_FIELDS, _get_data_fields(self)))
+        doc["created_at"] = self.created_at
+        doc["updated_at"] = self.updated_at
         if self.id is not None:
             doc["_id"] = ObjectId(self.id)
         return doc
 
     @classmethod
     def from_mongo(cls, doc: Dict[str, Any]) -> "MarketSymbol":
+        _id = doc.get("_id")
+        # Solo se consulta el reloj si falta alguna marca de tiempo
+        now = None
+        if "created_at" not in doc or "updated_at" not in doc:
+            now = datetime.utcnow()
         return cls(
-            id=str(doc.get("_id")) if doc.get("_id") is not None else None,
+            id=str(_id) if _id is not None else None,
             symbol=str(doc.get("symbol", "")),
-            name=doc.get("name"),
-            market=doc.get("market"),
-            price=doc.get("price"),
-            close=doc.get("close"),
-            change=doc.get("change"),
-            percent_change=doc.get("percent_change"),
-            direction=doc.get("direction"),
-            volume=doc.get("volume"),
-            trade_count=doc.get("trade_count"),
-            last_screener_timestamp=doc.get("last_screener_timestamp"),
-            created_at=doc.get("created_at", datetime.utcnow()),
-            updated_at=doc.get("updated_at", datetime.utcnow()),
+            **{name: doc.get(name) for name in _DATA_FIELDS},
+            created_at=doc.get("created_at", now),
+            updated_at=doc.get("updated_at", now),
         )
 
 
 def _get_collection() -> Collection:
-    db = get_db()
-    collection = db["market_symbols"]
-    collection.create_index("symbol", unique=True)
-    return collection
+    global _COLLECTION
+    if _COLLECTION is None:
+        _COLLECTION = get_db()["market_symbols"]
+    return _COLLECTION
+
+
+def ensure_indexes() -> None:
+    """Crea los índices de la colección; se invoca una sola vez al arrancar."""
+    _get_collection().create_index("symbol", unique=True)
 
 
 def get_symbol_by_symbol(symbol: str) -> Optional[MarketSymbol]:
     col = _get_collection()
-    doc = col.find_one({"symbol": symbol.upper().strip()})
+    doc = col.find_one({"symbol": normalize_symbol(symbol)})
     if not doc:
         return None
     return MarketSymbol.from_mongo(doc)
 
 
+def get_symbols_by_symbols(symbols: Iterable[str]) -> Dict[str, MarketSymbol]:
+    """Obtiene varios símbolos en una sola consulta, indexados por símbolo."""
+    wanted = [normalize_symbol(sym) for sym in symbols]
+    if not wanted:
+        return {}
+    col = _get_collection()
+    cursor = col.find({"symbol": {"$in": wanted}})
+    found: Dict[str, MarketSymbol] = {}
+    for doc in cursor:
+        item = MarketSymbol.from_mongo(doc)
+        found[item.symbol] = item
+    return found
+
+
 def list_symbols(limit: int = 1000) -> List[MarketSymbol]:
     col = _get_collection()
     cursor = col.find({}).sort("symbol", 1).limit(limit)
     return [MarketSymbol.from_mongo(doc) for doc in cursor]
+
+
+def _doc_to_dict(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Equivalente a ``MarketSymbol.from_mongo(doc).to_dict()`` sin instanciar el dataclass."""
+    _id = doc.get("_id")
+    created_at = doc.get("created_at")
+    updated_at = doc.get("updated_at")
+    data: Dict[str, Any] = {
+        "id": str(_id) if _id is not None else None,
+        "symbol": str(doc.get("symbol", "")),
+    }
+    for name in _DATA_FIELDS:
+        data[name] = doc.get(name)
+    data["created_at"] = created_at.isoformat() if created_at else None
+    data["updated_at"] = updated_at.isoformat() if updated_at else None
+    return data
+
+
+def iter_symbols_as_dicts(
+    limit: int = 1000, fields: Optional[Iterable[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Recorre los símbolos ordenados como diccionarios listos para JSON.
+
+    Las filas se generan a medida que llegan del cursor, sin materializar
+    la lista completa.
+
+    Si se indica ``fields`` (subconjunto de ``LIST_FIELDS``), Mongo solo
+    devuelve esos campos y cada fila contiene únicamente esas claves.
+    """
+    if fields is None:
+        for doc in _list_cursor(limit):
+            yield _doc_to_dict(doc)
+        return
+
+    fields = tuple(fields)
+    for doc in _list_cursor(limit, _fields_projection(fields)):
+        yield {name: _field_value(doc, name) for name in fields}
+
+
+def _fields_projection(fields: Tuple[str, ...]) -> Dict[str, int]:
+    """Proyección de Mongo para un subconjunto de ``LIST_FIELDS``."""
+    projection = {name: 1 for name in fields if name != "id"}
+    projection["_id"] = 1 if "id" in fields else 0
+    return projection
+
+
+def _field_value(doc: Dict[str, Any], name: str) -> Any:
+    """Valor serializable de un campo de ``LIST_FIELDS`` en un documento proyectado."""
+    if name == "id":
+        _id = doc.get("_id")
+        return str(_id) if _id is not None else None
+    if name in _DATE_FIELDS:
+        value = doc.get(name)
+        return value.isoformat() if value else None
+    return doc.get(name)
+
+
+def _list_cursor(limit: int, projection: Optional[Dict[str, int]] = None):
+    col = _get_collection()
+    return (
+        col.find({}, projection=_LIST_PROJECTION if projection is None else projection)
+        .sort("symbol", 1)
+        .batch_size(_LIST_BATCH_SIZE)
+        .limit(limit)
+    )
+
+
+def list_symbols_columnar(
+    limit: int = 1000, fields: Optional[Iterable[str]] = None
+) -> Dict[str, List[Any]]:
+    """Lista símbolos en formato columnar: una lista por campo.
+
+    Los valores coinciden con los de ``iter_symbols_as_dicts`` pero sin un
+    diccionario por fila, lo que reduce asignaciones y bytes en la respuesta.
+    Con ``fields`` solo se proyectan y devuelven esas columnas.
+    """
+    if fields is not None:
+        fields = tuple(fields)
+        selected: Dict[str, List[Any]] = {name: [] for name in fields}
+        for doc in _list_cursor(limit, _fields_projection(fields)):
+            for name, values in selected.items():
+                values.append(_field_value(doc, name))
+        return selected
+
+    columns: Dict[str, List[Any]] = {name: [] for name in _COLUMNS}
+    ids = columns["id"]
+    symbols = columns["symbol"]
+    created = columns["created_at"]
+    updated = columns["updated_at"]
+    data_columns = [(name, columns[name]) for name in _DATA_FIELDS]
+
+    for doc in _list_cursor(limit):
+        _id = doc.get("_id")
+        ids.append(str(_id) if _id is not None else None)
+        symbols.append(str(doc.get("symbol", "")))
+        for name, values in data_columns:
+            values.append(doc.get(name))
+        created_at = doc.get("created_at")
+        updated_at = doc.get("updated_at")
+        created.append(created_at.isoformat() if created_at else None)
+        updated.append(updated_at.isoformat() if updated_at else None)
+    return columns
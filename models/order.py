@@ -2,14 +2,23 @@
 Modelos de datos para la aplicación de trading.
 
 Define las clases Order, Position, Account y Quote con sus
-métodos de conversión desde/hacia Alpaca API.
+métodos de conversión desde/hacia Alpaca API, y OrderSpec/SwingTradeSpec
+con los datos ya validados de las peticiones de creación de órdenes.
+
+Los campos de cada dataclass coinciden con las claves de su ``to_dict()``,
+de modo que el codificador orjson puede serializar listas de instancias
+directamente, sin construir un diccionario intermedio por elemento.
 """
 
+import sys
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Mapping
 from datetime import datetime
 
+from utils.order_validate import BRACKET_OK, bracket_error_message, validate_bracket
+from utils.symbols import normalize_symbol
+
 
 class OrderSide(Enum):
     """Lado de la orden (compra/venta)."""
@@ -47,7 +56,167 @@ class OrderStatus(Enum):
     CALCULATED = 'calculated'
 
 
-@dataclass
+# Tablas de conversión valor -> miembro, construidas una sola vez. Las
+# claves se internan para que coincidan por identidad con las cadenas
+# internadas que llegan de Alpaca y con los valores de los propios enums.
+_ORDER_SIDE_BY_VALUE = {sys.intern(member.value): member for member in OrderSide}
+_ORDER_TYPE_BY_VALUE = {sys.intern(member.value): member for member in OrderType}
+_ORDER_STATUS_BY_VALUE = {sys.intern(member.value): member for member in OrderStatus}
+
+
+def _to_float(value: Any, name: str) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} debe ser numérico') from None
+
+
+def _optional_float(value: Any, name: str) -> Optional[float]:
+    """Los valores vacíos (None, '', 0) se tratan como no informados."""
+    return _to_float(value, name) if value else None
+
+
+def _require_qty(qty: Optional[float]) -> float:
+    """Los tipos sin soporte de notional exigen qty."""
+    if qty is None:
+        raise ValueError('qty requerido para este tipo de orden')
+    return qty
+
+
+@dataclass(slots=True, frozen=True)
+class OrderSpec:
+    """
+    Petición de creación de orden ya validada y convertida.
+
+    ``from_dict`` concentra todas las conversiones (``float``, mayúsculas,
+    enums) y las validaciones por tipo de orden, de modo que el servicio
+    recibe un único objeto con los tipos correctos.
+
+    Attributes:
+        symbol: Símbolo en mayúsculas
+        side: Lado de la orden
+        order_type: Tipo de orden
+        qty: Cantidad de acciones (opcional si hay notional)
+        notional: Monto en dólares (solo market/limit)
+        limit_price: Precio límite (limit, stop_limit, bracket)
+        stop_price: Precio stop (stop, stop_limit)
+        trail_price: Trail en dólares (trailing_stop)
+        trail_percent: Trail en porcentaje (trailing_stop)
+        take_profit: ``{'limit_price': float}`` (bracket)
+        stop_loss: ``{'stop_price': float[, 'limit_price': float]}`` (bracket)
+    """
+    symbol: str
+    side: OrderSide
+    order_type: OrderType
+    qty: Optional[float] = None
+    notional: Optional[float] = None
+    limit_price: Optional[float] = None
+    stop_price: Optional[float] = None
+    trail_price: Optional[float] = None
+    trail_percent: Optional[float] = None
+    take_profit: Optional[Dict[str, float]] = None
+    stop_loss: Optional[Dict[str, float]] = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'OrderSpec':
+        """
+        Construye la especificación desde el cuerpo JSON de la petición.
+
+        Raises:
+            ValueError: Si faltan campos o algún valor no es válido; el
+                mensaje es apto para devolverlo al cliente.
+        """
+        if 'symbol' not in data or 'side' not in data or 'order_type' not in data:
+            raise ValueError('Campos requeridos faltantes: symbol, side, order_type')
+        if 'qty' not in data and 'notional' not in data:
+            raise ValueError('Se debe especificar qty o notional')
+
+        qty = _optional_float(data.get('qty'), 'qty')
+        notional = _optional_float(data.get('notional'), 'notional')
+
+        raw_side = data['side']
+        side = _ORDER_SIDE_BY_VALUE.get(str(raw_side).lower())
+        if side is None:
+            raise ValueError(f'Lado de orden no soportado: {raw_side}')
+
+        raw_type = data['order_type']
+        order_type = _ORDER_TYPE_BY_VALUE.get(str(raw_type).lower())
+        if order_type is None:
+            raise ValueError(f'Tipo de orden no soportado: {raw_type}')
+
+        symbol = str(data['symbol']).upper()
+
+        if order_type is OrderType.MARKET:
+            return cls(symbol, side, order_type, qty=qty, notional=notional)
+
+        if order_type is OrderType.LIMIT:
+            if 'limit_price' not in data:
+                raise ValueError('limit_price requerido para orden límite')
+            return cls(
+                symbol, side, order_type, qty=qty, notional=notional,
+                limit_price=_to_float(data['limit_price'], 'limit_price'),
+            )
+
+        # El resto de tipos no admite notional
+        if order_type is OrderType.STOP:
+            if 'stop_price' not in data:
+                raise ValueError('stop_price requerido para orden stop')
+            stop_price = _to_float(data['stop_price'], 'stop_price')
+            return cls(symbol, side, order_type, qty=_require_qty(qty), stop_price=stop_price)
+
+        if order_type is OrderType.STOP_LIMIT:
+            if 'stop_price' not in data or 'limit_price' not in data:
+                raise ValueError('stop_price y limit_price requeridos para orden stop limit')
+            stop_price = _to_float(data['stop_price'], 'stop_price')
+            limit_price = _to_float(data['limit_price'], 'limit_price')
+            return cls(
+                symbol, side, order_type, qty=_require_qty(qty),
+                stop_price=stop_price, limit_price=limit_price,
+            )
+
+        if order_type is OrderType.TRAILING_STOP:
+            if 'trail_price' not in data and 'trail_percent' not in data:
+                raise ValueError('trail_price o trail_percent requerido para trailing stop')
+            trail_price = _optional_float(data.get('trail_price'), 'trail_price')
+            trail_percent = _optional_float(data.get('trail_percent'), 'trail_percent')
+            return cls(
+                symbol, side, order_type, qty=_require_qty(qty),
+                trail_price=trail_price, trail_percent=trail_percent,
+            )
+
+        # Bracket: limit como tipo base con take profit y stop loss
+        for name in ('limit_price', 'take_profit', 'stop_loss'):
+            if name not in data:
+                raise ValueError(f'{name} requerido para orden bracket')
+        take_profit_raw = data['take_profit']
+        stop_loss_raw = data['stop_loss']
+        if not isinstance(take_profit_raw, Mapping) or not isinstance(stop_loss_raw, Mapping):
+            raise ValueError('take_profit y stop_loss deben ser objetos')
+
+        limit_price = _to_float(data['limit_price'], 'limit_price')
+        tp_limit_price = _to_float(take_profit_raw.get('limit_price'), 'take_profit.limit_price')
+        sl_stop_price = _to_float(stop_loss_raw.get('stop_price'), 'stop_loss.stop_price')
+
+        # Validar lógica de precios según el lado de la orden
+        is_buy = side is OrderSide.BUY
+        code = validate_bracket(is_buy, limit_price, sl_stop_price, tp_limit_price)
+        if code != BRACKET_OK:
+            raise ValueError(
+                bracket_error_message(is_buy, code, limit_price, sl_stop_price, tp_limit_price)
+            )
+
+        stop_loss = {'stop_price': sl_stop_price}
+        sl_limit_price = _optional_float(stop_loss_raw.get('limit_price'), 'stop_loss.limit_price')
+        if sl_limit_price is not None:
+            stop_loss['limit_price'] = sl_limit_price
+
+        return cls(
+            symbol, side, order_type, qty=_require_qty(qty), limit_price=limit_price,
+            take_profit={'limit_price': tp_limit_price}, stop_loss=stop_loss,
+        )
+
+
+@dataclass(slots=True)
 class Order:
     """
     Representa una orden de trading.
@@ -89,12 +258,12 @@ class Order:
             'symbol': self.symbol,
             'qty': self.qty,
             'notional': self.notional,
-            'side': self.side.value if hasattr(self.side, 'value') else str(self.side),
-            'order_type': self.order_type.value if hasattr(self.order_type, 'value') else str(self.order_type),
+            'side': self.side.value,
+            'order_type': self.order_type.value,
             'time_in_force': self.time_in_force,
             'limit_price': self.limit_price,
             'stop_price': self.stop_price,
-            'status': self.status.value if hasattr(self.status, 'value') else str(self.status),
+            'status': self.status.value,
             'filled_qty': self.filled_qty,
             'filled_avg_price': self.filled_avg_price,
             'created_at': self.created_at.isoformat() if self.created_at else None,
@@ -112,55 +281,87 @@ class Order:
         Returns:
             Order: Instancia de Order
         """
-        # Mapear side
-        side = OrderSide.BUY if alpaca_order.side == 'buy' else OrderSide.SELL
-        
-        # Mapear order_type
-        order_type_map = {
-            'market': OrderType.MARKET,
-            'limit': OrderType.LIMIT,
-            'stop': OrderType.STOP,
-            'stop_limit': OrderType.STOP_LIMIT
-        }
-        order_type = order_type_map.get(alpaca_order.type, OrderType.MARKET)
-        
-        # Mapear status
-        status_map = {
-            'new': OrderStatus.NEW,
-            'partially_filled': OrderStatus.PARTIALLY_FILLED,
-            'filled': OrderStatus.FILLED,
-            'done_for_day': OrderStatus.DONE_FOR_DAY,
-            'canceled': OrderStatus.CANCELED,
-            'expired': OrderStatus.EXPIRED,
-            'replaced': OrderStatus.REPLACED,
-            'pending_cancel': OrderStatus.PENDING_CANCEL,
-            'pending_replace': OrderStatus.PENDING_REPLACE,
-            'accepted': OrderStatus.ACCEPTED,
-            'pending_new': OrderStatus.PENDING_NEW,
-            'rejected': OrderStatus.REJECTED,
-            'suspended': OrderStatus.SUSPENDED
-        }
-        status = status_map.get(alpaca_order.status, OrderStatus.NEW)
-        
+        # Cada atributo del modelo de Alpaca se lee una sola vez
+        raw_side = alpaca_order.side
+        raw_type = alpaca_order.type
+        raw_status = alpaca_order.status
+        qty = alpaca_order.qty
+        notional = getattr(alpaca_order, 'notional', None)
+        lp = alpaca_order.limit_price
+        sp = alpaca_order.stop_price
+        fq = alpaca_order.filled_qty
+        fap = alpaca_order.filled_avg_price
+
+        # Los enums de alpaca-py son (str, Enum) y su hash es el del nombre,
+        # por lo que se busca siempre por el valor en texto.
+        side = _ORDER_SIDE_BY_VALUE.get(getattr(raw_side, 'value', raw_side), OrderSide.SELL)
+        order_type = _ORDER_TYPE_BY_VALUE.get(getattr(raw_type, 'value', raw_type), OrderType.MARKET)
+        status = _ORDER_STATUS_BY_VALUE.get(
+            getattr(raw_status, 'value', raw_status), OrderStatus.NEW
+        )
+
         return cls(
             order_id=str(alpaca_order.id),
             symbol=alpaca_order.symbol,
-            qty=float(alpaca_order.qty) if alpaca_order.qty else None,
-            notional=float(alpaca_order.notional) if hasattr(alpaca_order, 'notional') and alpaca_order.notional else None,
+            qty=float(qty) if qty else None,
+            notional=float(notional) if notional else None,
             side=side,
             order_type=order_type,
             time_in_force=alpaca_order.time_in_force,
-            limit_price=float(alpaca_order.limit_price) if alpaca_order.limit_price else None,
-            stop_price=float(alpaca_order.stop_price) if alpaca_order.stop_price else None,
+            limit_price=float(lp) if lp else None,
+            stop_price=float(sp) if sp else None,
             status=status,
-            filled_qty=float(alpaca_order.filled_qty) if alpaca_order.filled_qty else 0.0,
-            filled_avg_price=float(alpaca_order.filled_avg_price) if alpaca_order.filled_avg_price else None,
+            filled_qty=float(fq) if fq else 0.0,
+            filled_avg_price=float(fap) if fap else None,
             created_at=alpaca_order.created_at,
             updated_at=alpaca_order.updated_at
         )
 
 
-@dataclass
+# Campos obligatorios de un swing trade, en el orden en que se reportan
+_SWING_REQUIRED = (
+    'symbol',
+    'qty',
+    'entry_price',
+    'take_profit_price',
+    'stop_loss_price',
+)
+
+
+@dataclass(slots=True, frozen=True)
+class SwingTradeSpec:
+    """
+    Petición de swing trade (entrada + take profit + stop loss) ya convertida.
+
+    La coherencia entre precios la valida ``TradingService.create_swing_trade``.
+    """
+    symbol: str
+    qty: float
+    entry_price: float
+    take_profit_price: float
+    stop_loss_price: float
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'SwingTradeSpec':
+        """
+        Construye la especificación desde el cuerpo JSON de la petición.
+
+        Raises:
+            ValueError: Si falta un campo o algún valor no es numérico.
+        """
+        for name in _SWING_REQUIRED:
+            if name not in data:
+                raise ValueError(f'Campo requerido faltante: {name}')
+        return cls(
+            symbol=normalize_symbol(str(data['symbol'])),
+            qty=_to_float(data['qty'], 'qty'),
+            entry_price=_to_float(data['entry_price'], 'entry_price'),
+            take_profit_price=_to_float(data['take_profit_price'], 'take_profit_price'),
+            stop_loss_price=_to_float(data['stop_loss_price'], 'stop_loss_price'),
+        )
+
+
+@dataclass(slots=True)
 class Position:
     """
     Representa una posición abierta.
@@ -220,7 +421,7 @@ class Position:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Account:
     """
     Representa la información de la cuenta.
@@ -276,7 +477,7 @@ class Account:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Quote:
     """
     Representa una cotización de mercado.
@@ -1,14 +1,17 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 
 from bson import ObjectId
 from pymongo.collection import Collection
+from pymongo.write_concern import WriteConcern
 
 from db.mongo import get_db
 
+_COLLECTION: Optional[Collection] = None
 
-@dataclass
+
+@dataclass(slots=True)
 class User:
     id: Optional[str]
     email: str
@@ -33,8 +36,9 @@ class User:
             "rol": self.rol,
             "alpaca_base_url": self.alpaca_base_url,
             "paper_trading": self.paper_trading,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            # created_at/updated_at siempre tienen valor (default_factory y from_mongo)
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
             "last_login_at": self.last_login_at.isoformat() if self.last_login_at else None,
         }
 
@@ -77,10 +81,25 @@ class User:
 
 
 def _get_collection() -> Collection:
-    db = get_db()
-    collection = db["users"]
-    collection.create_index("email", unique=True)
-    return collection
+    global _COLLECTION
+    if _COLLECTION is None:
+        _COLLECTION = get_db()["users"]
+    return _COLLECTION
+
+
+def ensure_indexes() -> None:
+    """Crea los índices de la colección; se invoca una sola vez al arrancar."""
+    _get_collection().create_index("email", unique=True)
+
+
+def to_oid(user_id: Union[str, ObjectId]) -> Optional[ObjectId]:
+    """Convierte un id de usuario a ObjectId; si ya lo es, lo devuelve tal cual."""
+    if isinstance(user_id, ObjectId):
+        return user_id
+    try:
+        return ObjectId(user_id)
+    except Exception:
+        return None
 
 
 def create_user(user: User) -> User:
@@ -100,11 +119,15 @@ def get_user_by_email(email: str) -> Optional[User]:
 
 
 def get_user_by_id(user_id: str) -> Optional[User]:
-    collection = _get_collection()
-    try:
-        oid = ObjectId(user_id)
-    except Exception:
+    oid = to_oid(user_id)
+    if oid is None:
         return None
+    return get_user_by_oid(oid)
+
+
+def get_user_by_oid(oid: ObjectId) -> Optional[User]:
+    """Igual que ``get_user_by_id`` pero con el ObjectId ya validado."""
+    collection = _get_collection()
     doc = collection.find_one({"_id": oid})
     if not doc:
         return None
@@ -112,16 +135,15 @@ def get_user_by_id(user_id: str) -> Optional[User]:
 
 
 def update_user_keys(
-    user_id: str,
+    user_id: Union[str, ObjectId],
     alpaca_api_key_enc: Optional[str] = None,
     alpaca_secret_key_enc: Optional[str] = None,
     alpaca_base_url: Optional[str] = None,
     paper_trading: Optional[bool] = None,
 ) -> Optional[User]:
     collection = _get_collection()
-    try:
-        oid = ObjectId(user_id)
-    except Exception:
+    oid = to_oid(user_id)
+    if oid is None:
         return None
     update: Dict[str, Any] = {"updated_at": datetime.utcnow()}
     if alpaca_api_key_enc is not None:
@@ -142,13 +164,18 @@ def update_user_keys(
     return User.from_mongo(doc)
 
 
-def update_user_last_login(user_id: str) -> None:
-    collection = _get_collection()
-    try:
-        oid = ObjectId(user_id)
-    except Exception:
+def update_user_last_login(user_id: Union[str, ObjectId]) -> None:
+    """Registra el último login sin esperar confirmación del servidor.
+
+    Es un dato informativo: con write concern ``w=0`` el login no paga un
+    segundo round-trip a MongoDB.
+    """
+    collection = _get_collection().with_options(write_concern=WriteConcern(w=0))
+    oid = to_oid(user_id)
+    if oid is None:
         return
+    now = datetime.utcnow()
     collection.update_one(
         {"_id": oid},
-        {"$set": {"last_login_at": datetime.utcnow(), "updated_at": datetime.utcnow()}},
+        {"$set": {"last_login_at": now, "updated_at": now}},
     )
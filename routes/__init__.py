@@ -1,19 +1,25 @@
 """
-Módulo de modelos de datos.
+Módulo de rutas.
 
-Exporta todas las clases de modelos para facilitar las importaciones.
+Exporta las funciones de registro de rutas y los blueprints. Las importaciones se
+resuelven de forma diferida (PEP 562) para que importar un submódulo
+concreto no cargue el resto de rutas y sus servicios.
 """
 
-from .user_routes import register_user_routes
-from .preferences_router import register_preferences_routes
-from .trading_routes import register_trading_routes
-from .auth_routes import register_auth_routes
-from .favorites_router import register_favorites_routes
-from .news_routes import register_news_routes
-from .screener_routes import register_screener_routes
+from importlib import import_module
+
+_EXPORTS = {
+    'user_bp': '.user_routes',
+    'register_preferences_routes': '.preferences_router',
+    'register_trading_routes': '.trading_routes',
+    'register_auth_routes': '.auth_routes',
+    'register_favorites_routes': '.favorites_router',
+    'register_news_routes': '.news_routes',
+    'register_screener_routes': '.screener_routes',
+}
 
 __all__ = [
-    'register_user_routes',
+    'user_bp',
     'register_preferences_routes',
     'register_trading_routes',
     'register_auth_routes',
@@ -21,3 +27,16 @@ __all__ = [
     'register_news_routes',
     'register_screener_routes',
 ]
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,4 +1,5 @@
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
 from flask import Flask, jsonify, request
 
@@ -12,11 +13,14 @@ from models.user import (
 )
 from utils.security import hash_password, verify_password, generate_jwt, encrypt_text
 
+# Cuerpo vacío compartido de solo lectura para peticiones sin JSON
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
 
 def register_auth_routes(app: Flask) -> None:
     @app.route('/api/auth/register', methods=['POST'])
     def register():
-        data = request.get_json() or {}
+        data = request.get_json(silent=True) or _EMPTY
         email = (data.get('email') or '').strip().lower()
         password = data.get('password') or ''
 
@@ -66,7 +70,7 @@ def register_auth_routes(app: Flask) -> None:
 
     @app.route('/api/auth/login', methods=['POST'])
     def login():
-        data = request.get_json() or {}
+        data = request.get_json(silent=True) or _EMPTY
         email = (data.get('email') or '').strip().lower()
         password = data.get('password') or ''
 
@@ -1,9 +1,16 @@
-from typing import Any
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping, Optional
+from datetime import date, datetime
+import logging
+import threading
 
-from flask import Flask, jsonify, request, g
+from cachetools import TTLCache
+from flask import Flask, request, g
 
 from utils.auth_utils import require_auth
+from utils.json_utils import error_response, json_response, stream_json_response
+from utils.symbols import normalize_symbols
 from services.symbol_preferences_service import (
     symbol_preferences_service,
     SymbolPreferencesServiceException,
@@ -20,7 +27,118 @@ from services.trend_preferences_service import (
     trend_preferences_service,
     TrendPreferencesServiceException,
 )
-from models.market_symbol import get_symbol_by_symbol
+from models.market_symbol import MarketSymbol, get_symbols_by_symbols
+
+logger = logging.getLogger(__name__)
+
+_REFRESH_MAX_WORKERS = 16
+# Refrescos de /api/favorites/details que continúan mientras se responde
+_DETAILS_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='favorites-details')
+
+# Símbolos ya actualizados en el día UTC: symbol -> (fecha, to_dict()). Evita
+# leer de Mongo los favoritos que no hace falta refrescar hasta mañana.
+_fresh_today: TTLCache = TTLCache(maxsize=10000, ttl=86400)
+_fresh_lock = threading.Lock()
+
+# Cuerpo vacío compartido de solo lectura para peticiones sin JSON
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+def _safe_sync(sym: str, user) -> Optional[str]:
+    """Sincroniza un símbolo desde Alpaca; devuelve el mensaje de error si falla."""
+    try:
+        market_symbol_service.sync_single_symbol_from_quote(sym, user=user)
+    except MarketSymbolServiceException as e:
+        return f"{sym}: {str(e)}"
+    return None
+
+
+def _sync_individually(symbols: list[str], user, synced: list[str], errors: list[str]) -> None:
+    """Sincroniza símbolo a símbolo en el pool; las llamadas a Alpaca son de E/S."""
+    if not symbols:
+        return
+    with ThreadPoolExecutor(max_workers=min(_REFRESH_MAX_WORKERS, len(symbols))) as ex:
+        for sym, err in zip(symbols, ex.map(lambda s: _safe_sync(s, user), symbols)):
+            if err is None:
+                synced.append(sym)
+            else:
+                errors.append(err)
+
+
+def _refresh_symbols(
+    symbols: list[str], user, known: Mapping[str, MarketSymbol] = _EMPTY,
+) -> tuple[dict[str, MarketSymbol], list[str]]:
+    """Refresca varios símbolos desde Alpaca.
+
+    Los símbolos ya guardados con nombre (``known``) se actualizan con una
+    sola consulta de snapshots y un ``bulk_write``, que conserva nombre y
+    mercado. Los nuevos, o los guardados sin nombre, necesitan los datos del
+    asset y se sincronizan uno a uno en paralelo. Si falla el lote, sus
+    símbolos también pasan al camino individual para reportar cada error.
+
+    ``user`` se recibe ya resuelto porque ``g`` no está disponible en los
+    hilos del pool. Los documentos sincronizados se leen después con una
+    sola consulta ``$in``.
+
+    Returns:
+        Tuple[dict, list]: (símbolos refrescados por símbolo, errores)
+    """
+    errors: list[str] = []
+    if not symbols:
+        return {}, errors
+
+    synced: list[str] = []
+    batch: list[str] = []
+    individual: list[str] = []
+    for sym in symbols:
+        doc = known.get(sym)
+        (batch if doc is not None and doc.name else individual).append(sym)
+    if batch:
+        try:
+            market_symbol_service.sync_symbols_from_quotes(batch, user=user)
+            synced.extend(batch)
+        except MarketSymbolServiceException as e:
+            logger.warning("Fallo la sincronización en lote de favoritos: %s", e)
+            individual = symbols
+    _sync_individually(individual, user, synced, errors)
+    return get_symbols_by_symbols(synced), errors
+
+
+def _to_payloads(docs: dict[str, MarketSymbol], today: date) -> dict[str, dict[str, Any]]:
+    """Serializa los documentos y guarda en ``_fresh_today`` los actualizados hoy."""
+    payloads = {sym: doc.to_dict() for sym, doc in docs.items()}
+    with _fresh_lock:
+        for sym, doc in docs.items():
+            updated_at = getattr(doc, 'updated_at', None)
+            if isinstance(updated_at, datetime) and updated_at.date() == today:
+                _fresh_today[sym] = (today, payloads[sym])
+    return payloads
+
+
+def _iter_details(
+    normalized: list[str],
+    payloads: dict[str, dict[str, Any]],
+    stale: set[str],
+    refresh: Future,
+    today: date,
+) -> Iterator[dict[str, Any]]:
+    """Recorre los favoritos en orden esperando al refresco solo cuando hace falta.
+
+    Si falla Alpaca/Mongo, seguimos con el doc previo si existía: la
+    respuesta ya puede estar enviándose y no se puede convertir en un 500.
+    """
+    pending: Optional[Future] = refresh
+    for sym in normalized:
+        if pending is not None and sym in stale:
+            try:
+                refreshed, _ = pending.result()
+                payloads.update(_to_payloads(refreshed, today))
+            except Exception:
+                logger.exception("Error al refrescar favoritos")
+            pending = None
+        payload = payloads.get(sym)
+        if payload is not None:
+            yield payload
 
 
 def register_favorites_routes(app: Flask) -> None:
@@ -28,7 +146,7 @@ def register_favorites_routes(app: Flask) -> None:
     @app.route('/api/favorites/test', methods=['GET'])
     @require_auth
     def test_favorites():
-        return jsonify({
+        return json_response({
             'success': True,
             'message': 'Favorites router working',
             'timestamp': str(datetime.now())
@@ -45,47 +163,52 @@ def register_favorites_routes(app: Flask) -> None:
         try:
             symbols = symbol_preferences_service.get_symbols(g.current_user.id)
 
-            normalized: list[str] = []
-            for s in symbols:
-                if s is None:
-                    continue
-                sym = str(s).strip().upper()
-                if not sym:
-                    continue
-                if sym not in normalized:
-                    normalized.append(sym)
+            normalized = normalize_symbols(symbols)
+
+            today = datetime.utcnow().date()
+
+            payloads: dict[str, dict[str, Any]] = {}
+            with _fresh_lock:
+                for sym in normalized:
+                    entry = _fresh_today.get(sym)
+                    if entry is not None and entry[0] == today:
+                        payloads[sym] = entry[1]
 
-            result: list[dict[str, Any]] = []
+            pending = [sym for sym in normalized if sym not in payloads]
+            cached_docs = get_symbols_by_symbols(pending)
 
-            for sym in normalized:
-                doc = get_symbol_by_symbol(sym)
+            stale: list[str] = []
+            for sym in pending:
+                doc = cached_docs.get(sym)
                 needs_refresh = True
 
                 if doc is not None and isinstance(getattr(doc, 'updated_at', None), datetime):
-                    try:
-                        if doc.updated_at.date() == datetime.utcnow().date():
-                            needs_refresh = False
-                    except Exception:
-                        needs_refresh = True
+                    if doc.updated_at.date() == today:
+                        needs_refresh = False
 
                 if needs_refresh:
-                    try:
-                        market_symbol_service.sync_single_symbol_from_quote(sym, user=g.current_user)
-                        refreshed = get_symbol_by_symbol(sym)
-                        if refreshed is not None:
-                            doc = refreshed
-                    except MarketSymbolServiceException:
-                        # Si falla Alpaca/Mongo, seguimos con el doc previo si existía
-                        pass
-
-                if doc is not None:
-                    result.append(doc.to_dict())
-
-            return jsonify({'success': True, 'data': result})
+                    stale.append(sym)
+
+            # Docs previos (aunque estén desactualizados) como respaldo
+            payloads.update(_to_payloads(cached_docs, today))
+            if not stale:
+                return stream_json_response(
+                    payloads[sym] for sym in normalized if sym in payloads
+                )
+
+            # El refresco arranca ya; los favoritos anteriores al primer
+            # símbolo desactualizado se envían mientras tanto, fila a fila
+            refresh = _DETAILS_POOL.submit(
+                _refresh_symbols, stale, g.current_user, known=cached_docs
+            )
+            return stream_json_response(
+                _iter_details(normalized, payloads, set(stale), refresh, today),
+                chunk_size=1,
+            )
         except SymbolPreferencesServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
+            return json_response({'success': False, 'error': str(e)}), 400
         except Exception:
-            return jsonify({'success': False, 'error': 'Error interno del servidor'}), 500
+            return error_response('Error interno del servidor', 500)
 
 
     @app.route('/api/favorites/refresh', methods=['POST'])
@@ -95,81 +218,57 @@ def register_favorites_routes(app: Flask) -> None:
         try:
             symbols = symbol_preferences_service.get_symbols(g.current_user.id)
 
-            normalized: list[str] = []
-            for s in symbols:
-                if s is None:
-                    continue
-                sym = str(s).strip().upper()
-                if not sym:
-                    continue
-                if sym not in normalized:
-                    normalized.append(sym)
-
-            result: list[dict[str, Any]] = []
-            errors: list[str] = []
-
-            for sym in normalized:
-                try:
-                    market_symbol_service.sync_single_symbol_from_quote(sym, user=g.current_user)
-                    refreshed = get_symbol_by_symbol(sym)
-                    if refreshed is not None:
-                        result.append(refreshed.to_dict())
-                except MarketSymbolServiceException as e:
-                    errors.append(f"{sym}: {str(e)}")
-
-            return jsonify({
+            normalized = normalize_symbols(symbols)
+
+            known = get_symbols_by_symbols(normalized)
+            refreshed, errors = _refresh_symbols(normalized, g.current_user, known=known)
+            payloads = _to_payloads(refreshed, datetime.utcnow().date())
+            result: list[dict[str, Any]] = [
+                payloads[sym] for sym in normalized if sym in payloads
+            ]
+
+            return json_response({
                 'success': True,
                 'data': result,
                 'errors': errors if errors else None,
             })
         except SymbolPreferencesServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
+            return json_response({'success': False, 'error': str(e)}), 400
         except Exception:
-            return jsonify({'success': False, 'error': 'Error interno del servidor'}), 500
+            return error_response('Error interno del servidor', 500)
 
 
     @app.route('/api/favorites/trend', methods=['POST'])
     @require_auth
     def get_favorite_trend():
-        print(f"[FAVORITES] Trend endpoint called at {datetime.now()}")
-        data = request.get_json() or {}
-        print(f"[FAVORITES] Request data: {data}")
-        
+        data = request.get_json(silent=True) or _EMPTY
+
         symbol = data.get('symbol')
         profile = data.get('profile')
         model_type = data.get('model_type')
-        
-        print(f"[FAVORITES] Parsed - symbol: {symbol}, profile: {profile}, model_type: {model_type}")
+
+        logger.debug(
+            "Trend solicitado - symbol: %s, profile: %s, model_type: %s",
+            symbol, profile, model_type,
+        )
 
         if not symbol or not isinstance(symbol, str):
-            print(f"[FAVORITES] Invalid symbol: {symbol}")
-            return jsonify({
-                'success': False,
-                'error': 'Debe enviar un símbolo válido en el campo "symbol"',
-            }), 400
+            return error_response('Debe enviar un símbolo válido en el campo "symbol"')
 
         sym = str(symbol).strip().upper()
         if not sym:
-            print(f"[FAVORITES] Empty symbol after processing")
-            return jsonify({
-                'success': False,
-                'error': 'Símbolo vacío',
-            }), 400
+            return error_response('Símbolo vacío')
 
-        print(f"[FAVORITES] Processing symbol: {sym}")
-        
         try:
-            print(f"[FAVORITES] About to call trend_detection_service.analyze_symbol")
             result = trend_detection_service.analyze_symbol(
                 sym,
                 user=g.current_user,
                 profile=profile,
                 model_type=model_type,
             )
-            print(f"[FAVORITES] Analysis completed successfully")
-            
+            logger.debug("Análisis de tendencia completado para %s", sym)
+
             try:
-                print(f"[FAVORITES] Saving preferences")
                 saved = trend_preferences_service.set_preferences(
                     g.current_user.id,
                     profile=result.get('profile'),
@@ -177,29 +276,23 @@ def register_favorites_routes(app: Flask) -> None:
                 )
                 result['profile'] = saved.get('profile', result.get('profile'))
                 result['model_type'] = saved.get('model_type', result.get('model_type'))
-                print(f"[FAVORITES] Preferences saved successfully")
             except TrendPreferencesServiceException as pref_e:
-                print(f"[FAVORITES] Warning saving preferences: {pref_e}")
                 # Si falla el guardado de preferencias, no rompemos el flujo principal
-                pass
-                
-            print(f"[FAVORITES] Returning successful response")
-            return jsonify({
+                logger.warning("No se pudieron guardar las preferencias de tendencia: %s", pref_e)
+
+            return json_response({
                 'success': True,
                 'data': result,
             })
         except TrendDetectionServiceException as e:
-            print(f"[FAVORITES] TrendDetectionServiceException: {e}")
-            return jsonify({
+            logger.debug("Error de detección de tendencia para %s: %s", sym, e)
+            return json_response({
                 'success': False,
                 'error': str(e),
             }), 400
         except Exception as e:
-            print(f"[FAVORITES] General Exception: {e}")
-            import traceback
-            print(f"[FAVORITES] Traceback: {traceback.format_exc()}")
-            return jsonify({
+            logger.exception("Error inesperado en trend de favoritos para %s", sym)
+            return json_response({
                 'success': False,
                 'error': f'Error interno del servidor: {str(e)}',
             }), 500
-
@@ -1,6 +1,7 @@
-from flask import Flask, jsonify, request
+from flask import Flask, request
 
 from utils.auth_utils import require_auth
+from utils.json_utils import error_response, json_response
 from services.news_scraper_service import news_scraper_service, NewsScraperServiceException
 
 
@@ -13,11 +14,11 @@ def register_news_routes(app: Flask) -> None:
             try:
                 limit = int(limit_raw)
             except (TypeError, ValueError):
-                return jsonify({'success': False, 'error': 'Parámetro limit debe ser un número'}), 400
+                return error_response('Parámetro limit debe ser un número', 400)
 
             items = news_scraper_service.get_news(symbol, limit=limit)
-            return jsonify({'success': True, 'data': items})
+            return json_response({'success': True, 'data': items})
         except NewsScraperServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
+            return json_response({'success': False, 'error': str(e)}), 400
         except Exception:
-            return jsonify({'success': False, 'error': 'Error interno del servidor'}), 500
+            return error_response('Error interno del servidor', 500)
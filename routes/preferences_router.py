@@ -1,138 +1,156 @@
-from flask import Flask, jsonify, request, g
+from flask import Flask, g
 
 from utils.auth_utils import require_auth
+from utils.background import submit_background
+from utils.json_utils import error_response, get_json_fast, json_response
+from utils.symbols import normalize_symbols
 
 from services.symbol_preferences_service import (
     symbol_preferences_service,
     SymbolPreferencesServiceException,
 )
-from services.market_symbol_service import (
-    market_symbol_service,
-    MarketSymbolServiceException,
-)
+from services.market_symbol_service import market_symbol_service
+
+_SYMBOLS_NOT_LIST = 'El campo symbols debe ser una lista'
+
+
+def _coerce_symbol_list(symbols, symbol=None) -> list:
+    """
+    Une ``symbols`` y ``symbol`` del cuerpo en una lista nueva.
+
+    Raises:
+        ValueError: Si ``symbols`` viene informado y no es una lista
+    """
+    if symbols is None:
+        result = []
+    elif isinstance(symbols, list):
+        result = list(symbols)
+    else:
+        # Una cadena también es iterable: se exige lista explícitamente
+        raise ValueError(_SYMBOLS_NOT_LIST)
+    if symbol is not None:
+        result.append(symbol)
+    return result
+
 
 def register_preferences_routes(app: Flask) -> None:
 
     @app.route('/api/preferences/symbols', methods=['GET'])
     @require_auth
     def get_symbol_preferences():
+        user = g.current_user
         try:
-            symbols = symbol_preferences_service.get_symbols(g.current_user.id)
-            return jsonify({
+            symbols = symbol_preferences_service.get_symbols(user.id)
+            return json_response({
                 'success': True,
                 'data': symbols,
             })
         except SymbolPreferencesServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
+            return json_response({'success': False, 'error': str(e)}), 400
         except Exception:
-            return jsonify({'success': False, 'error': 'Error interno del servidor'}), 500
+            return error_response('Error interno del servidor', 500)
 
     @app.route('/api/preferences/symbols', methods=['PUT'])
     @require_auth
     def set_symbol_preferences():
-        data = request.get_json() or {}
+        user = g.current_user
+        try:
+            data = get_json_fast()
+        except ValueError as e:
+            return json_response({'success': False, 'error': str(e)}), 400
         symbols = data.get('symbols')
-
-        if symbols is None or not isinstance(symbols, list):
-            return jsonify({
-                'success': False,
-                'error': 'El campo symbols debe ser una lista',
-            }), 400
+        if symbols is None:
+            return json_response({'success': False, 'error': _SYMBOLS_NOT_LIST}), 400
+        try:
+            symbols = _coerce_symbol_list(symbols)
+        except ValueError as e:
+            return json_response({'success': False, 'error': str(e)}), 400
 
         try:
-            updated = symbol_preferences_service.set_symbols(g.current_user.id, symbols)
-            return jsonify({
+            updated = symbol_preferences_service.set_symbols(user.id, symbols)
+            return json_response({
                 'success': True,
                 'data': updated,
             })
         except SymbolPreferencesServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
+            return json_response({'success': False, 'error': str(e)}), 400
         except Exception:
-            return jsonify({'success': False, 'error': 'Error interno del servidor'}), 500
+            return error_response('Error interno del servidor', 500)
 
     @app.route('/api/preferences/symbols', methods=['POST'])
     @require_auth
     def add_symbol_preferences():
-        data = request.get_json() or {}
+        user = g.current_user
+        try:
+            data = get_json_fast()
+        except ValueError as e:
+            return json_response({'success': False, 'error': str(e)}), 400
 
         symbols = data.get('symbols')
         symbol = data.get('symbol')
 
         if symbols is None and symbol is None:
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error': 'Debe enviar symbol o symbols',
             }), 400
 
-        if symbols is not None and not isinstance(symbols, list):
-            return jsonify({
-                'success': False,
-                'error': 'El campo symbols debe ser una lista',
-            }), 400
+        try:
+            symbols_list = _coerce_symbol_list(symbols, symbol)
+        except ValueError as e:
+            return json_response({'success': False, 'error': str(e)}), 400
 
-        symbols_list = symbols or []
-        if symbol is not None:
-            symbols_list.append(symbol)
+        # Se normaliza una sola vez para la preferencia y la sincronización
+        normalized = normalize_symbols(symbols_list)
 
         try:
-            updated = symbol_preferences_service.add_symbols(g.current_user.id, symbols_list)
-
-            # Alimentar colección de símbolos de mercado para los símbolos añadidos
-            try:
-                # Normalizar y evitar duplicados simples a nivel de ruta
-                norm_set = set()
-                for s in symbols_list:
-                    if s is None:
-                        continue
-                    sym = str(s).strip().upper()
-                    if not sym:
-                        continue
-                    if sym in norm_set:
-                        continue
-                    norm_set.add(sym)
-                    market_symbol_service.sync_single_symbol_from_quote(sym, user=g.current_user)
-            except MarketSymbolServiceException:
-                # No interrumpir la preferencia de símbolos si falla Mongo/Alpaca
-                pass
-
-            return jsonify({
+            updated = symbol_preferences_service.add_symbols(
+                user.id, normalized, already_normalized=True
+            )
+
+            # Alimentar colección de símbolos de mercado en segundo plano; si falla
+            # Mongo/Alpaca no se interrumpe la preferencia de símbolos
+            submit_background(
+                market_symbol_service.sync_symbols_from_quotes, normalized, user=user
+            )
+
+            return json_response({
                 'success': True,
                 'data': updated,
             })
         except SymbolPreferencesServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
+            return json_response({'success': False, 'error': str(e)}), 400
         except Exception:
-            return jsonify({'success': False, 'error': 'Error interno del servidor'}), 500
+            return error_response('Error interno del servidor', 500)
 
     @app.route('/api/preferences/symbols', methods=['DELETE'])
     @require_auth
     def delete_symbol_preferences():
-        data = request.get_json(silent=True) or {}
+        user = g.current_user
+        try:
+            data = get_json_fast()
+        except ValueError as e:
+            return json_response({'success': False, 'error': str(e)}), 400
 
         symbols = data.get('symbols')
         symbol = data.get('symbol')
 
         try:
             if symbols is None and symbol is None:
-                updated = symbol_preferences_service.clear_symbols(g.current_user.id)
+                updated = symbol_preferences_service.clear_symbols(user.id)
             else:
-                if symbols is not None and not isinstance(symbols, list):
-                    return jsonify({
-                        'success': False,
-                        'error': 'El campo symbols debe ser una lista',
-                    }), 400
-
-                symbols_list = symbols or []
-                if symbol is not None:
-                    symbols_list.append(symbol)
+                try:
+                    symbols_list = _coerce_symbol_list(symbols, symbol)
+                except ValueError as e:
+                    return json_response({'success': False, 'error': str(e)}), 400
 
-                updated = symbol_preferences_service.remove_symbols(g.current_user.id, symbols_list)
+                updated = symbol_preferences_service.remove_symbols(user.id, symbols_list)
 
-            return jsonify({
+            return json_response({
                 'success': True,
                 'data': updated,
             })
         except SymbolPreferencesServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
+            return json_response({'success': False, 'error': str(e)}), 400
         except Exception:
-            return jsonify({'success': False, 'error': 'Error interno del servidor'}), 500
+            return error_response('Error interno del servidor', 500)
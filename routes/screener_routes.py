@@ -1,6 +1,15 @@
-from flask import Flask, jsonify, request, g
+from flask import Flask, request, g
 
 from utils.auth_utils import require_auth
+from utils.background import submit_background
+from utils.query_parse import parse_params
+from utils.json_utils import (
+    error_response,
+    get_json_fast,
+    json_response,
+    stream_json_response,
+    stream_ndjson_response,
+)
 from services.market_screener_service import (
     market_screener_service,
     MarketScreenerServiceException,
@@ -9,7 +18,35 @@ from services.market_symbol_service import (
     market_symbol_service,
     MarketSymbolServiceException,
 )
-from models.market_symbol import list_symbols as list_market_symbols
+from models.market_symbol import (
+    LIST_FIELDS as MARKET_SYMBOL_FIELDS,
+    iter_symbols_as_dicts as iter_market_symbols,
+    list_symbols_columnar as list_market_symbols_columnar,
+)
+
+_TOP_ERROR = 'Parámetro limit/top debe ser un número entero'
+_PRICE_ERROR = 'Parámetros min_price/max_price deben ser numéricos'
+
+# Esquemas de query string de los endpoints
+_MOVERS_PARAMS = (
+    (('limit', 'top'), 'int', 10, _TOP_ERROR),
+    ('market', 'lower', 'stocks'),
+    ('exchange', 'str', None),
+    ('min_price', 'float', None, _PRICE_ERROR),
+    ('max_price', 'float', None, _PRICE_ERROR),
+)
+_MOST_ACTIVES_PARAMS = (('by', 'lower', 'volume'),) + _MOVERS_PARAMS
+_SYNC_ERROR = 'Parámetros top_most_actives/top_movers deben ser enteros'
+_SYNC_PARAMS = (
+    (('top_most_actives', 'limit'), 'int', 50, _SYNC_ERROR),
+    ('top_movers', 'int', 50, _SYNC_ERROR),
+    ('market', 'lower', 'stocks'),
+)
+_MARKET_SYMBOLS_PARAMS = (
+    ('limit', 'int', 1000, 'Parámetro limit debe ser un número entero'),
+    ('format', 'lower', 'row'),
+    ('fields', 'str', None),
+)
 
 
 def register_screener_routes(app: Flask) -> None:
@@ -17,173 +54,125 @@ def register_screener_routes(app: Flask) -> None:
     @require_auth
     def screener_most_actives():
         """Obtiene las acciones más activas usando Alpaca Screener API."""
+        user = g.current_user
         try:
-            by = request.args.get('by', 'volume').lower()
-            top_param = request.args.get('limit', request.args.get('top', '10'))
-            market = request.args.get('market', 'stocks').lower()
-            exchange = request.args.get('exchange')
-            min_price_raw = request.args.get('min_price')
-            max_price_raw = request.args.get('max_price')
-
-            try:
-                top = int(top_param)
-            except (TypeError, ValueError):
-                return jsonify({
-                    'success': False,
-                    'error': 'Parámetro limit/top debe ser un número entero',
-                }), 400
-
-            min_price = None
-            max_price = None
-            try:
-                if min_price_raw is not None and min_price_raw != '':
-                    min_price = float(min_price_raw)
-                if max_price_raw is not None and max_price_raw != '':
-                    max_price = float(max_price_raw)
-            except (TypeError, ValueError):
-                return jsonify({
-                    'success': False,
-                    'error': 'Parámetros min_price/max_price deben ser numéricos',
-                }), 400
+            params, error = parse_params(request.args, _MOST_ACTIVES_PARAMS)
+            if error:
+                return json_response({'success': False, 'error': error}), 400
 
             items = market_screener_service.get_most_actives(
-                user=g.current_user,
-                by=by,
-                top=top,
-                market=market,
-                min_price=min_price,
-                max_price=max_price,
-                exchange=exchange,
+                user=user,
+                by=params['by'],
+                top=params['limit'],
+                market=params['market'],
+                min_price=params['min_price'],
+                max_price=params['max_price'],
+                exchange=params['exchange'],
             )
 
-            # Alimentar colección de símbolos de mercado en segundo plano
-            try:
-                market_symbol_service.upsert_from_most_actives(items)
-            except MarketSymbolServiceException:
-                # No interrumpir la respuesta principal del screener si falla Mongo
-                pass
+            # Alimentar colección de símbolos de mercado en segundo plano; si falla
+            # Mongo no se interrumpe la respuesta principal del screener
+            submit_background(market_symbol_service.upsert_from_most_actives, items)
 
-            return jsonify({'success': True, 'data': items})
+            return json_response({'success': True, 'data': items})
         except MarketScreenerServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
+            return json_response({'success': False, 'error': str(e)}), 400
         except Exception:
-            return jsonify({
-                'success': False,
-                'error': 'Error interno del servidor',
-            }), 500
+            return error_response('Error interno del servidor', 500)
 
     @app.route('/api/screener/market-movers', methods=['GET'])
     @require_auth
     def screener_market_movers():
         """Obtiene los top market movers (ganadores y perdedores)."""
+        user = g.current_user
         try:
-            top_param = request.args.get('limit', request.args.get('top', '10'))
-            market = request.args.get('market', 'stocks').lower()
-            exchange = request.args.get('exchange')
-            min_price_raw = request.args.get('min_price')
-            max_price_raw = request.args.get('max_price')
-
-            try:
-                top = int(top_param)
-            except (TypeError, ValueError):
-                return jsonify({
-                    'success': False,
-                    'error': 'Parámetro limit/top debe ser un número entero',
-                }), 400
-
-            min_price = None
-            max_price = None
-            try:
-                if min_price_raw is not None and min_price_raw != '':
-                    min_price = float(min_price_raw)
-                if max_price_raw is not None and max_price_raw != '':
-                    max_price = float(max_price_raw)
-            except (TypeError, ValueError):
-                return jsonify({
-                    'success': False,
-                    'error': 'Parámetros min_price/max_price deben ser numéricos',
-                }), 400
+            params, error = parse_params(request.args, _MOVERS_PARAMS)
+            if error:
+                return json_response({'success': False, 'error': error}), 400
 
             data = market_screener_service.get_market_movers(
-                user=g.current_user,
-                top=top,
-                market=market,
-                min_price=min_price,
-                max_price=max_price,
-                exchange=exchange,
+                user=user,
+                top=params['limit'],
+                market=params['market'],
+                min_price=params['min_price'],
+                max_price=params['max_price'],
+                exchange=params['exchange'],
             )
 
-            return jsonify({'success': True, 'data': data})
+            return json_response({'success': True, 'data': data})
         except MarketScreenerServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
+            return json_response({'success': False, 'error': str(e)}), 400
         except Exception:
-            return jsonify({
-                'success': False,
-                'error': 'Error interno del servidor',
-            }), 500
+            return error_response('Error interno del servidor', 500)
 
     @app.route('/api/screener/sync-symbols', methods=['POST'])
     @require_auth
     def screener_sync_symbols():
+        user = g.current_user
         try:
-            payload = request.get_json(silent=True) or {}
-
-            top_most_actives_raw = (
-                payload.get('top_most_actives')
-                or request.args.get('top_most_actives')
-                or request.args.get('limit')
-                or '50'
-            )
-            top_movers_raw = (
-                payload.get('top_movers')
-                or request.args.get('top_movers')
-                or '50'
-            )
-            market = (payload.get('market') or request.args.get('market') or 'stocks').lower()
-
             try:
-                top_most_actives = int(top_most_actives_raw)
-                top_movers = int(top_movers_raw)
-            except (TypeError, ValueError):
-                return jsonify({
-                    'success': False,
-                    'error': 'Parámetros top_most_actives/top_movers deben ser enteros',
-                }), 400
+                payload = get_json_fast()
+            except ValueError as e:
+                return json_response({'success': False, 'error': str(e)}), 400
+
+            # Un único dict: el cuerpo JSON tiene prioridad sobre la query string
+            params, error = parse_params({**request.args.to_dict(), **payload}, _SYNC_PARAMS)
+            if error:
+                return json_response({'success': False, 'error': error}), 400
 
             processed = market_symbol_service.sync_from_screener(
-                user=g.current_user,
-                top_most_actives=top_most_actives,
-                top_movers=top_movers,
-                market=market,
+                user=user,
+                top_most_actives=params['top_most_actives'],
+                top_movers=params['top_movers'],
+                market=params['market'],
             )
 
-            return jsonify({'success': True, 'data': {'processed': processed}})
+            return json_response({'success': True, 'data': {'processed': processed}})
         except MarketSymbolServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
+            return json_response({'success': False, 'error': str(e)}), 400
         except Exception:
-            return jsonify({
-                'success': False,
-                'error': 'Error interno del servidor',
-            }), 500
+            return error_response('Error interno del servidor', 500)
 
     @app.route('/api/market-symbols', methods=['GET'])
     @require_auth
     def list_market_symbols_api():
         try:
-            limit_param = request.args.get('limit', '1000')
-            try:
-                limit = int(limit_param)
-            except (TypeError, ValueError):
-                return jsonify({
+            params, error = parse_params(request.args, _MARKET_SYMBOLS_PARAMS)
+            if error:
+                return json_response({'success': False, 'error': error}), 400
+            limit = params['limit']
+
+            # fields=symbol,price,... limita la proyección de Mongo a esas claves
+            fields = None
+            if params['fields']:
+                fields = [name.strip() for name in params['fields'].split(',') if name.strip()]
+                unknown = [name for name in fields if name not in MARKET_SYMBOL_FIELDS]
+                if unknown:
+                    return json_response({
+                        'success': False,
+                        'error': f"Campos no válidos en fields: {', '.join(unknown)}",
+                    }), 400
+
+            # format=columnar devuelve una lista por campo; row (por defecto) una lista de objetos
+            fmt = params['format']
+            if fmt == 'columnar':
+                columns = list_market_symbols_columnar(limit=limit, fields=fields or None)
+                return json_response({'success': True, 'data': columns, 'schema': 'columnar'})
+            if fmt != 'row':
+                return json_response({
                     'success': False,
-                    'error': 'Parámetro limit debe ser un número entero',
+                    'error': 'Parámetro format debe ser row o columnar',
                 }), 400
 
-            symbols = list_market_symbols(limit=limit)
-            data = [s.to_dict() for s in symbols]
-            return jsonify({'success': True, 'data': data})
+            # Formato row en streaming; NDJSON si el cliente lo prefiere
+            rows = iter_market_symbols(limit=limit, fields=fields or None)
+            accept = request.accept_mimetypes
+            if accept.best_match(('application/json', 'application/x-ndjson')) == 'application/x-ndjson':
+                response = stream_ndjson_response(rows)
+            else:
+                response = stream_json_response(rows)
+            # La misma URL devuelve JSON o NDJSON según Accept: las cachés deben distinguirlos
+            response.vary.add('Accept')
+            return response
         except Exception:
-            return jsonify({
-                'success': False,
-                'error': 'Error interno del servidor',
-            }), 500
+            return error_response('Error interno del servidor', 500)
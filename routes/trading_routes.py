@@ -1,19 +1,118 @@
-from typing import List
+from typing import Any, Dict, List
 import logging
-from flask import Flask, jsonify, request, g
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from cachetools import TLRUCache, TTLCache, cached
+from cachetools.keys import hashkey
+from flask import Flask, request, g
 from flask_socketio import SocketIO
 
 from utils.auth_utils import require_auth
+from utils.rate_limit import rate_limit
+from utils.json_utils import (
+    conditional_json_response,
+    error_response,
+    get_json_fast,
+    json_response,
+    stream_ndjson_response,
+)
+from utils.singleflight import SingleFlight
+from utils.rooms import user_room
+from utils.ws_broadcast import batched_emit
+from utils.symbols import normalize_symbol
 from services.trading_service import trading_service, TradingServiceException
 from services.alpaca_service import alpaca_service, AlpacaServiceException
 from services.swing_strategy_service import (
     swing_strategy_service,
     SwingStrategyServiceException,
 )
-from models.order import OrderSide
+from models.order import SwingTradeSpec
 
 logger = logging.getLogger(__name__)
 
+# Segundos por unidad de timeframe (sufijos aceptados por AlpacaService.get_bars)
+_TIMEFRAME_UNIT_SECONDS = (('MIN', 60), ('H', 3600), ('D', 86400), ('W', 604800))
+# La última barra sigue formándose: se refresca unas 12 veces por barra,
+# entre 1 segundo y 5 minutos.
+_BARS_TTL_FRACTION = 12
+_BARS_MIN_TTL = 1.0
+_BARS_MAX_TTL = 300.0
+_BARS_DEFAULT_TTL = 60.0
+
+
+def _bars_ttl(timeframe: str) -> float:
+    """TTL de las barras en caché según la duración de cada barra."""
+    tf = timeframe.upper()
+    for suffix, seconds in _TIMEFRAME_UNIT_SECONDS:
+        if tf.endswith(suffix):
+            try:
+                amount = int(tf[:-len(suffix)])
+            except ValueError:
+                break
+            ttl = amount * seconds / _BARS_TTL_FRACTION
+            return min(max(ttl, _BARS_MIN_TTL), _BARS_MAX_TTL)
+    return _BARS_DEFAULT_TTL
+
+
+# Caché en proceso de datos de mercado: muchos clientes consultan el mismo
+# símbolo cada segundo, por lo que se colapsan las peticiones a Alpaca. Las
+# claves incluyen el usuario porque cada uno consulta con sus credenciales
+# (feed y plan de datos propios).
+_QUOTE_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=0.5)
+# Claves: (user_id, symbol, timeframe, limit); expiran según el timeframe
+_BARS_CACHE: TLRUCache = TLRUCache(
+    maxsize=4096, ttu=lambda key, value, now: now + _bars_ttl(key[2])
+)
+_CACHE_LOCK = threading.Lock()
+# Los fallos de caché concurrentes para la misma clave comparten una sola
+# llamada a Alpaca (el lock de la caché no se mantiene durante la carga).
+_FLIGHT = SingleFlight()
+
+# chart-data pide barras en este pool mientras la cotización se obtiene en
+# el hilo de la petición: la latencia es la mayor de las dos, no la suma.
+_CHART_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='chart-data')
+
+
+@cached(_QUOTE_CACHE, key=lambda symbol, user: hashkey(user.id, symbol), lock=_CACHE_LOCK)
+def _get_last_quote_cached(symbol: str, user) -> Dict[str, Any]:
+    return _FLIGHT.do(
+        ('quote', user.id, symbol),
+        lambda: alpaca_service.get_last_quote(symbol, user=user),
+    )
+
+
+@cached(
+    _BARS_CACHE,
+    key=lambda symbol, timeframe, limit, user: hashkey(user.id, symbol, timeframe, limit),
+    lock=_CACHE_LOCK,
+)
+def _get_bars_cached(symbol: str, timeframe: str, limit: int, user) -> List[Dict[str, Any]]:
+    return _FLIGHT.do(
+        ('bars', user.id, symbol, timeframe, limit),
+        lambda: alpaca_service.get_bars(symbol, timeframe, limit, user=user),
+    )
+
+
+def _parse_bars_args():
+    """
+    Lee timeframe y limit de la query string con los accesores tipados.
+
+    Returns:
+        Tuple[str, Optional[int]]: (timeframe, limit); limit es None si el
+        parámetro viene informado pero no es un entero válido.
+    """
+    timeframe = request.args.get('timeframe', '1D', type=str)
+    limit = request.args.get('limit', type=int)
+    if limit is None and 'limit' not in request.args:
+        limit = 100
+    return timeframe, limit
+
+
+def _invalid_limit_response():
+    return error_response('Parámetro limit debe ser un número')
+
 
 def register_trading_routes(app: Flask, socketio: SocketIO) -> None:
     @app.route('/api/account', methods=['GET'])
@@ -22,9 +121,9 @@ def register_trading_routes(app: Flask, socketio: SocketIO) -> None:
         """Obtiene información de la cuenta."""
         try:
             account = trading_service.get_account_info(user=g.current_user)
-            return jsonify({'success': True, 'data': account.to_dict()})
+            return json_response({'success': True, 'data': account.to_dict()})
         except TradingServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
+            return json_response({'success': False, 'error': str(e)}), 400
 
     @app.route('/api/positions', methods=['GET'])
     @require_auth
@@ -32,41 +131,36 @@ def register_trading_routes(app: Flask, socketio: SocketIO) -> None:
         """Obtiene todas las posiciones abiertas."""
         try:
             positions = trading_service.get_positions(user=g.current_user)
-            return jsonify({
+            return json_response({
                 'success': True,
-                'data': [pos.to_dict() for pos in positions],
+                'data': positions,
             })
         except TradingServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
+            return json_response({'success': False, 'error': str(e)}), 400
 
     @app.route('/api/swing-trade', methods=['POST'])
     @require_auth
     def create_swing_trade():
         """Crea una operación swing trade completa."""
+        user = g.current_user
         try:
-            data = request.get_json() or {}
-
-            required_fields = [
-                'symbol',
-                'qty',
-                'entry_price',
-                'take_profit_price',
-                'stop_loss_price',
-            ]
-            for field in required_fields:
-                if field not in data:
-                    return jsonify({
-                        'success': False,
-                        'error': f'Campo requerido faltante: {field}',
-                    }), 400
+            try:
+                data = get_json_fast()
+            except ValueError as e:
+                return json_response({'success': False, 'error': str(e)}), 400
+
+            try:
+                spec = SwingTradeSpec.from_dict(data)
+            except ValueError as e:
+                return json_response({'success': False, 'error': str(e)}), 400
 
             result = trading_service.create_swing_trade(
-                symbol=str(data['symbol']).upper(),
-                qty=float(data['qty']),
-                entry_price=float(data['entry_price']),
-                take_profit_price=float(data['take_profit_price']),
-                stop_loss_price=float(data['stop_loss_price']),
-                user=g.current_user,
+                symbol=spec.symbol,
+                qty=spec.qty,
+                entry_price=spec.entry_price,
+                take_profit_price=spec.take_profit_price,
+                stop_loss_price=spec.stop_loss_price,
+                user=user,
             )
 
             response_data = {
@@ -75,70 +169,92 @@ def register_trading_routes(app: Flask, socketio: SocketIO) -> None:
                 'stop_loss_target': result['stop_loss_target'],
             }
 
-            socketio.emit('swing_trade_created', response_data)
+            # Solo a los sockets del propio usuario, fuera de la petición
+            socketio.start_background_task(
+                batched_emit, socketio, 'swing_trade_created', response_data,
+                room=user_room(str(user.id)),
+            )
 
-            return jsonify({'success': True, 'data': response_data}), 201
+            return json_response({'success': True, 'data': response_data}), 201
         except TradingServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
+            return json_response({'success': False, 'error': str(e)}), 400
         except Exception:
-            return jsonify({
-                'success': False,
-                'error': 'Error interno del servidor',
-            }), 500
+            return error_response('Error interno del servidor', 500)
 
     @app.route('/api/quote/<symbol>', methods=['GET'])
     @require_auth
+    @rate_limit(120)
     def get_quote(symbol: str):
         """Obtiene la cotización actual de un símbolo."""
         try:
-            quote = alpaca_service.get_last_quote(symbol.upper(), user=g.current_user)
-            return jsonify({'success': True, 'data': quote})
+            quote = _get_last_quote_cached(normalize_symbol(symbol), g.current_user)
+            return json_response({'success': True, 'data': quote})
         except AlpacaServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
+            return json_response({'success': False, 'error': str(e)}), 400
 
     @app.route('/api/bars/<symbol>', methods=['GET'])
     @require_auth
+    @rate_limit(120)
     def get_bars(symbol: str):
         """Obtiene barras históricas de un símbolo."""
-        try:
-            timeframe = request.args.get('timeframe', '1D')
-            limit = int(request.args.get('limit', 100))
+        timeframe, limit = _parse_bars_args()
+        if limit is None:
+            return _invalid_limit_response()
 
-            bars = alpaca_service.get_bars(
-                symbol.upper(), timeframe, limit, user=g.current_user
-            )
-            return jsonify({'success': True, 'data': bars})
+        try:
+            bars = _get_bars_cached(normalize_symbol(symbol), timeframe, limit, g.current_user)
+            # NDJSON: una barra por línea, el cliente puede pintar mientras llega
+            accept = request.accept_mimetypes
+            if accept.best_match(('application/json', 'application/x-ndjson')) == 'application/x-ndjson':
+                response = stream_ndjson_response(bars)
+            else:
+                # Mientras siga en caché el cliente puede reutilizar su copia
+                response = conditional_json_response(
+                    {'success': True, 'data': bars}, max_age=int(_bars_ttl(timeframe))
+                )
+            # La misma URL devuelve JSON o NDJSON según Accept: las cachés deben distinguirlos
+            response.vary.add('Accept')
+            return response
         except AlpacaServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
-        except ValueError:
-            return jsonify({
-                'success': False,
-                'error': 'Parámetro limit debe ser un número',
-            }), 400
+            return json_response({'success': False, 'error': str(e)}), 400
 
     @app.route('/api/chart-data/<symbol>', methods=['GET'])
     @require_auth
     def get_chart_data(symbol: str):
         """Obtiene datos combinados de barras e info de cotización para el gráfico principal."""
+        timeframe, limit = _parse_bars_args()
+        if limit is None:
+            return _invalid_limit_response()
+
         try:
-            timeframe = request.args.get('timeframe', '1D')
-            limit = int(request.args.get('limit', 100))
+            symbol = normalize_symbol(symbol)
+            user = g.current_user
+            bars_future = _CHART_POOL.submit(_get_bars_cached, symbol, timeframe, limit, user)
+            quote = _get_last_quote_cached(symbol, user)
+            bars = bars_future.result()
+            # Incluye la cotización: siempre se revalida, pero sin cuerpo si no cambió
+            return conditional_json_response({'success': True, 'data': {'bars': bars, 'quote': quote}})
+        except AlpacaServiceException as e:
+            return json_response({'success': False, 'error': str(e)}), 400
 
-            bars = alpaca_service.get_bars(
-                symbol.upper(), timeframe, limit, user=g.current_user
+    def _run_swing_scan(job_id: str, symbols: List[str], user) -> None:
+        """Ejecuta scan_and_trade y notifica el resultado a los sockets del usuario."""
+        payload: Dict[str, Any] = {'job_id': job_id}
+        try:
+            payload['data'] = swing_strategy_service.scan_and_trade(symbols, user=user)
+            payload['success'] = True
+        except Exception as e:
+            logger.exception('Error en swing scan %s', job_id)
+            payload['success'] = False
+            payload['error'] = (
+                str(e) if isinstance(e, SwingStrategyServiceException)
+                else 'Error interno del servidor'
             )
-            quote = alpaca_service.get_last_quote(symbol.upper(), user=g.current_user)
-            return jsonify({'success': True, 'data': {'bars': bars, 'quote': quote}})
-        except AlpacaServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
-        except ValueError:
-            return jsonify({
-                'success': False,
-                'error': 'Parámetro limit debe ser un número',
-            }), 400
+        batched_emit(socketio, 'swing_scan_result', payload, room=user_room(str(user.id)))
 
     @app.route('/api/swing-scan', methods=['POST'])
     @require_auth
+    @rate_limit(10)
     def swing_scan():
         """Escanea tickers con la estrategia swing y opcionalmente ejecuta órdenes."""
         try:
@@ -151,38 +267,40 @@ def register_trading_routes(app: Flask, socketio: SocketIO) -> None:
                 tickers = ['AAPL', 'MSFT', 'AMZN', 'NVDA', 'META']
 
             if not isinstance(tickers, list) or not tickers:
-                return jsonify({
-                    'success': False,
-                    'error': 'El campo tickers debe ser una lista no vacía',
-                }), 400
+                return error_response('El campo tickers debe ser una lista no vacía')
 
-            symbols: List[str] = [str(t).upper() for t in tickers]
+            symbols: List[str] = [normalize_symbol(str(t)) for t in tickers]
 
             if execute:
-                results = swing_strategy_service.scan_and_trade(
-                    symbols, user=g.current_user
+                # El envío de órdenes puede tardar varios segundos por símbolo:
+                # se ejecuta fuera de la petición y el resultado llega por socket
+                job_id = uuid.uuid4().hex
+                socketio.start_background_task(
+                    _run_swing_scan, job_id, symbols, g.current_user
                 )
-            else:
-                results = []
-                for symbol in symbols:
-                    signal = swing_strategy_service.generate_signal(
-                        symbol, user=g.current_user
-                    )
-                    results.append({
-                        'symbol': symbol,
-                        'has_signal': signal.has_signal,
-                        'entry_price': signal.entry_price,
-                        'stop_price': signal.stop_price,
-                        'take_profit_price': signal.take_profit_price,
-                        'qty': signal.qty,
-                        'reason': signal.reason,
-                    })
-
-            return jsonify({'success': True, 'data': results})
+                return json_response({
+                    'success': True,
+                    'data': {'job_id': job_id, 'symbols': symbols},
+                }), 202
+
+            signals = swing_strategy_service.generate_signals(
+                symbols, user=g.current_user
+            )
+            results = [
+                {
+                    'symbol': symbol,
+                    'has_signal': signal.has_signal,
+                    'entry_price': signal.entry_price,
+                    'stop_price': signal.stop_price,
+                    'take_profit_price': signal.take_profit_price,
+                    'qty': signal.qty,
+                    'reason': signal.reason,
+                }
+                for symbol, signal in zip(symbols, signals)
+            ]
+
+            return json_response({'success': True, 'data': results})
         except SwingStrategyServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
+            return json_response({'success': False, 'error': str(e)}), 400
         except Exception:
-            return jsonify({
-                'success': False,
-                'error': 'Error interno del servidor',
-            }), 500
+            return error_response('Error interno del servidor', 500)
@@ -1,74 +1,121 @@
-from flask import Flask, jsonify, request, g
+from flask import Blueprint, request, g
 
-from utils.auth_utils import require_auth
+from utils.auth_utils import current_user_dict, require_auth
+from utils.json_utils import error_response, json_response
 
 from services.trend_preferences_service import (
     trend_preferences_service,
     TrendPreferencesServiceException,
 )
 from models.user import update_user_keys
-from utils.security import encrypt_text
+from utils.security import decrypt_text, encrypt_text
 
+# Se registra con url_prefix='/api' (ver app.create_app)
+user_bp = Blueprint('user_bp', __name__)
+
+
+def _same_secret(stored_enc, plaintext: str) -> bool:
+    """Compara un secreto en claro con el valor cifrado guardado."""
+    if not stored_enc:
+        return plaintext == ''
+    try:
+        return decrypt_text(stored_enc) == plaintext
+    except Exception:
+        return False
+
+
+def _changed_fields(user, api_key, secret_key, base_url, paper_trading):
+    """
+    Descarta (``None``) los campos enviados que coinciden con los guardados.
+
+    Fernet cifra con IV aleatorio, así que se compara en claro contra los
+    valores descifrados y no contra los textos cifrados. Los campos sin
+    cambios no se vuelven a cifrar ni se incluyen en el ``$set``.
+    """
+    if api_key is not None and _same_secret(user.alpaca_api_key_enc, api_key):
+        api_key = None
+    if secret_key is not None and _same_secret(user.alpaca_secret_key_enc, secret_key):
+        secret_key = None
+    if base_url is not None and base_url == user.alpaca_base_url:
+        base_url = None
+    if paper_trading is not None and paper_trading == user.paper_trading:
+        paper_trading = None
+    return api_key, secret_key, base_url, paper_trading
+
+
+@user_bp.route('/user/me', methods=['GET'])
+@require_auth
+def get_me():
+    return json_response({
+        'success': True,
+        'data': current_user_dict(),
+    })
+
+
+@user_bp.route('/user/trend-preferences', methods=['GET'])
+@require_auth
+def get_trend_preferences():
+    try:
+        prefs = trend_preferences_service.get_preferences(g.current_user.id)
+        return json_response({'success': True, 'data': prefs})
+    except TrendPreferencesServiceException as e:
+        return json_response({'success': False, 'error': str(e)}), 400
+    except Exception:
+        return error_response('Error interno del servidor', 500)
 
-def register_user_routes(app: Flask) -> None:
-    @app.route('/api/user/me', methods=['GET'])
-    @require_auth
-    def get_me():
-        user = g.current_user
-        return jsonify({
-            'success': True,
-            'data': user.to_dict(),
-        })
 
-    @app.route('/api/user/trend-preferences', methods=['GET'])
-    @require_auth
-    def get_trend_preferences():
-        try:
-            prefs = trend_preferences_service.get_preferences(g.current_user.id)
-            return jsonify({'success': True, 'data': prefs})
-        except TrendPreferencesServiceException as e:
-            return jsonify({'success': False, 'error': str(e)}), 400
-        except Exception:
-            return jsonify({'success': False, 'error': 'Error interno del servidor'}), 500
-
-    @app.route('/api/user/keys', methods=['PUT'])
-    @require_auth
-    def update_keys():
-        data = request.get_json() or {}
-
-        alpaca_api_key = data.get('alpaca_api_key')
-        alpaca_secret_key = data.get('alpaca_secret_key')
-        alpaca_base_url = data.get('alpaca_base_url')
-        paper_trading = data.get('paper_trading')
-
-        alpaca_api_key_enc = None
-        alpaca_secret_key_enc = None
-
-        if alpaca_api_key is not None:
-            alpaca_api_key_enc = encrypt_text(alpaca_api_key) if alpaca_api_key else ''
-
-        if alpaca_secret_key is not None:
-            alpaca_secret_key_enc = encrypt_text(alpaca_secret_key) if alpaca_secret_key else ''
-
-        paper_trading_value = None
-        if paper_trading is not None:
-            if isinstance(paper_trading, bool):
-                paper_trading_value = paper_trading
-            else:
-                paper_trading_value = str(paper_trading).lower() == 'true'
-
-        user = update_user_keys(
-            g.current_user.id,
-            alpaca_api_key_enc=alpaca_api_key_enc,
-            alpaca_secret_key_enc=alpaca_secret_key_enc,
-            alpaca_base_url=alpaca_base_url,
-            paper_trading=paper_trading_value,
-        )
-
-        if user is None:
-            return jsonify({'success': False, 'error': 'Usuario no encontrado'}), 404
-
-        return jsonify({
+@user_bp.route('/user/keys', methods=['PUT'])
+@require_auth
+def update_keys():
+    data = request.get_json() or {}
+
+    alpaca_api_key = data.get('alpaca_api_key')
+    alpaca_secret_key = data.get('alpaca_secret_key')
+    alpaca_base_url = data.get('alpaca_base_url')
+    paper_trading = data.get('paper_trading')
+
+    paper_trading_value = None
+    if paper_trading is not None:
+        if isinstance(paper_trading, bool):
+            paper_trading_value = paper_trading
+        else:
+            paper_trading_value = str(paper_trading).lower() == 'true'
+
+    alpaca_api_key, alpaca_secret_key, alpaca_base_url, paper_trading_value = _changed_fields(
+        g.current_user, alpaca_api_key, alpaca_secret_key, alpaca_base_url, paper_trading_value
+    )
+
+    # Guardar sin cambios no escribe en MongoDB
+    if (
+        alpaca_api_key is None and alpaca_secret_key is None
+        and alpaca_base_url is None and paper_trading_value is None
+    ):
+        return json_response({
             'success': True,
-            'data': user.to_dict(),
+            'data': current_user_dict(),
         })
+
+    alpaca_api_key_enc = None
+    alpaca_secret_key_enc = None
+
+    if alpaca_api_key is not None:
+        alpaca_api_key_enc = encrypt_text(alpaca_api_key) if alpaca_api_key else ''
+
+    if alpaca_secret_key is not None:
+        alpaca_secret_key_enc = encrypt_text(alpaca_secret_key) if alpaca_secret_key else ''
+
+    user = update_user_keys(
+        g.current_user_oid,
+        alpaca_api_key_enc=alpaca_api_key_enc,
+        alpaca_secret_key_enc=alpaca_secret_key_enc,
+        alpaca_base_url=alpaca_base_url,
+        paper_trading=paper_trading_value,
+    )
+
+    if user is None:
+        return error_response('Usuario no encontrado', 404)
+
+    return json_response({
+        'success': True,
+        'data': user.to_dict(),
+    })
@@ -1,31 +1,33 @@
 """
 Módulo de servicios.
 
-Exporta los servicios principales de la aplicación.
+Exporta los servicios principales de la aplicación. Las importaciones se
+resuelven de forma diferida (PEP 562): importar un servicio concreto no
+carga el resto ni sus dependencias pesadas (pandas, alpaca-py, modelos).
 """
 
-from services.alpaca_service import alpaca_service, AlpacaService, AlpacaServiceException
-from services.trading_service import trading_service, TradingService, TradingServiceException
-from services.swing_strategy_service import (
-    swing_strategy_service,
-    SwingStrategyService,
-    SwingStrategyServiceException,
-)
-from services.market_screener_service import (
-    market_screener_service,
-    MarketScreenerService,
-    MarketScreenerServiceException,
-)
-from services.news_scraper_service import (
-    news_scraper_service,
-    NewsScraperService,
-    NewsScraperServiceException,
-)
-from services.symbol_preferences_service import (
-    symbol_preferences_service,
-    SymbolPreferencesService,
-    SymbolPreferencesServiceException,
-)
+from importlib import import_module
+
+_EXPORTS = {
+    "alpaca_service": ".alpaca_service",
+    "AlpacaService": ".alpaca_service",
+    "AlpacaServiceException": ".alpaca_service",
+    "trading_service": ".trading_service",
+    "TradingService": ".trading_service",
+    "TradingServiceException": ".trading_service",
+    "swing_strategy_service": ".swing_strategy_service",
+    "SwingStrategyService": ".swing_strategy_service",
+    "SwingStrategyServiceException": ".swing_strategy_service",
+    "market_screener_service": ".market_screener_service",
+    "MarketScreenerService": ".market_screener_service",
+    "MarketScreenerServiceException": ".market_screener_service",
+    "news_scraper_service": ".news_scraper_service",
+    "NewsScraperService": ".news_scraper_service",
+    "NewsScraperServiceException": ".news_scraper_service",
+    "symbol_preferences_service": ".symbol_preferences_service",
+    "SymbolPreferencesService": ".symbol_preferences_service",
+    "SymbolPreferencesServiceException": ".symbol_preferences_service",
+}
 
 __all__ = [
     "alpaca_service",
@@ -46,4 +48,17 @@ __all__ = [
     "symbol_preferences_service",
     "SymbolPreferencesService",
     "SymbolPreferencesServiceException",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
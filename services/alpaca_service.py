@@ -5,8 +5,10 @@ Implementa el patrón Repository y el principio de Inversión de Dependencias (D
 de SOLID, permitiendo abstraer la lógica de acceso a datos del broker.
 """
 
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Tuple
 import logging
+import threading
 from datetime import datetime, timedelta
 
 from alpaca.common.exceptions import APIError
@@ -22,15 +24,45 @@ from alpaca.trading.enums import OrderSide as AlpacaOrderSide, TimeInForce
 from alpaca.data import StockHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest, StockLatestTradeRequest, StockSnapshotRequest
 from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
+from cachetools import TTLCache
 
 from config import config
-from models.order import Order, Position, Account, Quote, OrderSide, OrderType
+from models.order import Order, Position, Account, Quote, OrderSide, OrderType, OrderStatus
 from models.user import User
+from utils.http_pool import pooled
 from utils.security import decrypt_text
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
+# Máximo de consultas de asset simultáneas en get_multiple_quotes
+_ASSET_LOOKUP_MAX_WORKERS = 16
+
+# Consultas paralelas de get_last_quote (trade, asset, cierre previo y
+# snapshot). Nada de lo que se ejecuta aquí vuelve a enviar tareas al pool.
+_QUOTE_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix='alpaca-quote')
+
+# Clientes por usuario ya construidos: (user_id, 'trading'|'data') ->
+# (credenciales, cliente). Las credenciales guardadas son los textos
+# cifrados (y el modo paper): si el usuario las cambia, la entrada deja de
+# coincidir y se reconstruye. El TTL acota cuánto vive un cliente inactivo.
+_USER_CLIENTS: TTLCache = TTLCache(maxsize=1024, ttl=15 * 60)
+_USER_CLIENTS_LOCK = threading.Lock()
+
+
+def _cached_user_client(key: Tuple[str, str], credentials: Tuple[Any, ...]):
+    with _USER_CLIENTS_LOCK:
+        entry = _USER_CLIENTS.get(key)
+    if entry is not None and entry[0] == credentials:
+        return entry[1]
+    return None
+
+
+def _store_user_client(key: Tuple[str, str], credentials: Tuple[Any, ...], client):
+    with _USER_CLIENTS_LOCK:
+        _USER_CLIENTS[key] = (credentials, client)
+    return client
+
 
 class AlpacaServiceException(Exception):
     """Excepción personalizada para errores del servicio de Alpaca."""
@@ -63,17 +95,17 @@ class AlpacaService:
             paper = 'paper' in config.ALPACA_BASE_URL.lower()
 
             # Cliente de trading de alpaca-py
-            self._trading_client = TradingClient(
+            self._trading_client = pooled(TradingClient(
                 api_key=config.ALPACA_API_KEY or None,
                 secret_key=config.ALPACA_SECRET_KEY or None,
                 paper=paper,
-            )
+            ))
 
             # Cliente de datos de mercado de alpaca-py
-            self._data_client = StockHistoricalDataClient(
+            self._data_client = pooled(StockHistoricalDataClient(
                 api_key=config.ALPACA_API_KEY or None,
                 secret_key=config.ALPACA_SECRET_KEY or None,
-            )
+            ))
 
             logger.info("Alpaca API inicializada correctamente con alpaca-py")
             self._initialized = True
@@ -83,6 +115,17 @@ class AlpacaService:
 
     def _get_trading_client_for_user(self, user: Optional[User]) -> TradingClient:
         if user and user.alpaca_api_key_enc and user.alpaca_secret_key_enc:
+            paper_flag = getattr(user, "paper_trading", None)
+            if paper_flag is None:
+                base_url = user.alpaca_base_url or config.ALPACA_BASE_URL
+                paper_flag = "paper" in base_url.lower()
+
+            key = (str(user.id), "trading")
+            credentials = (user.alpaca_api_key_enc, user.alpaca_secret_key_enc, bool(paper_flag))
+            client = _cached_user_client(key, credentials)
+            if client is not None:
+                return client
+
             try:
                 api_key = decrypt_text(user.alpaca_api_key_enc)
                 secret_key = decrypt_text(user.alpaca_secret_key_enc)
@@ -90,21 +133,22 @@ class AlpacaService:
                 logger.error(f"Error al descifrar claves de Alpaca para usuario: {str(e)}")
                 raise AlpacaServiceException("No se pudieron descifrar las claves de Alpaca del usuario")
 
-            paper_flag = getattr(user, "paper_trading", None)
-            if paper_flag is None:
-                base_url = user.alpaca_base_url or config.ALPACA_BASE_URL
-                paper_flag = "paper" in base_url.lower()
-
-            return TradingClient(
+            return _store_user_client(key, credentials, pooled(TradingClient(
                 api_key=api_key or None,
                 secret_key=secret_key or None,
                 paper=bool(paper_flag),
-            )
+            )))
 
         return self._trading_client
 
     def _get_data_client_for_user(self, user: Optional[User]) -> StockHistoricalDataClient:
         if user and user.alpaca_api_key_enc and user.alpaca_secret_key_enc:
+            key = (str(user.id), "data")
+            credentials = (user.alpaca_api_key_enc, user.alpaca_secret_key_enc)
+            client = _cached_user_client(key, credentials)
+            if client is not None:
+                return client
+
             try:
                 api_key = decrypt_text(user.alpaca_api_key_enc)
                 secret_key = decrypt_text(user.alpaca_secret_key_enc)
@@ -112,10 +156,10 @@ class AlpacaService:
                 logger.error(f"Error al descifrar claves de Alpaca para usuario (datos): {str(e)}")
                 raise AlpacaServiceException("No se pudieron descifrar las claves de Alpaca del usuario")
 
-            return StockHistoricalDataClient(
+            return _store_user_client(key, credentials, pooled(StockHistoricalDataClient(
                 api_key=api_key or None,
                 secret_key=secret_key or None,
-            )
+            )))
 
         return self._data_client
 
@@ -245,6 +289,11 @@ class AlpacaService:
             submitted_order = trading_client.submit_order(order_request)
             
             # Convertir a nuestro modelo Order
+            try:
+                status = OrderStatus(submitted_order.status.value)
+            except ValueError:
+                status = OrderStatus.NEW
+
             order = Order(
                 order_id=submitted_order.id,
                 symbol=submitted_order.symbol,
@@ -254,7 +303,7 @@ class AlpacaService:
                 time_in_force=submitted_order.time_in_force.value,
                 limit_price=getattr(submitted_order, 'limit_price', None),
                 stop_price=getattr(submitted_order, 'stop_price', None),
-                status=submitted_order.status.value,
+                status=status,
                 created_at=submitted_order.created_at,
                 filled_qty=getattr(submitted_order, 'filled_qty', None),
                 filled_avg_price=getattr(submitted_order, 'filled_avg_price', None),
@@ -524,76 +573,21 @@ class AlpacaService:
             AlpacaServiceException: Si hay un error al obtener la cotización
         """
         try:
-            request = StockLatestTradeRequest(symbol_or_symbols=symbol)
             data_client = self._get_data_client_for_user(user)
-            latest_trade = data_client.get_stock_latest_trade(request)
-            trade = latest_trade[symbol]
-
-            asset_name = None
-            asset_class_str = None
-            asset_exchange_str = None
-            asset_attributes: Optional[list[str]] = None
-            try:
-                client = self._get_trading_client_for_user(user)
-                asset = client.get_asset(symbol_or_asset_id=symbol)
-                asset_name = getattr(asset, "name", None)
-
-                asset_class = getattr(asset, "asset_class", None)
-                if asset_class is not None:
-                    asset_class_str = (
-                        asset_class.value
-                        if hasattr(asset_class, "value")
-                        else str(asset_class)
-                    )
-
-                asset_exchange = getattr(asset, "exchange", None)
-                if asset_exchange is not None:
-                    asset_exchange_str = (
-                        asset_exchange.value
-                        if hasattr(asset_exchange, "value")
-                        else str(asset_exchange)
-                    )
+            # Las cuatro consultas son independientes: la latencia total es
+            # la de la más lenta y no la suma
+            trade_future = _QUOTE_POOL.submit(
+                data_client.get_stock_latest_trade,
+                StockLatestTradeRequest(symbol_or_symbols=symbol),
+            )
+            asset_future = _QUOTE_POOL.submit(self._get_asset_info, symbol, user)
+            close_future = _QUOTE_POOL.submit(self._get_previous_close, symbol, user)
+            daily_future = _QUOTE_POOL.submit(self._get_daily_activity, data_client, symbol)
 
-                attrs = getattr(asset, "attributes", None)
-                if attrs is not None:
-                    asset_attributes = [str(a) for a in list(attrs)]
-            except Exception:
-                # Si falla la obtención del asset, devolvemos solo la información básica de precio
-                asset_name = asset_name
-
-            close_price = None
-            try:
-                # Obtener las últimas 2 barras para usar el cierre del día anterior
-                bars = self.get_bars(symbol, '1D', limit=2, user=user)
-                if bars and len(bars) >= 2:
-                    # Usar el cierre del día anterior (penúltima barra)
-                    prev_bar = bars[-2]
-                    close_value = prev_bar.get('close')
-                    if close_value is not None:
-                        close_price = float(close_value)
-                elif bars and len(bars) == 1:
-                    # Solo hay una barra, usar su cierre
-                    last_bar = bars[-1]
-                    close_value = last_bar.get('close')
-                    if close_value is not None:
-                        close_price = float(close_value)
-            except Exception:
-                close_price = None
-
-            # Intentar obtener volumen y trade_count de la barra diaria del snapshot
-            volume = None
-            trade_count = None
-            try:
-                # Usamos snapshots para obtener datos más completos en una sola llamada
-                request_snapshot = StockSnapshotRequest(symbol_or_symbols=symbol)
-                snp_resp = data_client.get_stock_snapshot(request_snapshot)
-                if symbol in snp_resp:
-                    snp = snp_resp[symbol]
-                    if snp.daily_bar:
-                        volume = int(snp.daily_bar.volume)
-                        trade_count = int(snp.daily_bar.trade_count) if snp.daily_bar.trade_count else None
-            except Exception:
-                pass
+            trade = trade_future.result()[symbol]
+            asset_name, asset_exchange_str, asset_class_str, asset_attributes = asset_future.result()
+            close_price = close_future.result()
+            volume, trade_count = daily_future.result()
 
             return {
                 'symbol': symbol,
@@ -615,6 +609,87 @@ class AlpacaService:
             logger.error(f"Error inesperado al obtener cotización {symbol}: {str(e)}")
             raise AlpacaServiceException(f"Error inesperado: {str(e)}")
 
+    def _get_previous_close(self, symbol: str, user: Optional[User]) -> Optional[float]:
+        """Cierre del día anterior (o de la única barra disponible); None si falla."""
+        try:
+            # Obtener las últimas 2 barras para usar el cierre del día anterior
+            bars = self.get_bars(symbol, '1D', limit=2, user=user)
+        except Exception:
+            return None
+        if not bars:
+            return None
+        # Con dos barras, la penúltima es el día anterior
+        close_value = bars[-2].get('close') if len(bars) >= 2 else bars[-1].get('close')
+        return float(close_value) if close_value is not None else None
+
+    @staticmethod
+    def _get_daily_activity(data_client: StockHistoricalDataClient, symbol: str) -> tuple:
+        """Volumen y número de operaciones de la barra diaria del snapshot; Nones si falla."""
+        try:
+            snp_resp = data_client.get_stock_snapshot(StockSnapshotRequest(symbol_or_symbols=symbol))
+        except Exception:
+            return None, None
+        snp = snp_resp[symbol] if symbol in snp_resp else None
+        if snp is None or not snp.daily_bar:
+            return None, None
+        return (
+            int(snp.daily_bar.volume),
+            int(snp.daily_bar.trade_count) if snp.daily_bar.trade_count else None,
+        )
+
+    def _get_asset_info(
+        self,
+        symbol: str,
+        user: Optional[User] = None,
+        client: Optional[TradingClient] = None,
+    ) -> tuple:
+        """Devuelve (nombre, exchange, clase, atributos) de un asset; Nones si falla.
+
+        ``client`` permite reutilizar un mismo cliente de trading en consultas
+        de varios símbolos; si no se indica se obtiene el del usuario.
+        """
+        try:
+            if client is None:
+                client = self._get_trading_client_for_user(user)
+            asset = client.get_asset(symbol_or_asset_id=symbol)
+        except Exception:
+            # Si falla la obtención del asset, quedan solo los datos de precio
+            return None, None, None, None
+
+        asset_exchange = getattr(asset, "exchange", None)
+        asset_class = getattr(asset, "asset_class", None)
+        attrs = getattr(asset, "attributes", None)
+        return (
+            getattr(asset, "name", None),
+            getattr(asset_exchange, "value", str(asset_exchange)) if asset_exchange is not None else None,
+            getattr(asset_class, "value", str(asset_class)) if asset_class is not None else None,
+            [str(a) for a in list(attrs)] if attrs is not None else None,
+        )
+
+    def get_assets_info(self, symbols: List[str], user: Optional[User] = None) -> Dict[str, tuple]:
+        """
+        Consulta los assets de varios símbolos en paralelo (llamadas de E/S independientes).
+
+        Args:
+            symbols: Símbolos a consultar
+            user: Usuario autenticado (para usar sus claves si existen)
+
+        Returns:
+            Dict[str, tuple]: (nombre, exchange, clase, atributos) por símbolo,
+            con Nones si falla la consulta de ese asset; vacío si no hay
+            cliente de trading
+        """
+        if not symbols:
+            return {}
+        try:
+            client = self._get_trading_client_for_user(user)
+        except Exception:
+            # Sin cliente de trading se continúa solo con datos de precio
+            return {}
+        with ThreadPoolExecutor(max_workers=min(_ASSET_LOOKUP_MAX_WORKERS, len(symbols))) as ex:
+            infos = ex.map(lambda sym: self._get_asset_info(sym, client=client), symbols)
+            return dict(zip(symbols, infos))
+
     def get_multiple_quotes(self, symbols: List[str], user: Optional[User] = None) -> Dict[str, Dict[str, Any]]:
         """
         Obtiene cotizaciones múltiples en lote para mejor rendimiento.
@@ -646,37 +721,15 @@ class AlpacaService:
                     data_client = self._get_data_client_for_user(user)
                     snapshots = data_client.get_stock_snapshot(request)
 
+                    # Datos del asset en paralelo: una petición HTTP por símbolo
+                    asset_info = self.get_assets_info(list(snapshots.keys()), user)
+
                     # Procesar cada snapshot
                     for symbol, snapshot in snapshots.items():
                         try:
-                            # Obtener información adicional del asset
-                            asset_name = None
-                            asset_exchange_str = None
-                            asset_class_str = None
-                            
-                            try:
-                                client = self._get_trading_client_for_user(user)
-                                asset = client.get_asset(symbol_or_asset_id=symbol)
-                                asset_name = getattr(asset, "name", None)
-                                
-                                asset_exchange = getattr(asset, "exchange", None)
-                                if asset_exchange is not None:
-                                    asset_exchange_str = (
-                                        asset_exchange.value
-                                        if hasattr(asset_exchange, "value")
-                                        else str(asset_exchange)
-                                    )
-                                
-                                asset_class = getattr(asset, "asset_class", None)
-                                if asset_class is not None:
-                                    asset_class_str = (
-                                        asset_class.value
-                                        if hasattr(asset_class, "value")
-                                        else str(asset_class)
-                                    )
-                            except Exception:
-                                # Si falla el asset, continuamos con datos básicos
-                                pass
+                            asset_name, asset_exchange_str, asset_class_str, _ = asset_info.get(
+                                symbol, (None, None, None, None)
+                            )
 
                             # Calcular precio de cierre desde daily_bar
                             close_price = None
@@ -710,6 +763,167 @@ class AlpacaService:
             logger.error(f"Error general al obtener múltiples cotizaciones: {str(e)}")
             raise AlpacaServiceException(f"Error al obtener múltiples cotizaciones: {str(e)}")
 
+    def get_latest_snapshots(self, symbols: List[str], user: Optional[User] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtiene precio, cierre previo y volumen de varios símbolos con snapshots en lote.
+
+        Devuelve las mismas claves de precio que ``get_last_quote`` (sin datos
+        del asset), con una petición por cada 250 símbolos en lugar de varias
+        por símbolo.
+
+        Args:
+            symbols: Lista de símbolos a consultar
+            user: Usuario autenticado (para usar sus claves si existen)
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Datos por símbolo; los símbolos sin
+            snapshot no aparecen en el resultado
+
+        Raises:
+            AlpacaServiceException: Si hay un error al obtener los snapshots
+        """
+        if not symbols:
+            return {}
+
+        chunk_size = 250
+        result: Dict[str, Dict[str, Any]] = {}
+        try:
+            data_client = self._get_data_client_for_user(user)
+            for i in range(0, len(symbols), chunk_size):
+                request = StockSnapshotRequest(symbol_or_symbols=symbols[i:i + chunk_size])
+                snapshots = data_client.get_stock_snapshot(request)
+
+                for symbol, snp in snapshots.items():
+                    trade = snp.latest_trade
+                    daily_bar = snp.daily_bar
+                    # Cierre del día anterior, igual que get_last_quote
+                    close_bar = snp.previous_daily_bar or daily_bar
+                    result[symbol] = {
+                        'symbol': symbol,
+                        'price': float(trade.price) if trade else None,
+                        'close': float(close_bar.close) if close_bar else None,
+                        'size': trade.size if trade else None,
+                        'volume': int(daily_bar.volume) if daily_bar else None,
+                        'trade_count': (
+                            int(daily_bar.trade_count) if daily_bar and daily_bar.trade_count else None
+                        ),
+                        'timestamp': trade.timestamp.isoformat() if trade and trade.timestamp else None,
+                    }
+            return result
+        except APIError as e:
+            logger.error("Error API de Alpaca al obtener snapshots: %s", e)
+            raise AlpacaServiceException(f"Error al obtener snapshots: {str(e)}")
+        except Exception as e:
+            logger.error("Error inesperado al obtener snapshots: %s", e)
+            raise AlpacaServiceException(f"Error inesperado: {str(e)}")
+
+    @staticmethod
+    def _bars_window(timeframe: str, limit: int) -> Tuple[TimeFrame, datetime, int]:
+        """
+        Traduce timeframe y límite a los parámetros de ``StockBarsRequest``.
+
+        Returns:
+            Tuple[TimeFrame, datetime, int]: (timeframe, inicio de la ventana,
+            número de barras a devolver)
+
+        Raises:
+            AlpacaServiceException: Si el timeframe no está soportado
+        """
+        # Convertir string de timeframe a TimeFrame de alpaca-py
+        tf_str = timeframe.upper()
+        # Normalizar y acotar el límite solicitado por el cliente
+        requested_limit = max(1, int(limit))
+
+        if tf_str.endswith('MIN'):
+            # Para 1Min, 5Min, 15Min, etc. usamos siempre el límite de barras intradía
+            effective_limit = min(requested_limit, config.MAX_BARS_MIN)
+            try:
+                amount = int(tf_str[:-3])
+            except ValueError:
+                raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
+            if amount <= 0:
+                raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
+            tf_obj = TimeFrame(amount, TimeFrameUnit.Minute)
+            total_minutes = amount * effective_limit
+            # Aumentar ventana a 7 días para cubrir fines de semana largos y feriados
+            min_window = timedelta(days=7)
+            dynamic_window = timedelta(minutes=total_minutes * 3)
+            window = max(min_window, dynamic_window)
+            start = datetime.utcnow() - window
+        elif tf_str.endswith('H'):
+            effective_limit = min(requested_limit, config.MAX_BARS_HOUR)
+            try:
+                amount = int(tf_str[:-1])
+            except ValueError:
+                raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
+            if amount <= 0:
+                raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
+            tf_obj = TimeFrame(amount, TimeFrameUnit.Hour)
+            total_hours = amount * effective_limit
+            start = datetime.utcnow() - timedelta(hours=total_hours * 2)
+        elif tf_str.endswith('D'):
+            effective_limit = min(requested_limit, config.MAX_BARS_DAY)
+            try:
+                amount = int(tf_str[:-1])
+            except ValueError:
+                raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
+            if amount <= 0:
+                raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
+            tf_obj = TimeFrame(amount, TimeFrameUnit.Day)
+            total_days = amount * effective_limit
+            # Ventana de 10 días para asegurar barras diarias incluso tras periodos sin mercado
+            start = datetime.utcnow() - timedelta(days=max(10, total_days * 3))
+        elif tf_str.endswith('W'):
+            effective_limit = min(requested_limit, config.MAX_BARS_DAY)
+            try:
+                amount = int(tf_str[:-1])
+            except ValueError:
+                raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
+            if amount <= 0:
+                raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
+            tf_obj = TimeFrame(amount, TimeFrameUnit.Week)
+            total_weeks = amount * effective_limit
+            start = datetime.utcnow() - timedelta(weeks=total_weeks * 2)
+        elif tf_str.endswith('M'):
+            effective_limit = min(requested_limit, config.MAX_BARS_DAY)
+            try:
+                amount = int(tf_str[:-1])
+            except ValueError:
+                raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
+            if amount <= 0:
+                raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
+            tf_obj = TimeFrame(amount, TimeFrameUnit.Month)
+            total_months = amount * effective_limit
+            approx_days = total_months * 31
+            start = datetime.utcnow() - timedelta(days=approx_days * 2)
+        else:
+            raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
+
+        return tf_obj, start, effective_limit
+
+    @staticmethod
+    def _bars_to_dicts(symbol_bars: list, effective_limit: int) -> List[Dict[str, Any]]:
+        """Ordena las barras, conserva las últimas ``effective_limit`` y las serializa."""
+        # Ordenar por timestamp ascendente y quedarnos con las últimas
+        symbol_bars.sort(key=lambda b: b.timestamp)
+
+        if len(symbol_bars) > effective_limit:
+            symbol_bars = symbol_bars[-effective_limit:]
+
+        return [
+            {
+                'timestamp': bar.timestamp.isoformat(),
+                'open': float(bar.open),
+                'high': float(bar.high),
+                'low': float(bar.low),
+                'close': float(bar.close),
+                'volume': int(bar.volume),
+                'trade_count': int(bar.trade_count) if bar.trade_count else None,
+                'vwap': float(bar.vwap) if bar.vwap else None,
+            }
+            for bar in symbol_bars
+        ]
+
     def get_bars(self, symbol: str, timeframe: str = '1D', limit: int = 200, user: Optional[User] = None) -> List[Dict[str, Any]]:
         """
         Obtiene barras históricas de un símbolo.
@@ -726,75 +940,7 @@ class AlpacaService:
             AlpacaServiceException: Si hay un error al obtener las barras
         """
         try:
-            # Convertir string de timeframe a TimeFrame de alpaca-py
-            tf_str = timeframe.upper()
-            # Normalizar y acotar el límite solicitado por el cliente
-            requested_limit = max(1, int(limit))
-
-            if tf_str.endswith('MIN'):
-                # Para 1Min, 5Min, 15Min, etc. usamos siempre el límite de barras intradía
-                effective_limit = min(requested_limit, config.MAX_BARS_MIN)
-                try:
-                    amount = int(tf_str[:-3])
-                except ValueError:
-                    raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
-                if amount <= 0:
-                    raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
-                tf_obj = TimeFrame(amount, TimeFrameUnit.Minute)
-                total_minutes = amount * effective_limit
-                # Aumentar ventana a 7 días para cubrir fines de semana largos y feriados
-                min_window = timedelta(days=7)
-                dynamic_window = timedelta(minutes=total_minutes * 3)
-                window = max(min_window, dynamic_window)
-                start = datetime.utcnow() - window
-            elif tf_str.endswith('H'):
-                effective_limit = min(requested_limit, config.MAX_BARS_HOUR)
-                try:
-                    amount = int(tf_str[:-1])
-                except ValueError:
-                    raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
-                if amount <= 0:
-                    raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
-                tf_obj = TimeFrame(amount, TimeFrameUnit.Hour)
-                total_hours = amount * effective_limit
-                start = datetime.utcnow() - timedelta(hours=total_hours * 2)
-            elif tf_str.endswith('D'):
-                effective_limit = min(requested_limit, config.MAX_BARS_DAY)
-                try:
-                    amount = int(tf_str[:-1])
-                except ValueError:
-                    raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
-                if amount <= 0:
-                    raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
-                tf_obj = TimeFrame(amount, TimeFrameUnit.Day)
-                total_days = amount * effective_limit
-                # Ventana de 10 días para asegurar barras diarias incluso tras periodos sin mercado
-                start = datetime.utcnow() - timedelta(days=max(10, total_days * 3))
-            elif tf_str.endswith('W'):
-                effective_limit = min(requested_limit, config.MAX_BARS_DAY)
-                try:
-                    amount = int(tf_str[:-1])
-                except ValueError:
-                    raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
-                if amount <= 0:
-                    raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
-                tf_obj = TimeFrame(amount, TimeFrameUnit.Week)
-                total_weeks = amount * effective_limit
-                start = datetime.utcnow() - timedelta(weeks=total_weeks * 2)
-            elif tf_str.endswith('M'):
-                effective_limit = min(requested_limit, config.MAX_BARS_DAY)
-                try:
-                    amount = int(tf_str[:-1])
-                except ValueError:
-                    raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
-                if amount <= 0:
-                    raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
-                tf_obj = TimeFrame(amount, TimeFrameUnit.Month)
-                total_months = amount * effective_limit
-                approx_days = total_months * 31
-                start = datetime.utcnow() - timedelta(days=approx_days * 2)
-            else:
-                raise AlpacaServiceException(f"Timeframe no soportado: {timeframe}")
+            tf_obj, start, effective_limit = self._bars_window(timeframe, limit)
 
             request = StockBarsRequest(
                 symbol_or_symbols=symbol,
@@ -827,26 +973,7 @@ class AlpacaService:
                 )
                 return []
 
-            # Ordenar por timestamp ascendente y quedarnos con las últimas
-            symbol_bars.sort(key=lambda b: b.timestamp)
-
-            if len(symbol_bars) > effective_limit:
-                symbol_bars = symbol_bars[-effective_limit:]
-
-            bars_list: List[Dict[str, Any]] = []
-            for bar in symbol_bars:
-                bars_list.append({
-                    'timestamp': bar.timestamp.isoformat(),
-                    'open': float(bar.open),
-                    'high': float(bar.high),
-                    'low': float(bar.low),
-                    'close': float(bar.close),
-                    'volume': int(bar.volume),
-                    'trade_count': int(bar.trade_count) if bar.trade_count else None,
-                    'vwap': float(bar.vwap) if bar.vwap else None,
-                })
-
-            return bars_list
+            return self._bars_to_dicts(symbol_bars, effective_limit)
 
         except APIError as e:
             logger.error(f"Error API de Alpaca al obtener barras {symbol}: {str(e)}")
@@ -855,6 +982,55 @@ class AlpacaService:
             logger.error(f"Error inesperado al obtener barras {symbol}: {str(e)}")
             raise AlpacaServiceException(f"Error inesperado: {str(e)}")
 
+    def get_bars_multi(
+        self,
+        symbols: List[str],
+        timeframe: str = '1D',
+        limit: int = 200,
+        user: Optional[User] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Obtiene barras históricas de varios símbolos en una sola consulta.
+
+        Args:
+            symbols: Símbolos de los activos
+            timeframe: Marco temporal ('1Min', '5Min', '1H', '1D')
+            limit: Número de barras a obtener por símbolo
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Barras por símbolo; los símbolos
+            sin datos en la ventana no aparecen
+
+        Raises:
+            AlpacaServiceException: Si hay un error al obtener las barras
+        """
+        if not symbols:
+            return {}
+        try:
+            tf_obj, start, effective_limit = self._bars_window(timeframe, limit)
+
+            request = StockBarsRequest(
+                symbol_or_symbols=list(symbols),
+                timeframe=tf_obj,
+                start=start,
+            )
+
+            data_client = self._get_data_client_for_user(user)
+            bars = data_client.get_stock_bars(request)
+
+            return {
+                sym: self._bars_to_dicts(list(symbol_bars), effective_limit)
+                for sym, symbol_bars in bars.data.items()
+                if symbol_bars
+            }
+
+        except APIError as e:
+            logger.error("Error API de Alpaca al obtener barras de %d símbolos: %s", len(symbols), e)
+            raise AlpacaServiceException(f"Error al obtener barras: {str(e)}")
+        except Exception as e:
+            logger.error("Error inesperado al obtener barras de %d símbolos: %s", len(symbols), e)
+            raise AlpacaServiceException(f"Error inesperado: {str(e)}")
+
 
 # Instancia global del servicio
 alpaca_service = AlpacaService()
@@ -8,9 +8,11 @@ cambio absoluto y porcentual, además de metadatos básicos de mercado.
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 
+from pymongo import UpdateOne
+
 from db.mongo import get_db
 from models.user import User
 from services.market_screener_service import (
@@ -18,6 +20,7 @@ from services.market_screener_service import (
     MarketScreenerServiceException,
 )
 from services.alpaca_service import alpaca_service, AlpacaServiceException
+from utils.symbols import normalize_symbols
 
 logger = logging.getLogger(__name__)
 
@@ -41,13 +44,13 @@ class MarketSymbolService:
         sym = str(symbol).strip().upper()
         return sym or None
 
-    def _upsert_symbol(self, data: Dict[str, Any]) -> None:
-        """Inserta o actualiza un símbolo en MongoDB."""
+    def _build_update(
+        self, data: Dict[str, Any], now: datetime
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Construye el símbolo normalizado y el ``$set`` de un registro."""
         symbol = self._normalize_symbol(data.get("symbol"))
         if not symbol:
-            return
-
-        now = datetime.utcnow()
+            return None
 
         update: Dict[str, Any] = {
             "symbol": symbol,
@@ -63,6 +66,21 @@ class MarketSymbolService:
             "last_screener_timestamp": data.get("last_updated"),
             "updated_at": now,
         }
+        return symbol, update
+
+    def _upsert_symbol(self, data: Dict[str, Any], now: Optional[datetime] = None) -> None:
+        """Inserta o actualiza un símbolo en MongoDB.
+
+        En lotes, el llamador pasa ``now`` para reutilizar una única marca
+        de tiempo en todos los registros.
+        """
+        if now is None:
+            now = datetime.utcnow()
+
+        built = self._build_update(data, now)
+        if built is None:
+            return
+        symbol, update = built
 
         self._collection.update_one(
             {"symbol": symbol},
@@ -70,6 +88,78 @@ class MarketSymbolService:
             upsert=True,
         )
 
+    def _bulk_upsert(
+        self,
+        records: List[Dict[str, Any]],
+        now: datetime,
+        skip_fields: Tuple[str, ...] = (),
+        on_insert: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> int:
+        """Inserta o actualiza varios símbolos con un único ``bulk_write`` no ordenado.
+
+        ``skip_fields`` se excluyen del ``$set`` para conservar su valor actual.
+        ``on_insert`` aporta, por símbolo, campos que solo se escriben al crear
+        el documento (``$setOnInsert``).
+
+        Returns:
+            int: Número de operaciones enviadas
+        """
+        operations: List[UpdateOne] = []
+        for data in records:
+            built = self._build_update(data, now)
+            if built is None:
+                continue
+            symbol, update = built
+            for name in skip_fields:
+                update.pop(name, None)
+            insert_only: Dict[str, Any] = {"created_at": now}
+            if on_insert and symbol in on_insert:
+                insert_only.update(on_insert[symbol])
+            operations.append(
+                UpdateOne(
+                    {"symbol": symbol},
+                    {"$set": update, "$setOnInsert": insert_only},
+                    upsert=True,
+                )
+            )
+
+        if operations:
+            self._collection.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    @staticmethod
+    def _market_from_asset_class(asset_class: Any) -> Optional[str]:
+        """Traduce la clase de asset de Alpaca al mercado guardado en MongoDB."""
+        if not isinstance(asset_class, str):
+            return None
+        ac = asset_class.lower()
+        if "equity" in ac or ac == "us_equity":
+            return "stocks"
+        if "crypto" in ac:
+            return "crypto"
+        return asset_class
+
+    @staticmethod
+    def _apply_price_change(data: Dict[str, Any]) -> None:
+        """Calcula cambio, porcentaje y dirección a partir de price y close."""
+        price = data.get("price")
+        close = data.get("close")
+        if price is not None and close is not None and close != 0:
+            try:
+                change = float(price) - float(close)
+                percent_change = (change / float(close)) * 100.0
+                data["change"] = change
+                data["percent_change"] = percent_change
+                # Calcular dirección basada en el cambio
+                if change > 0:
+                    data["direction"] = "up"
+                elif change < 0:
+                    data["direction"] = "down"
+                else:
+                    data["direction"] = "flat"
+            except Exception:
+                pass
+
     def sync_single_symbol_from_quote(self, symbol: str, user: Optional[User] = None) -> None:
         """Sincroniza un solo símbolo consultando su última cotización y barra diaria en Alpaca."""
         sym = self._normalize_symbol(symbol)
@@ -111,36 +201,77 @@ class MarketSymbolService:
             "last_updated": quote.get("timestamp"),
         }
 
-        price = data.get("price")
-        close = data.get("close")
-        if price is not None and close is not None and close != 0:
-            try:
-                change = float(price) - float(close)
-                percent_change = (change / float(close)) * 100.0
-                data["change"] = change
-                data["percent_change"] = percent_change
-                # Calcular dirección basada en el cambio
-                if change > 0:
-                    data["direction"] = "up"
-                elif change < 0:
-                    data["direction"] = "down"
-                else:
-                    data["direction"] = "flat"
-            except Exception:
-                pass
+        self._apply_price_change(data)
 
-        asset_class = quote.get("asset_class")
-        if isinstance(asset_class, str):
-            ac = asset_class.lower()
-            if "equity" in ac or ac == "us_equity":
-                data["market"] = "stocks"
-            elif "crypto" in ac:
-                data["market"] = "crypto"
-            else:
-                data["market"] = asset_class
+        data["market"] = self._market_from_asset_class(quote.get("asset_class"))
 
         self._upsert_symbol(data)
 
+    def sync_symbols_from_quotes(self, symbols: List[str], user: Optional[User] = None) -> int:
+        """Sincroniza varios símbolos con una consulta de snapshots y un ``bulk_write``.
+
+        A diferencia de ``sync_single_symbol_from_quote`` solo consulta el
+        asset de los símbolos que aún no existen en MongoDB, para darles nombre
+        y mercado al crearlos; en los existentes esos campos se conservan.
+
+        Returns:
+            int: Número de símbolos actualizados
+        """
+        normalized = normalize_symbols(symbols)
+        if not normalized:
+            return 0
+
+        try:
+            snapshots = alpaca_service.get_latest_snapshots(normalized, user=user)
+        except AlpacaServiceException as e:
+            logger.error("Error de Alpaca al sincronizar símbolos: %s", e)
+            raise MarketSymbolServiceException(
+                f"Error de Alpaca al sincronizar símbolos: {str(e)}"
+            ) from e
+
+        records: List[Dict[str, Any]] = []
+        for sym, quote in snapshots.items():
+            data: Dict[str, Any] = {
+                "symbol": quote.get("symbol") or sym,
+                "price": quote.get("price"),
+                "close": quote.get("close"),
+                "volume": quote.get("volume"),
+                "trade_count": quote.get("trade_count"),
+                "last_updated": quote.get("timestamp"),
+            }
+            self._apply_price_change(data)
+            records.append(data)
+
+        try:
+            stored = {
+                doc["symbol"]
+                for doc in self._collection.find(
+                    {"symbol": {"$in": list(snapshots)}}, {"_id": 0, "symbol": 1}
+                )
+            }
+            missing = [sym for sym in snapshots if sym not in stored]
+            on_insert: Dict[str, Dict[str, Any]] = {}
+            for sym, (name, _exchange, asset_class, _attrs) in alpaca_service.get_assets_info(
+                missing, user
+            ).items():
+                on_insert[sym] = {
+                    "name": name,
+                    "market": self._market_from_asset_class(asset_class),
+                }
+
+            # Nombre y mercado solo se escriben al insertar: los existentes se conservan
+            return self._bulk_upsert(
+                records,
+                datetime.utcnow(),
+                skip_fields=("name", "market"),
+                on_insert=on_insert,
+            )
+        except Exception as e:
+            logger.error("Error al guardar símbolos en lote: %s", e)
+            raise MarketSymbolServiceException(
+                f"Error al guardar símbolos en lote: {str(e)}"
+            ) from e
+
     def upsert_from_most_actives(self, items: List[Dict[str, Any]]) -> int:
         """Actualiza/inserta símbolos a partir de resultados de most-actives."""
         try:
@@ -173,12 +304,7 @@ class MarketSymbolService:
                     entry["change"] = change
                     entry["percent_change"] = percent_change
 
-            processed = 0
-            for data in symbols.values():
-                self._upsert_symbol(data)
-                processed += 1
-
-            return processed
+            return self._bulk_upsert(list(symbols.values()), datetime.utcnow())
         except Exception as e:
             logger.error("Error al alimentar símbolos desde most-actives: %s", str(e))
             raise MarketSymbolServiceException(
@@ -263,12 +389,7 @@ class MarketSymbolService:
                     }
                 )
 
-            processed = 0
-            for data in symbols.values():
-                self._upsert_symbol(data)
-                processed += 1
-
-            return processed
+            return self._bulk_upsert(list(symbols.values()), datetime.utcnow())
         except MarketScreenerServiceException as e:
             logger.error("Error de screener al sincronizar símbolos: %s", str(e))
             raise MarketSymbolServiceException(
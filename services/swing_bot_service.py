@@ -13,6 +13,7 @@ from alpaca.trading.client import TradingClient
 from alpaca.data.live import StockDataStream
 from config import config
 from models.user import User
+from utils.http_pool import pooled
 from utils.security import decrypt_text
 
 logger = logging.getLogger(__name__)
@@ -30,11 +31,11 @@ class SwingBotService:
         self._api_key = config.ALPACA_API_KEY or None
         self._api_secret = config.ALPACA_SECRET_KEY or None
         
-        self._trading_client = TradingClient(
+        self._trading_client = pooled(TradingClient(
             api_key=self._api_key,
             secret_key=self._api_secret,
             paper=paper,
-        )
+        ))
         self._stream: Optional[StockDataStream] = None
         self._stream_thread: Optional[threading.Thread] = None
         
@@ -7,6 +7,7 @@ estrategia simple de tendencia + RSI + ATR.
 """
 
 import math
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
@@ -34,6 +35,12 @@ RSI_PERIOD = 14
 ATR_PERIOD = 14
 ATR_MULTIPLIER = 1.5
 RR = 2.0                  # Risk/Reward 2:1 por defecto
+_BARS_LIMIT = 300         # Barras diarias para calcular indicadores
+
+# Las señales de cada símbolo son independientes y dominadas por la
+# descarga de barras: se calculan en paralelo en un pool compartido.
+_SCAN_MAX_WORKERS = 16
+_SCAN_POOL = ThreadPoolExecutor(max_workers=_SCAN_MAX_WORKERS, thread_name_prefix='swing-scan')
 
 
 @dataclass
@@ -104,13 +111,21 @@ class SwingStrategyService:
 
     # ---------- LÓGICA DE SEÑAL ---------- #
 
-    def _build_df(self, symbol: str, limit: int = 300, user: Optional[User] = None) -> pd.DataFrame:
+    def _build_df(
+        self,
+        symbol: str,
+        limit: int = 300,
+        user: Optional[User] = None,
+        bars: Optional[List[Dict[str, Any]]] = None,
+    ) -> pd.DataFrame:
         """
         Construye un DataFrame OHLCV diario a partir de alpaca_service.
 
-        Usamos get_bars('1D') para los últimos `limit` períodos.
+        Usamos get_bars('1D') para los últimos `limit` períodos, salvo que
+        ``bars`` ya venga descargado (p. ej. con get_bars_multi).
         """
-        bars = alpaca_service.get_bars(symbol, timeframe="1D", limit=limit, user=user)
+        if bars is None:
+            bars = alpaca_service.get_bars(symbol, timeframe="1D", limit=limit, user=user)
         if not bars:
             raise SwingStrategyServiceException(f"Sin barras para {symbol}")
 
@@ -121,7 +136,12 @@ class SwingStrategyService:
 
         return df
 
-    def generate_signal(self, symbol: str, user: Optional[User] = None) -> SwingSignal:
+    def generate_signal(
+        self,
+        symbol: str,
+        user: Optional[User] = None,
+        bars: Optional[List[Dict[str, Any]]] = None,
+    ) -> SwingSignal:
         """
         Genera la señal swing para un símbolo SIN enviar orden.
 
@@ -129,7 +149,7 @@ class SwingStrategyService:
         o has_signal=False con 'reason' si no hay setup.
         """
         try:
-            df = self._build_df(symbol, limit=300, user=user)
+            df = self._build_df(symbol, limit=_BARS_LIMIT, user=user, bars=bars)
         except AlpacaServiceException as e:
             return SwingSignal(symbol=symbol, has_signal=False, reason=str(e))
         except Exception as e:
@@ -203,6 +223,33 @@ class SwingStrategyService:
             qty=qty,
         )
 
+    def generate_signals(self, tickers: List[str], user: Optional[User] = None) -> List[SwingSignal]:
+        """
+        Genera las señales de varios símbolos en paralelo.
+
+        Las barras de todos los símbolos se descargan en una sola consulta;
+        el pool solo queda para la consulta de cuenta de los que tienen
+        señal. Si falla la consulta conjunta, cada símbolo descarga sus
+        barras por separado en el pool. Devuelve las señales en el mismo
+        orden que ``tickers``.
+        """
+        try:
+            bars_by_symbol = alpaca_service.get_bars_multi(
+                tickers, timeframe="1D", limit=_BARS_LIMIT, user=user
+            )
+        except AlpacaServiceException:
+            # Un símbolo inválido hace fallar todo el lote: que solo falle el suyo
+            return list(_SCAN_POOL.map(
+                lambda symbol: self.generate_signal(symbol, user=user), tickers
+            ))
+
+        return list(_SCAN_POOL.map(
+            lambda symbol: self.generate_signal(
+                symbol, user=user, bars=bars_by_symbol.get(symbol, [])
+            ),
+            tickers,
+        ))
+
     # ---------- EJECUCIÓN DE ÓRDENES ---------- #
 
     def execute_signal(self, signal: SwingSignal, user: Optional[User] = None):
@@ -240,8 +287,9 @@ class SwingStrategyService:
         """
         results: List[Dict[str, Any]] = []
 
-        for symbol in tickers:
-            signal = self.generate_signal(symbol, user=user)
+        # Señales en paralelo; las órdenes se envían en serie para que cada
+        # una vea el poder de compra que dejó la anterior.
+        for symbol, signal in zip(tickers, self.generate_signals(tickers, user=user)):
             summary: Dict[str, Any] = {
                 "symbol": symbol,
                 "has_signal": signal.has_signal,
@@ -1,12 +1,22 @@
 from datetime import datetime
 from typing import List
 import logging
+import threading
+
+from cachetools import TTLCache
 
 from db.mongo import get_db
+from utils.symbols import normalize_symbols
 
 
 logger = logging.getLogger(__name__)
 
+# Las preferencias cambian poco y el dashboard las consulta en cada sondeo.
+# Las escrituras de este proceso actualizan la caché (un único worker), el
+# TTL solo cubre cambios hechos fuera de la API.
+_CACHE_TTL_SECONDS = 60
+_CACHE_MAX_USERS = 10000
+
 
 class SymbolPreferencesServiceException(Exception):
     pass
@@ -17,29 +27,36 @@ class SymbolPreferencesService:
         db = get_db()
         self._collection = db["user_symbol_preferences"]
         self._collection.create_index("user_id", unique=True)
+        self._cache: TTLCache = TTLCache(maxsize=_CACHE_MAX_USERS, ttl=_CACHE_TTL_SECONDS)
+        self._cache_lock = threading.Lock()
 
-    @staticmethod
-    def _normalize_symbols(symbols: List[str]) -> List[str]:
-        cleaned: List[str] = []
-        for s in symbols:
-            if s is None:
-                continue
-            sym = str(s).strip().upper()
-            if not sym:
-                continue
-            if sym not in cleaned:
-                cleaned.append(sym)
-        return cleaned
+    def _remember(self, user_id: str, symbols: List[str]) -> None:
+        with self._cache_lock:
+            self._cache[user_id] = tuple(symbols)
 
     def get_symbols(self, user_id: str) -> List[str]:
+        with self._cache_lock:
+            cached = self._cache.get(user_id)
+        if cached is not None:
+            return list(cached)
         doc = self._collection.find_one({"user_id": user_id})
-        if not doc:
-            return []
-        symbols = doc.get("symbols") or []
-        return [str(s) for s in symbols]
+        symbols = [str(s) for s in (doc.get("symbols") or [])] if doc else []
+        self._remember(user_id, symbols)
+        return symbols
+
+    def set_symbols(
+        self, user_id: str, symbols: List[str], already_normalized: bool = False
+    ) -> List[str]:
+        """
+        Sustituye los símbolos del usuario.
 
-    def set_symbols(self, user_id: str, symbols: List[str]) -> List[str]:
-        normalized = self._normalize_symbols(symbols)
+        Con ``already_normalized`` los símbolos ya vienen normalizados
+        (``normalize_symbols``) y solo se deduplican.
+        """
+        if already_normalized:
+            normalized = list(dict.fromkeys(symbols))
+        else:
+            normalized = normalize_symbols(symbols)
         now = datetime.utcnow()
         self._collection.update_one(
             {"user_id": user_id},
@@ -49,25 +66,31 @@ class SymbolPreferencesService:
             },
             upsert=True,
         )
+        self._remember(user_id, normalized)
         return normalized
 
-    def add_symbols(self, user_id: str, symbols: List[str]) -> List[str]:
+    def add_symbols(
+        self, user_id: str, symbols: List[str], already_normalized: bool = False
+    ) -> List[str]:
         if not symbols:
             return self.get_symbols(user_id)
         existing = self.get_symbols(user_id)
-        combined = existing + list(symbols)
-        return self.set_symbols(user_id, combined)
+        if not already_normalized:
+            symbols = normalize_symbols(symbols)
+        # Los guardados ya están normalizados
+        return self.set_symbols(user_id, existing + list(symbols), already_normalized=True)
 
     def remove_symbols(self, user_id: str, symbols: List[str]) -> List[str]:
         if not symbols:
             return self.get_symbols(user_id)
-        to_remove = set(self._normalize_symbols(symbols))
+        to_remove = set(normalize_symbols(symbols))
         existing = self.get_symbols(user_id)
         remaining = [s for s in existing if s not in to_remove]
         return self.set_symbols(user_id, remaining)
 
     def clear_symbols(self, user_id: str) -> List[str]:
         self._collection.delete_one({"user_id": user_id})
+        self._remember(user_id, [])
         return []
 
 
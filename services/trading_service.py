@@ -7,7 +7,7 @@ separando la lógica de trading de la comunicación con el broker.
 
 from typing import List, Dict, Any, Optional
 import logging
-from models.order import Order, OrderSide, OrderType, Position, Account
+from models.order import Order, OrderSide, OrderSpec, OrderType, Position, Account
 from services.alpaca_service import alpaca_service, AlpacaServiceException
 from models.user import User
 from config import config
@@ -102,6 +102,52 @@ class TradingService:
     # CREACIÓN DE ÓRDENES
     # ========================================================================
     
+    def create_order(self, spec: OrderSpec, user: Optional[User] = None) -> Order:
+        """
+        Crea una orden a partir de una especificación ya validada.
+
+        Despacha según ``spec.order_type`` al método ``create_*`` que
+        corresponde.
+
+        Args:
+            spec: Especificación de la orden (``OrderSpec.from_dict``)
+
+        Returns:
+            Order: Orden creada
+
+        Raises:
+            TradingServiceException: Si hay un error al crear la orden
+        """
+        order_type = spec.order_type
+        if order_type is OrderType.MARKET:
+            return self.create_market_order(
+                spec.symbol, qty=spec.qty, notional=spec.notional, side=spec.side, user=user
+            )
+        if order_type is OrderType.LIMIT:
+            return self.create_limit_order(
+                spec.symbol, qty=spec.qty, notional=spec.notional, side=spec.side,
+                limit_price=spec.limit_price, user=user,
+            )
+        if order_type is OrderType.STOP:
+            return self.create_stop_order(
+                spec.symbol, spec.qty, spec.side, spec.stop_price, user=user
+            )
+        if order_type is OrderType.STOP_LIMIT:
+            return self.create_stop_limit_order(
+                spec.symbol, spec.qty, spec.side, spec.stop_price, spec.limit_price, user=user
+            )
+        if order_type is OrderType.TRAILING_STOP:
+            return self.create_trailing_stop_order(
+                spec.symbol, spec.qty, spec.side,
+                trail_price=spec.trail_price, trail_percent=spec.trail_percent, user=user,
+            )
+        if order_type is OrderType.BRACKET:
+            return self.create_bracket_order(
+                spec.symbol, spec.qty, spec.side, spec.limit_price,
+                spec.take_profit, spec.stop_loss, user=user,
+            )
+        raise TradingServiceException(f"Tipo de orden no soportado: {order_type.value}")
+
     def create_market_order(
         self,
         symbol: str,
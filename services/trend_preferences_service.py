@@ -1,6 +1,9 @@
 from datetime import datetime
 from typing import Dict
 import logging
+import threading
+
+from cachetools import TTLCache
 
 from db.mongo import get_db
 
@@ -11,6 +14,11 @@ logger = logging.getLogger(__name__)
 DEFAULT_PROFILE = "corto"
 DEFAULT_MODEL_TYPE = "xgboost"
 
+# Igual que las preferencias de símbolos: caché por usuario actualizada en
+# cada escritura; el TTL solo cubre cambios hechos fuera de la API.
+_CACHE_TTL_SECONDS = 60
+_CACHE_MAX_USERS = 10000
+
 
 class TrendPreferencesServiceException(Exception):
     pass
@@ -21,6 +29,13 @@ class TrendPreferencesService:
         db = get_db()
         self._collection = db["user_trend_preferences"]
         self._collection.create_index("user_id", unique=True)
+        self._cache: TTLCache = TTLCache(maxsize=_CACHE_MAX_USERS, ttl=_CACHE_TTL_SECONDS)
+        self._cache_lock = threading.Lock()
+
+    def _remember(self, user_id: str, prefs: Dict[str, str]) -> Dict[str, str]:
+        with self._cache_lock:
+            self._cache[user_id] = (prefs["profile"], prefs["model_type"])
+        return prefs
 
     @staticmethod
     def _normalize_profile(profile: str | None) -> str:
@@ -43,6 +58,11 @@ class TrendPreferencesService:
         return DEFAULT_MODEL_TYPE
 
     def get_preferences(self, user_id: str) -> Dict[str, str]:
+        with self._cache_lock:
+            cached = self._cache.get(user_id)
+        if cached is not None:
+            return {"profile": cached[0], "model_type": cached[1]}
+
         try:
             doc = self._collection.find_one({"user_id": user_id})
         except Exception as e:
@@ -50,18 +70,18 @@ class TrendPreferencesService:
             raise TrendPreferencesServiceException("Error al leer preferencias de tendencia")
 
         if not doc:
-            return {
+            return self._remember(user_id, {
                 "profile": DEFAULT_PROFILE,
                 "model_type": DEFAULT_MODEL_TYPE,
-            }
+            })
 
         profile = self._normalize_profile(doc.get("profile"))
         model_type = self._normalize_model_type(doc.get("model_type"))
 
-        return {
+        return self._remember(user_id, {
             "profile": profile,
             "model_type": model_type,
-        }
+        })
 
     def set_preferences(self, user_id: str, profile: str | None, model_type: str | None) -> Dict[str, str]:
         normalized_profile = self._normalize_profile(profile)
@@ -85,10 +105,10 @@ class TrendPreferencesService:
             logger.error("Error al guardar preferencias de tendencia: %s", e)
             raise TrendPreferencesServiceException("Error al guardar preferencias de tendencia")
 
-        return {
+        return self._remember(user_id, {
             "profile": normalized_profile,
             "model_type": normalized_model_type,
-        }
+        })
 
 
 trend_preferences_service = TrendPreferencesService()
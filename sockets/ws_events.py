@@ -6,14 +6,16 @@ actualizaciones de cuenta/posiciones y auto-trading swing.
 
 from datetime import datetime
 import logging
+import threading
 from time import sleep
-from typing import Dict, Optional
+from typing import Dict, Optional, Set
 
 from flask import request
-from flask_socketio import SocketIO, emit, disconnect
+from flask_socketio import SocketIO, emit, disconnect, join_room, leave_room
 
 from config import config
 from models.user import User, get_user_by_id
+from utils.rooms import user_room
 from utils.security import decode_jwt
 from services.trading_service import trading_service
 from services.alpaca_service import alpaca_service
@@ -39,10 +41,62 @@ def register_socket_handlers(socketio: SocketIO) -> None:
     # Diccionario para rastrear usuarios autenticados por cliente (sid -> User)
     ws_clients: Dict[str, User] = {}
 
+    # Suscriptores al difusor de cuenta por usuario (user_id -> {sid})
+    account_subscribers: Dict[str, Set[str]] = {}
+    broadcaster_state = {'started': False}
+    broadcaster_lock = threading.Lock()
+
     def _get_ws_user() -> Optional[User]:
         sid = request.sid
         return ws_clients.get(sid)
 
+    def _account_room(user_id: str) -> str:
+        return f"account:{user_id}"
+
+    def _account_broadcaster() -> None:
+        """Difunde cuenta y posiciones una vez por usuario suscrito y ciclo.
+
+        Independiza el número de peticiones a Alpaca del número de clientes:
+        todos los sockets de un mismo usuario comparten el mismo snapshot.
+        """
+        while True:
+            socketio.sleep(config.ACCOUNT_BROADCAST_INTERVAL)
+
+            for user_id, sids in list(account_subscribers.items()):
+                user = next(
+                    (ws_clients[sid] for sid in list(sids) if sid in ws_clients),
+                    None,
+                )
+                if user is None:
+                    continue
+
+                room = _account_room(user_id)
+                try:
+                    account = trading_service.get_account_info(user=user)
+                    socketio.emit('account_update', account.to_dict(), to=room)
+
+                    positions = trading_service.get_positions(user=user)
+                    socketio.emit(
+                        'positions_update', [pos.to_dict() for pos in positions], to=room
+                    )
+                except Exception as e:  # pragma: no cover - defensivo
+                    logger.error('Error en difusión de cuenta para %s: %s', user_id, e)
+
+    def _ensure_account_broadcaster() -> None:
+        # Doble comprobación: en modo threading dos suscripciones simultáneas
+        # arrancarían dos bucles y duplicarían las peticiones a Alpaca
+        if not broadcaster_state['started']:
+            with broadcaster_lock:
+                if not broadcaster_state['started']:
+                    broadcaster_state['started'] = True
+                    socketio.start_background_task(_account_broadcaster)
+
+    def _remove_account_subscriber(sid: str) -> None:
+        for user_id, sids in list(account_subscribers.items()):
+            sids.discard(sid)
+            if not sids:
+                account_subscribers.pop(user_id, None)
+
     def _maybe_auto_swing_trade(user: User, symbol: str, sid: str) -> None:
         """Intenta ejecutar una operación swing automática para un usuario y símbolo.
 
@@ -158,6 +212,8 @@ def register_socket_handlers(socketio: SocketIO) -> None:
             return
 
         ws_clients[request.sid] = user
+        # Los eventos de órdenes se emiten solo a la sala del usuario
+        join_room(user_room(str(user.id)))
         emit('authenticated', {'user': user.to_dict()})
 
     @socketio.on('disconnect')
@@ -175,6 +231,7 @@ def register_socket_handlers(socketio: SocketIO) -> None:
 
         # Eliminar usuario autenticado asociado a este cliente
         ws_clients.pop(sid, None)
+        _remove_account_subscriber(sid)
 
     @socketio.on('subscribe_symbol')
     def handle_subscribe_symbol(data):
@@ -315,3 +372,29 @@ def register_socket_handlers(socketio: SocketIO) -> None:
         except Exception as e:  # pragma: no cover - defensivo
             logger.error('Error al actualizar posiciones: %s', str(e))
             emit('error', {'message': str(e)})
+
+    @socketio.on('subscribe_account')
+    def handle_subscribe_account() -> None:
+        """Suscribe al cliente a la difusión periódica de cuenta y posiciones."""
+        user = _get_ws_user()
+        if not user:
+            emit('error', {'message': 'Autenticación requerida'})
+            disconnect()
+            return
+
+        sid = request.sid
+        user_id = str(user.id)
+        join_room(_account_room(user_id))
+        account_subscribers.setdefault(user_id, set()).add(sid)
+        _ensure_account_broadcaster()
+        emit('account_subscribed', {'interval': config.ACCOUNT_BROADCAST_INTERVAL})
+
+    @socketio.on('unsubscribe_account')
+    def handle_unsubscribe_account() -> None:
+        """Cancela la suscripción a la difusión de cuenta y posiciones."""
+        user = _get_ws_user()
+        sid = request.sid
+        if user is not None:
+            leave_room(_account_room(str(user.id)))
+        _remove_account_subscriber(sid)
+        emit('account_unsubscribed', {})
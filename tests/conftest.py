@@ -3,10 +3,20 @@
 Este archivo se ejecuta antes de los tests y asegura que
 ALPACA_API_KEY, ALPACA_SECRET_KEY y el resto de variables definidas
 en .env estén disponibles vía os.getenv.
+
+También prepara lo necesario para los tests unitarios sin servicios
+externos: una base de datos MongoDB en memoria y, si no hay credenciales
+de Alpaca, los singletons de los servicios de Alpaca construidos sin
+clientes reales (solo los tests de integración necesitan las claves).
 """
 
+import importlib
+import os
+from contextlib import ExitStack
 from pathlib import Path
+from unittest import mock
 
+import pytest
 from dotenv import load_dotenv
 
 
@@ -16,3 +26,149 @@ ENV_PATH = BASE_DIR / ".env"
 
 # Cargar variables de entorno desde .env si existe
 load_dotenv(ENV_PATH)
+
+
+class _OfflineAlpacaClient:
+    """Sustituto de los clientes de alpaca-py de los singletons: no llega a la API."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+# Módulos cuyo singleton construye clientes de alpaca-py al importarse, con
+# las clases que usan (en el orden en que se importan).
+_ALPACA_SINGLETONS = (
+    ("services.alpaca_service", (
+        "alpaca.trading.client.TradingClient",
+        "alpaca.data.StockHistoricalDataClient",
+    )),
+    ("services.market_screener_service", (
+        "alpaca.data.historical.screener.ScreenerClient",
+    )),
+)
+
+
+def _import_alpaca_singletons_offline() -> None:
+    """Importa los servicios con singleton de Alpaca sin claves.
+
+    alpaca-py rechaza clientes sin credenciales. Solo los singletons reciben
+    los sustitutos: después se restauran las clases reales en cada módulo,
+    de modo que los clientes por usuario siguen siendo los de alpaca-py y
+    los tests los simulan.
+    """
+    for module_name, targets in _ALPACA_SINGLETONS:
+        with ExitStack() as stack:
+            originals = {}
+            for target in targets:
+                owner, name = target.rsplit(".", 1)
+                originals[name] = getattr(importlib.import_module(owner), name)
+                stack.enter_context(mock.patch(target, _OfflineAlpacaClient))
+            module = importlib.import_module(module_name)
+        for name, cls in originals.items():
+            setattr(module, name, cls)
+
+
+if not (os.getenv("ALPACA_API_KEY") and os.getenv("ALPACA_SECRET_KEY")):
+    _import_alpaca_singletons_offline()
+
+
+# ---------- MongoDB en memoria ---------- #
+
+def _matches(doc, query):
+    for key, condition in query.items():
+        if isinstance(condition, dict) and "$in" in condition:
+            if doc.get(key) not in condition["$in"]:
+                return False
+        elif doc.get(key) != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    """Cursor mínimo: aplica proyección, orden y límite como Mongo."""
+
+    def __init__(self, docs, projection):
+        self._docs = docs
+        self._projection = projection
+        self._limit = 0
+
+    def sort(self, key, direction=1):
+        self._docs = sorted(self._docs, key=lambda doc: doc[key], reverse=direction < 0)
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def limit(self, limit):
+        self._limit = limit
+        return self
+
+    def __iter__(self):
+        docs = self._docs[:self._limit] if self._limit else self._docs
+        projection = self._projection
+        for doc in docs:
+            if projection is None:
+                yield dict(doc)
+                continue
+            row = {k: v for k, v in doc.items() if k != "_id" and projection.get(k)}
+            if projection.get("_id", 1) and "_id" in doc:
+                row["_id"] = doc["_id"]
+            yield row
+
+
+class FakeCollection:
+    """Colección en memoria con las operaciones que usan modelos y servicios.
+
+    Registra las proyecciones de ``find`` y las operaciones de ``bulk_write``
+    para que los tests comprueben qué se pidió a Mongo.
+    """
+
+    def __init__(self, docs=()):
+        self.docs = [dict(doc) for doc in docs]
+        self.projections = []
+        self.operations = []
+
+    def create_index(self, *args, **kwargs):
+        return None
+
+    def find(self, query=None, projection=None):
+        self.projections.append(projection)
+        return FakeCursor([doc for doc in self.docs if _matches(doc, query or {})], projection)
+
+    def find_one(self, query=None, projection=None):
+        for doc in self.docs:
+            if _matches(doc, query or {}):
+                return dict(doc)
+        return None
+
+    def bulk_write(self, operations, ordered=True):
+        self.operations.extend(operations)
+
+
+class FakeDB(dict):
+    """Base de datos en memoria: cada colección se crea vacía al pedirla."""
+
+    def __missing__(self, name):
+        collection = self[name] = FakeCollection()
+        return collection
+
+
+@pytest.fixture
+def make_collection():
+    """Fábrica de colecciones en memoria con documentos iniciales."""
+    return FakeCollection
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """Sustituye la base de datos de MongoDB por una en memoria.
+
+    Los servicios que se importan por primera vez durante el test crean su
+    singleton sobre ella; los ya importados conservan su colección, que los
+    tests sustituyen con ``make_collection``.
+    """
+    import db.mongo
+
+    database = FakeDB()
+    monkeypatch.setattr(db.mongo, "_db", database)
+    return database
@@ -0,0 +1,147 @@
+"""
+Tests unitarios de AlpacaService con clientes de alpaca-py simulados.
+
+Ninguna prueba llama a la API real.
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+
+def make_bars(count, start_price=100.0):
+    """Barras diarias consecutivas terminando hoy."""
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return [
+        SimpleNamespace(
+            timestamp=today - timedelta(days=count - 1 - i),
+            open=start_price + i,
+            high=start_price + i + 1,
+            low=start_price + i - 1,
+            close=start_price + i + 0.5,
+            volume=1000 + i,
+            trade_count=10 + i,
+            vwap=start_price + i,
+        )
+        for i in range(count)
+    ]
+
+
+class FakeDataClient:
+    """Cliente de datos que responde a ``get_stock_bars`` con barras fijas."""
+
+    def __init__(self, bars_by_symbol=None, error=None):
+        self.bars_by_symbol = bars_by_symbol or {}
+        self.error = error
+        self.requests = []
+
+    def get_stock_bars(self, request):
+        self.requests.append(request)
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(data=self.bars_by_symbol)
+
+
+@pytest.fixture
+def service():
+    from services.alpaca_service import alpaca_service
+
+    return alpaca_service
+
+
+class TestGetBarsMulti:
+    """Tests para AlpacaService.get_bars_multi."""
+
+    def test_single_request_for_all_symbols(self, service, monkeypatch):
+        """Verifica una sola consulta y barras ordenadas y recortadas por símbolo."""
+        aapl = make_bars(5)
+        client = FakeDataClient({
+            "AAPL": list(reversed(aapl)),
+            "MSFT": make_bars(2, start_price=400.0),
+            "EMPTY": [],
+        })
+        monkeypatch.setattr(service, "_get_data_client_for_user", lambda user: client)
+
+        result = service.get_bars_multi(["AAPL", "MSFT", "EMPTY"], timeframe="1D", limit=3)
+
+        assert len(client.requests) == 1
+        assert client.requests[0].symbol_or_symbols == ["AAPL", "MSFT", "EMPTY"]
+        # Los símbolos sin barras no aparecen
+        assert set(result) == {"AAPL", "MSFT"}
+        assert [bar["timestamp"] for bar in result["AAPL"]] == [
+            bar.timestamp.isoformat() for bar in aapl[-3:]
+        ]
+        assert result["AAPL"][-1]["close"] == aapl[-1].close
+        assert len(result["MSFT"]) == 2
+
+    def test_empty_symbols(self, service, monkeypatch):
+        """Verifica que sin símbolos no se consulta Alpaca."""
+        client = FakeDataClient()
+        monkeypatch.setattr(service, "_get_data_client_for_user", lambda user: client)
+
+        assert service.get_bars_multi([]) == {}
+        assert client.requests == []
+
+    def test_api_error_raises_service_exception(self, service, monkeypatch):
+        """Verifica que un error de la API se traduce a AlpacaServiceException."""
+        from alpaca.common.exceptions import APIError
+        from services.alpaca_service import AlpacaServiceException
+
+        client = FakeDataClient(error=APIError("invalid symbol: ZZZZ"))
+        monkeypatch.setattr(service, "_get_data_client_for_user", lambda user: client)
+
+        with pytest.raises(AlpacaServiceException):
+            service.get_bars_multi(["AAPL", "ZZZZ"])
+
+
+class FakeTradingClient:
+    """Cliente de trading con ``get_asset`` sobre un diccionario de assets."""
+
+    def __init__(self, assets):
+        self.assets = assets
+
+    def get_asset(self, symbol_or_asset_id):
+        asset = self.assets.get(symbol_or_asset_id)
+        if asset is None:
+            raise ValueError(f"asset not found: {symbol_or_asset_id}")
+        return asset
+
+
+class TestAssetInfo:
+    """Tests para AlpacaService._get_asset_info y get_assets_info."""
+
+    _ASSETS = {
+        "AAPL": SimpleNamespace(
+            name="Apple Inc.",
+            exchange=SimpleNamespace(value="NASDAQ"),
+            asset_class=SimpleNamespace(value="us_equity"),
+            attributes=["fractional_eh_enabled"],
+        ),
+    }
+
+    def test_asset_info_with_user_client(self, service, monkeypatch):
+        """Verifica (nombre, exchange, clase, atributos) con el cliente del usuario."""
+        client = FakeTradingClient(self._ASSETS)
+        monkeypatch.setattr(service, "_get_trading_client_for_user", lambda user: client)
+
+        assert service._get_asset_info("AAPL") == (
+            "Apple Inc.", "NASDAQ", "us_equity", ["fractional_eh_enabled"]
+        )
+        assert service._get_asset_info("ZZZZ") == (None, None, None, None)
+
+    def test_assets_info_shares_one_client(self, service, monkeypatch):
+        """Verifica que varios símbolos reutilizan un solo cliente de trading."""
+        clients = []
+
+        def trading_client(user):
+            clients.append(user)
+            return FakeTradingClient(self._ASSETS)
+
+        monkeypatch.setattr(service, "_get_trading_client_for_user", trading_client)
+
+        infos = service.get_assets_info(["AAPL", "ZZZZ"])
+
+        assert len(clients) == 1
+        assert infos["AAPL"][0] == "Apple Inc."
+        assert infos["ZZZZ"] == (None, None, None, None)
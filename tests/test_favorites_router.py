@@ -0,0 +1,80 @@
+"""
+Tests para el refresco de símbolos favoritos.
+
+MongoDB y Alpaca se simulan: ninguna prueba sale del proceso. El router
+importa el servicio de tendencias, que necesita xgboost y scikit-learn.
+"""
+
+import pytest
+
+from models.market_symbol import MarketSymbol
+
+
+@pytest.fixture
+def favorites(fake_db):
+    pytest.importorskip("xgboost")
+    pytest.importorskip("sklearn")
+    import routes.favorites_router as favorites_router
+
+    return favorites_router
+
+
+@pytest.fixture
+def sync_calls(favorites, monkeypatch):
+    """Registra las sincronizaciones en lote e individuales sin llamar a Alpaca."""
+    calls = {"batch": [], "single": []}
+    service = favorites.market_symbol_service
+
+    def sync_batch(symbols, user=None):
+        calls["batch"].extend(symbols)
+        return len(symbols)
+
+    def sync_single(symbol, user=None):
+        calls["single"].append(symbol)
+
+    monkeypatch.setattr(service, "sync_symbols_from_quotes", sync_batch)
+    monkeypatch.setattr(service, "sync_single_symbol_from_quote", sync_single)
+    monkeypatch.setattr(
+        favorites,
+        "get_symbols_by_symbols",
+        lambda symbols: {sym: MarketSymbol(id=None, symbol=sym) for sym in symbols},
+    )
+    return calls
+
+
+class TestRefreshSymbols:
+    """Tests para _refresh_symbols."""
+
+    def test_known_with_name_uses_batch(self, favorites, sync_calls):
+        """Verifica que solo los símbolos guardados con nombre van por el lote."""
+        known = {
+            "AAPL": MarketSymbol(id="1", symbol="AAPL", name="Apple Inc."),
+            "TSLA": MarketSymbol(id="2", symbol="TSLA", name=None),
+        }
+
+        refreshed, errors = favorites._refresh_symbols(
+            ["AAPL", "TSLA", "MSFT"], user=None, known=known
+        )
+
+        assert sync_calls["batch"] == ["AAPL"]
+        # Sin nombre guardado: el camino individual lo obtiene del asset
+        assert sorted(sync_calls["single"]) == ["MSFT", "TSLA"]
+        assert set(refreshed) == {"AAPL", "TSLA", "MSFT"}
+        assert errors == []
+
+    def test_batch_failure_falls_back_to_individual(self, favorites, sync_calls, monkeypatch):
+        """Verifica que si falla el lote todos los símbolos se sincronizan uno a uno."""
+
+        def failing_batch(symbols, user=None):
+            raise favorites.MarketSymbolServiceException("snapshots caídos")
+
+        monkeypatch.setattr(
+            favorites.market_symbol_service, "sync_symbols_from_quotes", failing_batch
+        )
+        known = {"AAPL": MarketSymbol(id="1", symbol="AAPL", name="Apple Inc.")}
+
+        refreshed, errors = favorites._refresh_symbols(["AAPL", "MSFT"], user=None, known=known)
+
+        assert sorted(sync_calls["single"]) == ["AAPL", "MSFT"]
+        assert set(refreshed) == {"AAPL", "MSFT"}
+        assert errors == []
@@ -0,0 +1,106 @@
+"""
+Tests para la serialización JSON con orjson.
+"""
+
+from datetime import datetime, timezone
+
+import orjson
+from flask import Flask
+
+from models.order import Order, OrderSide, OrderType, OrderStatus, Position, Account
+from utils.json_utils import (
+    conditional_json_response,
+    dumps_bytes,
+    stream_json_response,
+    stream_ndjson_response,
+)
+
+
+class TestDataclassSerialization:
+    """La serialización nativa de los modelos equivale a to_dict()."""
+
+    def test_order_native_matches_to_dict(self):
+        """Verifica que una orden serializada directamente coincide con to_dict()."""
+        now = datetime(2024, 1, 2, 15, 30, 12, 345000, tzinfo=timezone.utc)
+        order = Order(
+            symbol='AAPL',
+            qty=10,
+            side=OrderSide.BUY,
+            order_type=OrderType.LIMIT,
+            limit_price=150.0,
+            order_id='abc-123',
+            status=OrderStatus.ACCEPTED,
+            created_at=now,
+            updated_at=now,
+        )
+
+        assert orjson.loads(dumps_bytes([order])) == orjson.loads(dumps_bytes([order.to_dict()]))
+
+    def test_position_and_account_native_match_to_dict(self):
+        """Verifica posiciones y cuentas serializadas directamente."""
+        position = Position(
+            symbol='MSFT',
+            qty=3,
+            avg_entry_price=300.0,
+            current_price=310.0,
+            market_value=930.0,
+            unrealized_pl=30.0,
+            unrealized_plpc=3.33,
+        )
+        account = Account(
+            account_id='acc-1',
+            cash=1000.0,
+            buying_power=2000.0,
+            portfolio_value=5000.0,
+            equity=5000.0,
+        )
+
+        assert orjson.loads(dumps_bytes(position)) == position.to_dict()
+        assert orjson.loads(dumps_bytes(account)) == account.to_dict()
+
+
+class TestStreamingResponses:
+    """Las respuestas en streaming producen el mismo JSON que la versión en memoria."""
+
+    def test_stream_json_matches_envelope(self):
+        """Verifica el sobre success/data, incluida la lista vacía."""
+        app = Flask(__name__)
+        rows = [{'symbol': 'AAPL'}, {'symbol': 'MSFT'}]
+        with app.app_context():
+            body = b''.join(stream_json_response(iter(rows)).response)
+            empty = b''.join(stream_json_response(iter([])).response)
+
+        assert orjson.loads(body) == {'success': True, 'data': rows}
+        assert orjson.loads(empty) == {'success': True, 'data': []}
+
+    def test_stream_ndjson_one_line_per_row(self):
+        """Verifica que NDJSON emite una línea por fila."""
+        app = Flask(__name__)
+        rows = [{'symbol': 'AAPL'}, {'symbol': 'MSFT'}]
+        with app.app_context():
+            response = stream_ndjson_response(iter(rows))
+            lines = b''.join(response.response).splitlines()
+
+        assert response.mimetype == 'application/x-ndjson'
+        assert [orjson.loads(line) for line in lines] == rows
+
+
+class TestConditionalResponse:
+    """Respuestas con ETag y revalidación."""
+
+    def test_matching_etag_returns_304(self):
+        """Verifica que un If-None-Match igual al ETag devuelve 304 sin cuerpo."""
+        app = Flask(__name__)
+        data = {'success': True, 'data': [{'close': 1.5}]}
+        with app.test_request_context():
+            first = conditional_json_response(data, max_age=30)
+        etag = first.get_etag()[0]
+
+        with app.test_request_context(headers={'If-None-Match': f'"{etag}"'}):
+            second = conditional_json_response(data, max_age=30)
+
+        assert first.status_code == 200
+        assert 'private' in first.headers['Cache-Control']
+        assert 'max-age=30' in first.headers['Cache-Control']
+        assert second.status_code == 304
+        assert second.get_data() == b''
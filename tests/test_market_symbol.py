@@ -0,0 +1,114 @@
+"""
+Tests para las lecturas de la colección de símbolos de mercado.
+"""
+
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+import models.market_symbol as market_symbol
+from models.market_symbol import iter_symbols_as_dicts, list_symbols_columnar
+
+
+_CREATED = datetime(2024, 1, 2, 3, 4, 5)
+
+_DOCS = [
+    {
+        "_id": ObjectId("65a000000000000000000002"),
+        "symbol": "MSFT",
+        "name": "Microsoft Corporation",
+        "market": "stocks",
+        "price": 400.0,
+        "created_at": _CREATED,
+        "updated_at": None,
+    },
+    {
+        "_id": ObjectId("65a000000000000000000001"),
+        "symbol": "AAPL",
+        "name": "Apple Inc.",
+        "market": "stocks",
+        "price": 190.5,
+        "created_at": _CREATED,
+        "updated_at": _CREATED,
+    },
+]
+
+
+@pytest.fixture
+def collection(make_collection, monkeypatch):
+    fake = make_collection(_DOCS)
+    monkeypatch.setattr(market_symbol, "_COLLECTION", fake)
+    return fake
+
+
+class TestIterSymbolsAsDicts:
+    """Tests para iter_symbols_as_dicts."""
+
+    def test_rows_sorted_with_all_fields(self, collection):
+        """Verifica filas completas, ordenadas por símbolo y con fechas en ISO."""
+        rows = list(iter_symbols_as_dicts())
+
+        assert [row["symbol"] for row in rows] == ["AAPL", "MSFT"]
+        assert set(rows[0]) == market_symbol.LIST_FIELDS
+        assert rows[0]["id"] == "65a000000000000000000001"
+        assert rows[0]["created_at"] == "2024-01-02T03:04:05"
+        assert rows[1]["updated_at"] is None
+        assert rows[1]["trade_count"] is None
+
+    def test_is_lazy(self, collection):
+        """Verifica que no se consulta Mongo hasta consumir el generador."""
+        rows = iter_symbols_as_dicts()
+        assert collection.projections == []
+
+        next(rows)
+        assert len(collection.projections) == 1
+
+    def test_limit(self, collection):
+        """Verifica que se respeta el límite."""
+        rows = list(iter_symbols_as_dicts(limit=1))
+
+        assert [row["symbol"] for row in rows] == ["AAPL"]
+
+    def test_fields_projection(self, collection):
+        """Verifica que con ``fields`` se proyecta en Mongo y solo se devuelven esas claves."""
+        rows = list(iter_symbols_as_dicts(fields=("symbol", "price", "created_at")))
+
+        assert collection.projections == [
+            {"symbol": 1, "price": 1, "created_at": 1, "_id": 0}
+        ]
+        assert rows == [
+            {"symbol": "AAPL", "price": 190.5, "created_at": "2024-01-02T03:04:05"},
+            {"symbol": "MSFT", "price": 400.0, "created_at": "2024-01-02T03:04:05"},
+        ]
+
+    def test_fields_with_id(self, collection):
+        """Verifica que ``id`` pide ``_id`` a Mongo y se serializa como texto."""
+        rows = list(iter_symbols_as_dicts(fields=("id", "symbol")))
+
+        assert collection.projections[0]["_id"] == 1
+        assert rows[0] == {"id": "65a000000000000000000001", "symbol": "AAPL"}
+
+
+class TestListSymbolsColumnar:
+    """Tests para list_symbols_columnar."""
+
+    def test_all_columns_match_rows(self, collection):
+        """Verifica que las columnas contienen los mismos valores que las filas."""
+        rows = list(iter_symbols_as_dicts())
+        columns = list_symbols_columnar()
+
+        assert set(columns) == market_symbol.LIST_FIELDS
+        for name, values in columns.items():
+            assert values == [row[name] for row in rows]
+
+    def test_fields_projection(self, collection):
+        """Verifica que con ``fields`` solo se proyectan y devuelven esas columnas."""
+        columns = list_symbols_columnar(fields=("symbol", "id", "updated_at"))
+
+        assert collection.projections == [{"symbol": 1, "updated_at": 1, "_id": 1}]
+        assert columns == {
+            "symbol": ["AAPL", "MSFT"],
+            "id": ["65a000000000000000000001", "65a000000000000000000002"],
+            "updated_at": ["2024-01-02T03:04:05", None],
+        }
@@ -0,0 +1,49 @@
+"""
+Tests para la sincronización en lote de símbolos de mercado.
+
+MongoDB y Alpaca se simulan: ninguna prueba sale del proceso.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def service(fake_db):
+    from services.market_symbol_service import market_symbol_service
+
+    return market_symbol_service
+
+
+class TestSyncSymbolsFromQuotes:
+    """Tests para MarketSymbolService.sync_symbols_from_quotes."""
+
+    def test_new_symbols_get_name_and_market_on_insert(self, service, make_collection, monkeypatch):
+        """Verifica que solo los símbolos nuevos consultan el asset y lo guardan al insertarse."""
+        from services.alpaca_service import alpaca_service
+
+        collection = make_collection([{"symbol": "AAPL", "name": "Apple Inc."}])
+        monkeypatch.setattr(service, "_collection", collection)
+        monkeypatch.setattr(
+            alpaca_service,
+            "get_latest_snapshots",
+            lambda symbols, user=None: {
+                sym: {"symbol": sym, "price": 11.0, "close": 10.0} for sym in symbols
+            },
+        )
+        looked_up = []
+
+        def fake_assets_info(symbols, user=None):
+            looked_up.extend(symbols)
+            return {sym: ("Tesla, Inc.", "NASDAQ", "us_equity", []) for sym in symbols}
+
+        monkeypatch.setattr(alpaca_service, "get_assets_info", fake_assets_info)
+
+        assert service.sync_symbols_from_quotes(["aapl", "tsla"]) == 2
+
+        assert looked_up == ["TSLA"]
+        updates = {op._filter["symbol"]: op._doc for op in collection.operations}
+        assert "name" not in updates["AAPL"]["$set"]
+        assert "name" not in updates["AAPL"]["$setOnInsert"]
+        assert updates["TSLA"]["$setOnInsert"]["name"] == "Tesla, Inc."
+        assert updates["TSLA"]["$setOnInsert"]["market"] == "stocks"
+        assert "name" not in updates["TSLA"]["$set"]
@@ -2,8 +2,31 @@
 Tests para los modelos de datos.
 """
 
+import sys
+
 import pytest
-from models.order import Order, OrderSide, OrderType, OrderStatus, Position, Account, Quote
+from types import SimpleNamespace
+
+from alpaca.trading.enums import (
+    OrderSide as AlpacaOrderSide,
+    OrderStatus as AlpacaOrderStatus,
+    OrderType as AlpacaOrderType,
+)
+
+from models.order import (
+    Order,
+    OrderSide,
+    OrderType,
+    OrderStatus,
+    OrderSpec,
+    SwingTradeSpec,
+    Position,
+    Account,
+    Quote,
+    _ORDER_SIDE_BY_VALUE,
+    _ORDER_TYPE_BY_VALUE,
+    _ORDER_STATUS_BY_VALUE,
+)
 
 
 class TestOrder:
@@ -56,6 +79,105 @@ class TestOrder:
         assert order_dict['order_type'] == 'market'
         assert order_dict['order_id'] == 'test-123'
 
+    def test_from_alpaca_order_maps_enums(self):
+        """Verifica el mapeo de los enums de alpaca-py por su valor."""
+        alpaca_order = SimpleNamespace(
+            id='abc',
+            symbol='AAPL',
+            qty='2',
+            notional=None,
+            side=AlpacaOrderSide.SELL,
+            type=AlpacaOrderType.STOP_LIMIT,
+            time_in_force='day',
+            limit_price='10.5',
+            stop_price='10',
+            status=AlpacaOrderStatus.FILLED,
+            filled_qty='2',
+            filled_avg_price='10.4',
+            created_at=None,
+            updated_at=None,
+        )
+
+        order = Order.from_alpaca_order(alpaca_order)
+
+        assert order.side == OrderSide.SELL
+        assert order.order_type == OrderType.STOP_LIMIT
+        assert order.status == OrderStatus.FILLED
+
+    def test_enum_lookup_keys_are_interned(self):
+        """Verifica que las claves de las tablas son los valores internados de los enums."""
+        for enum_cls, table in (
+            (OrderSide, _ORDER_SIDE_BY_VALUE),
+            (OrderType, _ORDER_TYPE_BY_VALUE),
+            (OrderStatus, _ORDER_STATUS_BY_VALUE),
+        ):
+            assert len(table) == len(enum_cls)
+            for key, member in table.items():
+                assert key is sys.intern(key)
+                assert key is member.value
+
+
+class TestOrderSpec:
+    """Tests para la especificación de creación de órdenes."""
+
+    def test_from_dict_converts_types(self):
+        """Verifica conversiones de símbolo, lado, tipo y precios."""
+        spec = OrderSpec.from_dict({
+            'symbol': 'aapl',
+            'side': 'BUY',
+            'order_type': 'Limit',
+            'qty': '10',
+            'limit_price': '150.5',
+        })
+
+        assert spec.symbol == 'AAPL'
+        assert spec.side is OrderSide.BUY
+        assert spec.order_type is OrderType.LIMIT
+        assert spec.qty == 10.0
+        assert spec.limit_price == 150.5
+        assert spec.notional is None
+
+    def test_from_dict_bracket(self):
+        """Verifica la normalización de take profit y stop loss."""
+        spec = OrderSpec.from_dict({
+            'symbol': 'MSFT',
+            'side': 'buy',
+            'order_type': 'bracket',
+            'qty': 5,
+            'limit_price': 100,
+            'take_profit': {'limit_price': '110'},
+            'stop_loss': {'stop_price': 95},
+        })
+
+        assert spec.take_profit == {'limit_price': 110.0}
+        assert spec.stop_loss == {'stop_price': 95.0}
+
+    @pytest.mark.parametrize('data, message', [
+        ({'symbol': 'AAPL', 'side': 'buy'}, 'Campos requeridos faltantes'),
+        ({'symbol': 'AAPL', 'side': 'hold', 'order_type': 'market', 'qty': 1}, 'Lado de orden no soportado'),
+        ({'symbol': 'AAPL', 'side': 'buy', 'order_type': 'stop', 'notional': 100, 'stop_price': 1}, 'qty requerido'),
+        ({'symbol': 'AAPL', 'side': 'buy', 'order_type': 'limit', 'qty': 'x', 'limit_price': 1}, 'qty debe ser numérico'),
+    ])
+    def test_from_dict_rejects_invalid(self, data, message):
+        """Verifica que los errores de validación se reportan como ValueError."""
+        with pytest.raises(ValueError, match=message):
+            OrderSpec.from_dict(data)
+
+    def test_swing_trade_spec(self):
+        """Verifica la conversión y el primer campo faltante de un swing trade."""
+        spec = SwingTradeSpec.from_dict({
+            'symbol': ' nvda ',
+            'qty': '3',
+            'entry_price': 100,
+            'take_profit_price': '110.5',
+            'stop_loss_price': 95,
+        })
+
+        assert spec.symbol == 'NVDA'
+        assert spec.take_profit_price == 110.5
+        with pytest.raises(ValueError, match='Campo requerido faltante: entry_price'):
+            SwingTradeSpec.from_dict({'symbol': 'NVDA', 'qty': 1})
+
 
 class TestPosition:
     """Tests para la clase Position."""
@@ -0,0 +1,32 @@
+"""
+Tests para la validación de precios de órdenes bracket.
+"""
+
+from utils.order_validate import (
+    BRACKET_OK,
+    BRACKET_STOP_LOSS_INVALID,
+    BRACKET_TAKE_PROFIT_INVALID,
+    bracket_error_message,
+    validate_bracket,
+)
+
+
+class TestValidateBracket:
+    """Tests para validate_bracket."""
+
+    def test_buy_bracket(self):
+        """Verifica el orden SL < entrada < TP en compras."""
+        assert validate_bracket(True, 100.0, 95.0, 110.0) == BRACKET_OK
+        assert validate_bracket(True, 100.0, 100.0, 110.0) == BRACKET_STOP_LOSS_INVALID
+        assert validate_bracket(True, 100.0, 95.0, 100.0) == BRACKET_TAKE_PROFIT_INVALID
+
+    def test_sell_bracket(self):
+        """Verifica el orden TP < entrada < SL en ventas."""
+        assert validate_bracket(False, 100.0, 105.0, 90.0) == BRACKET_OK
+        assert validate_bracket(False, 100.0, 105.0, 100.0) == BRACKET_TAKE_PROFIT_INVALID
+        assert validate_bracket(False, 100.0, 100.0, 90.0) == BRACKET_STOP_LOSS_INVALID
+
+    def test_error_message(self):
+        """Verifica que el mensaje incluye los precios implicados."""
+        message = bracket_error_message(True, BRACKET_STOP_LOSS_INVALID, 100.0, 101.0, 110.0)
+        assert message == 'Para compra, stop loss (101.0) debe ser menor al precio de entrada (100.0)'
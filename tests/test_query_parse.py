@@ -0,0 +1,96 @@
+"""
+Tests para la lectura tipada de parámetros de query string.
+"""
+
+from flask import Flask, request
+
+from utils.query_parse import parse_params
+
+
+_LIMIT_ERROR = 'Parámetro limit/top debe ser un número entero'
+
+
+class TestParseParams:
+    """Tests para parse_params."""
+
+    def test_converts_types(self):
+        """Verifica la conversión de cada tipo soportado."""
+        params, error = parse_params(
+            {'limit': '5', 'min_price': '1.5', 'exchange': 'NYSE', 'market': 'CRYPTO'},
+            (
+                ('limit', 'int', 10),
+                ('min_price', 'float', None),
+                ('exchange', 'str', None),
+                ('market', 'lower', 'stocks'),
+            ),
+        )
+
+        assert error is None
+        assert params == {'limit': 5, 'min_price': 1.5, 'exchange': 'NYSE', 'market': 'crypto'}
+
+    def test_alias_keys(self):
+        """Verifica que las claves alternativas se leen y el resultado usa la primera clave."""
+        schema = ((('limit', 'top'), 'int', 10),)
+
+        assert parse_params({'top': '7'}, schema) == ({'limit': 7}, None)
+        # La primera clave presente gana
+        assert parse_params({'limit': '3', 'top': '7'}, schema) == ({'limit': 3}, None)
+
+    def test_missing_or_empty_uses_default(self):
+        """Verifica que ausentes y vacíos toman el valor por defecto sin convertirlo."""
+        schema = (('limit', 'int', 10), ('market', 'lower', 'STOCKS'), ('max_price', 'float', None))
+
+        assert parse_params({}, schema) == ({'limit': 10, 'market': 'STOCKS', 'max_price': None}, None)
+        assert parse_params({'limit': '', 'market': '', 'max_price': ''}, schema) == (
+            {'limit': 10, 'market': 'STOCKS', 'max_price': None},
+            None,
+        )
+
+    def test_empty_first_alias_uses_default(self):
+        """Verifica que una primera clave vacía no da paso a la alternativa."""
+        schema = ((('limit', 'top'), 'int', 10),)
+
+        assert parse_params({'limit': '', 'top': '7'}, schema) == ({'limit': 10}, None)
+
+    def test_conversion_error_default_message(self):
+        """Verifica el mensaje genérico cuando el esquema no trae uno propio."""
+        _, error = parse_params({'limit': 'abc'}, (('limit', 'int', 10),))
+        assert error == 'Parámetro limit debe ser un número entero'
+
+        _, error = parse_params({'min_price': 'barato'}, (('min_price', 'float', None),))
+        assert error == 'Parámetro min_price debe ser numérico'
+
+    def test_conversion_error_custom_message(self):
+        """Verifica que se devuelve el mensaje del esquema y se detiene en el primer error."""
+        params, error = parse_params(
+            {'by': 'trades', 'top': '1.5', 'min_price': 'x'},
+            (
+                ('by', 'lower', 'volume'),
+                (('limit', 'top'), 'int', 10, _LIMIT_ERROR),
+                ('min_price', 'float', None, 'Parámetros min_price/max_price deben ser numéricos'),
+            ),
+        )
+
+        assert error == _LIMIT_ERROR
+        assert params == {'by': 'trades'}
+
+    def test_reads_flask_request_args(self):
+        """Verifica que funciona con ``request.args`` y produce la respuesta 400 de las rutas."""
+        app = Flask(__name__)
+
+        @app.route('/symbols')
+        def symbols():
+            params, error = parse_params(request.args, ((('limit', 'top'), 'int', 10, _LIMIT_ERROR),))
+            if error:
+                return {'success': False, 'error': error}, 400
+            return {'success': True, 'limit': params['limit']}
+
+        client = app.test_client()
+
+        response = client.get('/symbols?top=20')
+        assert response.status_code == 200
+        assert response.get_json()['limit'] == 20
+
+        response = client.get('/symbols?limit=muchos')
+        assert response.status_code == 400
+        assert response.get_json() == {'success': False, 'error': _LIMIT_ERROR}
@@ -0,0 +1,42 @@
+"""
+Tests para el limitador de peticiones por usuario.
+"""
+
+from types import SimpleNamespace
+
+from flask import Flask, g
+
+import utils.rate_limit as rate_limit_module
+from utils.rate_limit import rate_limit
+
+
+class TestRateLimit:
+    """Tests para el decorador rate_limit."""
+
+    def test_bucket_empties_and_refills(self, monkeypatch):
+        """Verifica el 429 al agotar fichas y la reposición con el tiempo."""
+        clock = [100.0]
+        monkeypatch.setattr(rate_limit_module, '_now', lambda: clock[0])
+        app = Flask(__name__)
+
+        @rate_limit(2)
+        def view():
+            return 'ok'
+
+        def call(user_id):
+            with app.test_request_context():
+                g.current_user = SimpleNamespace(id=user_id)
+                return view()
+
+        assert call('u1') == 'ok'
+        assert call('u1') == 'ok'
+        blocked = call('u1')
+        assert blocked.status_code == 429
+        assert blocked.headers['Retry-After'] == '30'
+
+        # Otro usuario tiene su propio cubo
+        assert call('u2') == 'ok'
+
+        # 2/minuto: una ficha cada 30 segundos
+        clock[0] += 30
+        assert call('u1') == 'ok'
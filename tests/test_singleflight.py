@@ -0,0 +1,52 @@
+"""
+Tests para el colapso de peticiones concurrentes.
+"""
+
+import threading
+
+import pytest
+
+from utils.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests para SingleFlight.do."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Verifica que las llamadas simultáneas con la misma clave ejecutan fn una vez."""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def load():
+            calls.append(1)
+            release.wait(2)
+            return 'AAPL'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do('quote:AAPL', load)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        # Dar tiempo a que todos lleguen a esperar el futuro en curso
+        threading.Event().wait(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(2)
+
+        assert calls == [1]
+        assert results == ['AAPL'] * 5
+
+    def test_errors_are_not_remembered(self):
+        """Verifica que un error se propaga y la siguiente llamada vuelve a ejecutar fn."""
+        flight = SingleFlight()
+
+        def fail():
+            raise RuntimeError('alpaca caído')
+
+        with pytest.raises(RuntimeError):
+            flight.do('bars:AAPL', fail)
+
+        assert flight.do('bars:AAPL', lambda: 42) == 42
@@ -0,0 +1,88 @@
+"""
+Tests para la generación de señales swing en lote.
+
+Las barras se simulan, ninguna prueba llama a la API real.
+"""
+
+import threading
+
+import pytest
+
+
+def make_bars(count=80):
+    """Barras diarias con una tendencia suave, suficientes para los indicadores."""
+    return [
+        {
+            "timestamp": f"2024-01-{i:03d}",
+            "open": 100.0 + i * 0.1,
+            "high": 101.0 + i * 0.1,
+            "low": 99.0 + i * 0.1,
+            "close": 100.5 + i * 0.1,
+            "volume": 1000 + i,
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def services():
+    from services.alpaca_service import alpaca_service, AlpacaServiceException
+    from services.swing_strategy_service import swing_strategy_service
+
+    return swing_strategy_service, alpaca_service, AlpacaServiceException
+
+
+class TestGenerateSignals:
+    """Tests para SwingStrategyService.generate_signals."""
+
+    def test_uses_bars_multi(self, services, monkeypatch):
+        """Verifica que con la consulta conjunta no se piden barras por símbolo."""
+        swing, alpaca, _ = services
+        monkeypatch.setattr(
+            alpaca,
+            "get_bars_multi",
+            lambda symbols, timeframe="1D", limit=200, user=None: {"AAPL": make_bars()},
+        )
+
+        def unexpected_get_bars(*args, **kwargs):
+            raise AssertionError("get_bars no debería llamarse")
+
+        monkeypatch.setattr(alpaca, "get_bars", unexpected_get_bars)
+
+        signals = swing.generate_signals(["AAPL", "MSFT"])
+
+        assert [signal.symbol for signal in signals] == ["AAPL", "MSFT"]
+        # MSFT no vino en la respuesta conjunta
+        assert signals[1].has_signal is False
+        assert "MSFT" in signals[1].reason
+
+    def test_falls_back_to_per_symbol_bars(self, services, monkeypatch):
+        """Verifica que si falla get_bars_multi cada símbolo descarga sus barras."""
+        swing, alpaca, AlpacaServiceException = services
+
+        def failing_multi(symbols, timeframe="1D", limit=200, user=None):
+            raise AlpacaServiceException("invalid symbol: ZZZZ")
+
+        requested = []
+        lock = threading.Lock()
+
+        def get_bars(symbol, timeframe="1D", limit=200, user=None):
+            with lock:
+                requested.append(symbol)
+            if symbol == "ZZZZ":
+                raise AlpacaServiceException("invalid symbol: ZZZZ")
+            return make_bars()
+
+        monkeypatch.setattr(alpaca, "get_bars_multi", failing_multi)
+        monkeypatch.setattr(alpaca, "get_bars", get_bars)
+
+        signals = swing.generate_signals(["AAPL", "ZZZZ", "MSFT"])
+
+        assert sorted(requested) == ["AAPL", "MSFT", "ZZZZ"]
+        assert [signal.symbol for signal in signals] == ["AAPL", "ZZZZ", "MSFT"]
+        # Solo el símbolo inválido queda marcado con el error
+        assert signals[1].has_signal is False
+        assert signals[1].reason == "invalid symbol: ZZZZ"
+        # Los demás se evalúan con sus barras (tendencia continua: RSI fuera de rango)
+        assert signals[0].reason == "No cumple condiciones de tendencia/RSI"
+        assert signals[2].reason == "No cumple condiciones de tendencia/RSI"
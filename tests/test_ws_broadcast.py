@@ -0,0 +1,67 @@
+"""
+Tests para la difusión de eventos Socket.IO por lotes.
+"""
+
+from types import SimpleNamespace
+
+from utils.ws_broadcast import batched_emit
+
+
+class FakeSocketIO:
+    """SocketIO mínimo: salas fijas y registro de emisiones y cesiones."""
+
+    def __init__(self, rooms):
+        self.calls = []
+        manager = SimpleNamespace(get_participants=self._participants)
+        self.server = SimpleNamespace(manager=manager)
+        self._rooms = rooms
+
+    def _participants(self, namespace, room):
+        for sid in self._rooms.get((namespace, room), []):
+            yield sid, f'eio-{sid}'
+
+    def emit(self, event, payload, to=None, namespace='/'):
+        self.calls.append(('emit', event, to))
+
+    def sleep(self, seconds):
+        self.calls.append(('sleep', seconds))
+
+
+class TestBatchedEmit:
+    """Tests para batched_emit."""
+
+    def test_small_room_single_emit(self):
+        """Verifica que una sala que cabe en un lote recibe un único emit a la sala."""
+        socketio = FakeSocketIO({('/', 'user:1'): ['a', 'b']})
+
+        batched_emit(socketio, 'order_created_batch', [{'id': 1}], room='user:1')
+
+        assert socketio.calls == [('emit', 'order_created_batch', 'user:1')]
+
+    def test_large_room_yields_between_batches(self):
+        """Verifica un emit por participante y una cesión tras cada lote."""
+        sids = [f's{i}' for i in range(5)]
+        socketio = FakeSocketIO({('/', None): sids})
+
+        batched_emit(socketio, 'swing_scan_result', {}, batch=2)
+
+        assert socketio.calls == [
+            ('emit', 'swing_scan_result', 's0'),
+            ('emit', 'swing_scan_result', 's1'),
+            ('sleep', 0),
+            ('emit', 'swing_scan_result', 's2'),
+            ('emit', 'swing_scan_result', 's3'),
+            ('sleep', 0),
+            ('emit', 'swing_scan_result', 's4'),
+            ('sleep', 0),
+        ]
+
+    def test_empty_room_or_no_server(self):
+        """Verifica que no se emite nada sin destinatarios o sin servidor."""
+        socketio = FakeSocketIO({})
+        batched_emit(socketio, 'swing_trade_created', {}, room='user:2')
+        assert socketio.calls == []
+
+        socketio.server = None
+        batched_emit(socketio, 'swing_trade_created', {}, room='user:2')
+        assert socketio.calls == []
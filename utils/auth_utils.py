@@ -1,9 +1,9 @@
 from functools import wraps
-from typing import Callable, TypeVar, Any
+from typing import Any, Callable, Dict, TypeVar
 
 from flask import request, jsonify, g
 
-from models.user import get_user_by_id
+from models.user import get_user_by_oid, to_oid
 from utils.security import decode_jwt
 
 F = TypeVar("F", bound=Callable[..., Any])
@@ -33,11 +33,30 @@ def require_auth(f: F) -> F:
         if not user_id:
             return jsonify({"success": False, "error": "Token inválido"}), 401
 
-        user = get_user_by_id(user_id)
+        oid = to_oid(user_id)
+        if oid is None:
+            return jsonify({"success": False, "error": "Token inválido"}), 401
+
+        user = get_user_by_oid(oid)
         if not user:
             return jsonify({"success": False, "error": "Usuario no encontrado"}), 401
 
+        # El ObjectId se conserva para no reconvertir el id en cada consulta
         g.current_user = user
+        g.current_user_oid = oid
         return f(*args, **kwargs)
 
     return wrapper  # type: ignore[return-value]
+
+
+def current_user_dict() -> Dict[str, Any]:
+    """
+    ``g.current_user.to_dict()`` calculado como mucho una vez por petición.
+
+    Se calcula bajo demanda para no pagarlo en los endpoints que no
+    devuelven el usuario. Requiere una ruta protegida con ``require_auth``.
+    """
+    data = g.get("current_user_dict")
+    if data is None:
+        data = g.current_user_dict = g.current_user.to_dict()
+    return data
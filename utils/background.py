@@ -0,0 +1,40 @@
+"""
+Ejecución de efectos secundarios en segundo plano.
+
+Para trabajo que el cliente no necesita esperar (alimentar la colección
+de símbolos tras una respuesta, por ejemplo). Las tareas no reciben el
+contexto de la petición: los argumentos deben resolverse antes de
+encolarlas.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import logging
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+_BACKGROUND_MAX_WORKERS = 4
+
+_executor = ThreadPoolExecutor(
+    max_workers=_BACKGROUND_MAX_WORKERS, thread_name_prefix='background'
+)
+
+
+def _run_logged(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    try:
+        return fn(*args, **kwargs)
+    except Exception:
+        logger.exception('Error en tarea en segundo plano %s', getattr(fn, '__qualname__', fn))
+        return None
+
+
+def submit_background(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """
+    Encola ``fn(*args, **kwargs)`` en el pool compartido.
+
+    Las excepciones se registran y no se propagan.
+
+    Returns:
+        Future: Futuro de la tarea (resultado ``None`` si falló)
+    """
+    return _executor.submit(_run_logged, fn, *args, **kwargs)
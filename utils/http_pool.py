@@ -0,0 +1,27 @@
+"""
+Pool HTTP compartido por los clientes REST de alpaca-py.
+
+Cada cliente de alpaca-py crea su propia ``requests.Session``; montar el
+mismo adaptador en todas hace que compartan conexiones keep-alive (también
+los clientes por usuario y los de otros servicios), de modo que una llamada
+nueva no paga otro handshake TCP+TLS.
+"""
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Solo se reintentan errores de conexión y métodos idempotentes: los POST de
+# órdenes nunca se repiten.
+HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.1),
+)
+
+
+def pooled(client):
+    """Monta el pool HTTP compartido en la sesión del cliente de alpaca-py."""
+    session = getattr(client, '_session', None)
+    if session is not None:
+        session.mount('https://', HTTP_ADAPTER)
+    return client
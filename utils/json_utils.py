@@ -0,0 +1,197 @@
+"""
+Serialización JSON basada en orjson.
+
+Proporciona el proveedor JSON de Flask y el módulo compatible con
+Socket.IO, de modo que las respuestas HTTP y los eventos WebSocket
+comparten el mismo codificador.
+"""
+
+import hashlib
+from decimal import Decimal
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Iterable, Iterator
+
+import orjson
+from flask import Response, current_app, request
+from flask.json.provider import JSONProvider
+
+# OPT_SERIALIZE_NUMPY: los cálculos con pandas/numpy (estrategia swing)
+# pueden devolver escalares y arrays de numpy
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    """Convierte tipos que orjson no serializa de forma nativa."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    value = getattr(obj, 'value', None)
+    if value is not None:
+        return value
+    return str(obj)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serializa un objeto a JSON en bytes."""
+    return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+
+def json_response(obj: Any, status: int = 200) -> Response:
+    """
+    Construye una respuesta JSON serializando directamente con orjson.
+
+    Evita el despacho de ``jsonify`` (normalización de argumentos y
+    proveedor) en los endpoints que devuelven listas grandes.
+    """
+    return current_app.response_class(
+        dumps_bytes(obj), status=status, mimetype='application/json'
+    )
+
+
+@lru_cache(maxsize=64)
+def _error_body(message: str) -> bytes:
+    return dumps_bytes({'success': False, 'error': message})
+
+
+def error_response(message: str, status: int = 400) -> Response:
+    """
+    Respuesta ``{"success": false, "error": message}`` para mensajes fijos.
+
+    El cuerpo serializado se memoriza por mensaje; el objeto Response se
+    crea en cada llamada porque es mutable (cabeceras, CORS). Los mensajes
+    variables (``str(e)``) deben seguir usando ``json_response``.
+    """
+    return current_app.response_class(
+        _error_body(message), status=status, mimetype='application/json'
+    )
+
+
+def conditional_json_response(obj: Any, max_age: int = 0) -> Response:
+    """
+    Respuesta JSON con ``ETag`` y ``Cache-Control: private``.
+
+    El ETag es un BLAKE2b de 128 bits del cuerpo ya serializado. Si el
+    cliente envía ``If-None-Match`` con ese valor se responde ``304`` sin
+    cuerpo. Con ``max_age=0`` el navegador revalida en cada uso.
+    """
+    body = dumps_bytes(obj)
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.max_age = max_age
+    return response
+
+
+# Tamaño aproximado de cada bloque escrito en respuestas en streaming
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _buffered(parts: Iterable[bytes], chunk_size: int = _STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Agrupa fragmentos pequeños en bloques de ~``chunk_size`` bytes."""
+    buffer = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield b''.join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def _json_array_parts(prefix: bytes, rows: Iterable[Any], suffix: bytes) -> Iterator[bytes]:
+    yield prefix
+    separator = b''
+    for row in rows:
+        yield separator + dumps_bytes(row)
+        separator = b','
+    yield suffix
+
+
+def stream_json_response(
+    rows: Iterable[Any], status: int = 200, chunk_size: int = _STREAM_CHUNK_SIZE
+) -> Response:
+    """
+    Respuesta ``{"success": true, "data": [...]}`` serializada fila a fila.
+
+    El primer elemento se obtiene antes de construir la respuesta para que
+    los errores de la consulta se propaguen al llamador (y terminen en un
+    500) en lugar de cortar un cuerpo ya enviado con 200. Con un
+    ``chunk_size`` pequeño cada fila se envía en cuanto está lista.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is not None:
+        rows = chain((first,), rows)
+    body = _buffered(
+        _json_array_parts(b'{"success":true,"data":[', rows, b']}'), chunk_size
+    )
+    return current_app.response_class(body, status=status, mimetype='application/json')
+
+
+def stream_ndjson_response(rows: Iterable[Any], status: int = 200) -> Response:
+    """Respuesta NDJSON (una línea JSON por fila) para renderizado progresivo."""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is not None:
+        rows = chain((first,), rows)
+    body = _buffered(dumps_bytes(row) + b'\n' for row in rows)
+    return current_app.response_class(body, status=status, mimetype='application/x-ndjson')
+
+
+def get_json_fast() -> dict:
+    """
+    Lee el cuerpo de la petición y lo decodifica con orjson.
+
+    El cuerpo no se guarda en caché (``cache=False``), por lo que solo
+    debe leerse una vez por petición. Un cuerpo vacío equivale a ``{}``.
+
+    Raises:
+        ValueError: Si el cuerpo no es JSON válido o no es un objeto.
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return {}
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError as e:
+        raise ValueError(f"Cuerpo JSON inválido: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError("El cuerpo JSON debe ser un objeto")
+    return data
+
+
+class OrjsonProvider(JSONProvider):
+    """Proveedor JSON de Flask que usa orjson en lugar de json de stdlib."""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
+
+
+class SocketIOJSON:
+    """Módulo JSON compatible con python-socketio (parámetro ``json``)."""
+
+    @staticmethod
+    def dumps(obj: Any, *args: Any, **kwargs: Any) -> str:
+        return dumps_bytes(obj).decode('utf-8')
+
+    @staticmethod
+    def loads(s: str | bytes, *args: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
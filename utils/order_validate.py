@@ -0,0 +1,47 @@
+"""
+Validaciones de precios de órdenes compartidas por REST y WebSocket.
+"""
+
+BRACKET_OK = 0
+BRACKET_STOP_LOSS_INVALID = 1
+BRACKET_TAKE_PROFIT_INVALID = 2
+
+# Mensajes por (es_compra, código)
+_BRACKET_MESSAGES = {
+    (True, BRACKET_STOP_LOSS_INVALID):
+        'Para compra, stop loss ({sl}) debe ser menor al precio de entrada ({entry})',
+    (True, BRACKET_TAKE_PROFIT_INVALID):
+        'Para compra, take profit ({tp}) debe ser mayor al precio de entrada ({entry})',
+    (False, BRACKET_TAKE_PROFIT_INVALID):
+        'Para venta, take profit ({tp}) debe ser menor al precio de entrada ({entry})',
+    (False, BRACKET_STOP_LOSS_INVALID):
+        'Para venta, stop loss ({sl}) debe ser mayor al precio de entrada ({entry})',
+}
+
+
+def validate_bracket(is_buy: bool, entry: float, sl: float, tp: float) -> int:
+    """
+    Valida el orden de precios de una orden bracket.
+
+    Compra: SL < entrada < TP. Venta: TP < entrada < SL. En compra se
+    comprueba primero el stop loss y en venta el take profit.
+
+    Returns:
+        int: ``BRACKET_OK`` o el código del primer precio inválido
+    """
+    if is_buy:
+        if sl >= entry:
+            return BRACKET_STOP_LOSS_INVALID
+        if tp <= entry:
+            return BRACKET_TAKE_PROFIT_INVALID
+    else:
+        if tp >= entry:
+            return BRACKET_TAKE_PROFIT_INVALID
+        if sl <= entry:
+            return BRACKET_STOP_LOSS_INVALID
+    return BRACKET_OK
+
+
+def bracket_error_message(is_buy: bool, code: int, entry: float, sl: float, tp: float) -> str:
+    """Mensaje de error para un código devuelto por ``validate_bracket``."""
+    return _BRACKET_MESSAGES[(is_buy, code)].format(entry=entry, sl=sl, tp=tp)
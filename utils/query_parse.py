@@ -0,0 +1,72 @@
+"""
+Lectura tipada de parámetros de query string.
+
+Sustituye los bloques repetidos de ``int(...)``/``float(...)`` con
+try/except de las rutas por una sola pasada sobre un esquema declarativo.
+"""
+
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple, Union
+
+# Esquema: (clave o claves alternativas, tipo, valor por defecto[, mensaje de error])
+ParamSpec = Union[
+    Tuple[Union[str, Tuple[str, ...]], str, Any],
+    Tuple[Union[str, Tuple[str, ...]], str, Any, str],
+]
+
+_CONVERTERS: Dict[str, Callable[[str], Any]] = {
+    'int': int,
+    'float': float,
+    'str': str,
+    'lower': lambda value: str(value).lower(),
+}
+
+_TYPE_NAMES = {
+    'int': 'un número entero',
+    'float': 'numérico',
+}
+
+
+def parse_params(
+    args: Mapping[str, Any], schema: Sequence[ParamSpec]
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Lee y convierte los parámetros descritos en ``schema``.
+
+    Cada entrada indica la clave (o una tupla de claves alternativas, la
+    primera presente gana), el tipo (``int``, ``float``, ``str`` o
+    ``lower``), el valor por defecto y, opcionalmente, el mensaje de error.
+    El resultado se indexa por la primera clave. Los valores ausentes o
+    vacíos toman el valor por defecto sin convertirlo.
+
+    Args:
+        args: Parámetros de la petición (``request.args`` o un dict)
+        schema: Descripción de los parámetros
+
+    Returns:
+        Tuple[Dict[str, Any], Optional[str]]: (valores, error); error es
+        None si todos los parámetros son válidos
+    """
+    params: Dict[str, Any] = {}
+    for spec in schema:
+        keys, kind, default = spec[0], spec[1], spec[2]
+        if isinstance(keys, str):
+            keys = (keys,)
+
+        raw = None
+        for key in keys:
+            raw = args.get(key)
+            if raw is not None:
+                break
+
+        name = keys[0]
+        if raw is None or raw == '':
+            params[name] = default
+            continue
+
+        try:
+            params[name] = _CONVERTERS[kind](raw)
+        except (TypeError, ValueError):
+            if len(spec) > 3:
+                return params, spec[3]
+            return params, f"Parámetro {name} debe ser {_TYPE_NAMES.get(kind, kind)}"
+    return params, None
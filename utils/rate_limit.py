@@ -0,0 +1,68 @@
+"""
+Limitación de peticiones por usuario (token bucket en proceso).
+
+Protege a Alpaca de ráfagas de un mismo cliente: cada usuario dispone de
+``per_minute`` fichas por endpoint que se reponen de forma continua.
+"""
+
+from functools import wraps
+import math
+import threading
+import time
+from typing import Any, Callable, Tuple, TypeVar
+
+from cachetools import TTLCache
+from flask import g
+
+from utils.json_utils import error_response
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Usuarios distintos con cubo activo por endpoint
+_MAX_KEYS = 10000
+# Un cubo sin uso durante una ventana completa vuelve a estar lleno, por lo
+# que puede descartarse sin cambiar el resultado.
+_WINDOW_SECONDS = 60.0
+
+_now = time.monotonic
+
+
+def rate_limit(per_minute: int) -> Callable[[F], F]:
+    """
+    Limita la ruta a ``per_minute`` peticiones por usuario y minuto.
+
+    Se aplica debajo de ``require_auth`` (necesita ``g.current_user``).
+    Al agotar las fichas responde 429 con ``Retry-After``.
+    """
+    rate = per_minute / _WINDOW_SECONDS
+    # user_id -> (fichas, instante de la última actualización)
+    buckets: "TTLCache[Any, Tuple[float, float]]" = TTLCache(
+        maxsize=_MAX_KEYS, ttl=_WINDOW_SECONDS
+    )
+    lock = threading.Lock()
+
+    def decorator(f: F) -> F:
+        @wraps(f)
+        def wrapper(*args: Any, **kwargs: Any):
+            key = g.current_user.id
+            now = _now()
+            with lock:
+                state = buckets.get(key)
+                if state is None:
+                    tokens = float(per_minute)
+                else:
+                    tokens = min(float(per_minute), state[0] + (now - state[1]) * rate)
+                allowed = tokens >= 1.0
+                if allowed:
+                    tokens -= 1.0
+                buckets[key] = (tokens, now)
+
+            if not allowed:
+                response = error_response('Demasiadas peticiones, inténtelo más tarde', 429)
+                response.headers['Retry-After'] = str(math.ceil((1.0 - tokens) / rate))
+                return response
+            return f(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
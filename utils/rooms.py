@@ -0,0 +1,8 @@
+"""
+Nombres de salas Socket.IO compartidos por rutas HTTP y manejadores WebSocket.
+"""
+
+
+def user_room(user_id: str) -> str:
+    """Sala Socket.IO con todos los sockets autenticados de un usuario."""
+    return f"user:{user_id}"
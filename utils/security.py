@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any, Dict
 
 import bcrypt
@@ -22,6 +23,9 @@ def verify_password(password: str, password_hash: str) -> bool:
         return False
 
 
+# La configuración es inmutable: el cifrador se construye una sola vez. Se
+# crea bajo demanda para no fallar al importar si FERNET_KEY no está definida.
+@lru_cache(maxsize=1)
 def _get_fernet() -> Fernet:
     key = config.FERNET_KEY
     return Fernet(key.encode("utf-8"))
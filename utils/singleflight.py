@@ -0,0 +1,48 @@
+"""
+Colapso de peticiones concurrentes idénticas ("single-flight").
+
+Cuando varias peticiones piden a la vez el mismo dato que no está en
+caché, solo la primera llama a Alpaca; el resto espera su resultado.
+"""
+
+from concurrent.futures import Future
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Agrupa llamadas concurrentes con la misma clave en una sola ejecución."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Ejecuta ``fn()`` salvo que ya haya una llamada en curso con ``key``.
+
+        Las excepciones de ``fn`` se propagan a todos los que esperan la
+        misma clave. La clave se libera al terminar, de modo que no se
+        guarda ningún resultado: la caché queda a cargo del llamador.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
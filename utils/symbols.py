@@ -0,0 +1,49 @@
+"""
+Utilidades para símbolos bursátiles.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List
+
+
+@lru_cache(maxsize=4096)
+def normalize_symbol(symbol: str) -> str:
+    """
+    Normaliza un símbolo a mayúsculas y sin espacios.
+
+    El universo de símbolos es acotado y se repite en casi todas las
+    peticiones, por lo que el resultado se memoriza.
+
+    Args:
+        symbol: Símbolo tal como llega del cliente o de la base de datos
+
+    Returns:
+        str: Símbolo normalizado
+    """
+    return symbol.upper().strip()
+
+
+def normalize_symbols(symbols: Iterable[Any]) -> List[str]:
+    """
+    Normaliza una lista de símbolos descartando vacíos y duplicados.
+
+    La deduplicación es O(N) y conserva el orden de llegada. Los símbolos
+    guardados ya vienen normalizados, así que se reutilizan sin copiarlos.
+
+    Args:
+        symbols: Símbolos tal como llegan (se ignoran los ``None``)
+
+    Returns:
+        List[str]: Símbolos normalizados y únicos
+    """
+    seen: Dict[str, None] = {}
+    for s in symbols:
+        if s is None:
+            continue
+        # Camino rápido: str.strip() devuelve la misma cadena si no hay espacios
+        if s.__class__ is not str or not s.isupper() or s.strip() is not s:
+            s = str(s).strip().upper()
+            if not s:
+                continue
+        seen[s] = None
+    return list(seen)
@@ -0,0 +1,50 @@
+"""
+Difusión de eventos Socket.IO por lotes.
+
+``socketio.emit`` a una sala envía a todos sus destinatarios sin ceder el
+control; con muchas pestañas conectadas eso bloquea el bucle de eventos.
+Aquí los destinatarios se recorren en lotes, cediendo el control entre
+lote y lote. Solo se usa API pública de Flask-SocketIO y python-socketio.
+"""
+
+import logging
+from typing import Any, Optional
+
+from flask_socketio import SocketIO
+
+logger = logging.getLogger(__name__)
+
+BROADCAST_BATCH_SIZE = 50
+
+
+def batched_emit(
+    socketio: SocketIO,
+    event: str,
+    payload: Any,
+    room: Optional[str] = None,
+    namespace: str = '/',
+    batch: int = BROADCAST_BATCH_SIZE,
+) -> None:
+    """
+    Emite ``event`` a ``room`` (o a todos los clientes si es None) por lotes.
+
+    Si la sala cabe en un lote se hace un único ``socketio.emit`` a la sala;
+    si no, se emite a cada participante con ``to=sid`` y se llama a
+    ``socketio.sleep(0)`` cada ``batch`` destinatarios.
+    """
+    server = socketio.server
+    if server is None:
+        return
+    # get_participants copia la sala: puede cambiar mientras se cede el control
+    sids = [sid for sid, _eio_sid in server.manager.get_participants(namespace, room)]
+    if not sids:
+        return
+    if len(sids) <= batch:
+        socketio.emit(event, payload, to=room, namespace=namespace)
+        return
+
+    for start in range(0, len(sids), batch):
+        for sid in sids[start:start + batch]:
+            socketio.emit(event, payload, to=sid, namespace=namespace)
+        socketio.sleep(0)
+    logger.debug('Evento %s enviado a %d clientes', event, len(sids))
@@ -0,0 +1,12 @@
+"""
+Punto de entrada WSGI para servidores de producción.
+
+Ejemplos:
+    gunicorn --worker-class eventlet -w 1 --bind 0.0.0.0:5080 wsgi:app
+    gunicorn -k geventwebsocket.gunicorn.workers.GeventWebSocketWorker \
+        -w 1 --worker-connections 2000 --bind 0.0.0.0:5080 wsgi:app
+"""
+
+from app import create_app
+
+app = create_app()